@@ -0,0 +1,111 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+# The row-wise parsers as they were before parsers.py: every call goes through
+# the `re` module functions (pattern lookup in re's cache on each call) and
+# nothing is memoized. Kept unchanged, outside the scripts package, as the
+# reference that scripts/etl/benchmark_parsers.py and tests/etl/test_parsers.py
+# compare scripts/etl/parsers.py against.
+
+# 4. Price / old_price -> European format with comma
+def clean_price(x):
+    if pd.isna(x) or x == "":
+        return ""
+    x = str(x).replace("€", "").strip()
+    x = x.replace(".", ",")  # decimal dot to comma
+    x = re.sub(r"[^\d,]", "", x)
+    return x
+
+
+# 5. Discount -> number or empty
+def clean_discount(x):
+    if pd.isna(x) or x == "":
+        return ""
+    x = str(x).replace("%", "").replace("-", "").strip()
+    return x if re.match(r"^\d+(\,\d+)?$", x.replace(".", ",")) else ""
+
+
+# 6. Stock -> number or "unlimited"
+def parse_stock(x):
+    if pd.isna(x) or x.strip() == "" or "In stock" in str(x):
+        return "unlimited"
+    match = re.search(r"\d+", str(x))
+    if match:
+        return int(match.group())
+    return "unlimited"
+
+
+# 7. Reviews_count -> extract number only
+def parse_reviews(x):
+    if pd.isna(x) or x.strip() == "":
+        return 0
+    match = re.search(r"\d+", str(x).replace(",", ""))
+    return int(match.group()) if match else 0
+
+
+# Helper: format age without .0 if integer
+def format_age(val):
+    if isinstance(val, float) and val.is_integer():
+        return str(int(val))
+    elif isinstance(val, int):
+        return str(val)
+    else:
+        return str(val)
+
+
+# 8. Age_range -> convert months to years, handle warnings correctly
+def parse_age(x, weight_text=""):
+    ages_min = []
+    ages_max = []
+    combined = str(x) + " " + str(weight_text)
+    combined = combined.lower()
+    # Extract ages from warning
+    warning_match = re.findall(r"under (\d+) months", combined)
+    for w in warning_match:
+        ages_min.append(round(int(w) / 12))
+
+    # Extract explicit ranges: separate months and years
+    ranges = re.findall(r"(\d+)\s*(month|year)", combined)
+    for n, unit in ranges:
+        n = int(n)
+        if unit == "month":
+            n = round(n / 12)
+        if ages_min == []:
+            ages_min.append(n)
+        ages_max.append(n)
+    if not ages_min and not ages_max:
+        return ""
+
+    min_age = min(ages_min) if ages_min else min(ages_max)
+    max_age = max(ages_max) if ages_max else min_age
+    return f"{format_age(min_age)}-{format_age(max_age)}" if min_age != max_age else format_age(min_age)
+
+
+# 9. Dimensions and Weight (weight rounded to integer type)
+def parse_dimensions_weight(x):
+    if pd.isna(x):
+        return pd.Series([np.nan, np.nan])
+
+    x_lower = x.lower()
+    # remove warning text
+    x_lower = re.sub(r"warning.*", "", x_lower)
+
+    # Weight extraction
+    weight_match = re.search(r"(\d+\.?\d*)\s*(kg|g)", x_lower)
+    weight = np.nan
+    if weight_match:
+        w, unit = weight_match.groups()
+        weight = float(w.replace(",", "."))  # Ensure decimal point for conversion
+        if unit == "kg":
+            weight *= 1000
+        weight = int(round(weight))  # int
+
+    # Dimensions: take first 3 numbers as is
+    dims_match = re.findall(r"(\d+\.?\d*)", x_lower)
+    dims = ""
+    if len(dims_match) >= 3:
+        dims = " x ".join(dims_match[:3])
+
+    return pd.Series([dims, weight])
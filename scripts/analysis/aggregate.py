@@ -0,0 +1,141 @@
+import argparse
+import hashlib
+import json
+from pathlib import Path
+
+import pandas as pd
+
+from scripts.analysis.features import PRICE_BUCKET_LABELS, read_sheets_csv
+from scripts.layout import SUMMARY_JSON
+
+# The pivot tables of the Sheets analysis (toy_type x price_bucket), from the
+# processed analysis CSV.
+#
+# summarize() computes every metric for each toy_type/price_bucket cell plus the
+# "Total" row, column and corner in one long table; pivot() turns one metric of
+# it into the familiar cross table. aggregate() keeps that table in a small JSON
+# summary file together with the SHA-256 of the CSV it came from, so re-running
+# on unchanged data only reads the summary.
+
+TOTAL = "Total"
+# Label for products without a price (no price_bucket) or toy_type, so they are a cell like any other
+UNKNOWN = "unknown"
+# Bump when the metrics change, so old summary files are recomputed
+SUMMARY_VERSION = 2
+DEFAULT_SUMMARY = SUMMARY_JSON
+
+# metric -> (analysis column, aggregation)
+METRICS = {
+    "products": ("asin", "size"),
+    "median_price": ("price", "median"),
+    "reviews": ("reviews_count", "sum"),
+}
+# Counts, kept as integers
+INTEGER_METRICS = ["products", "reviews"]
+# Plus "<flag>_share" (share of products with the flag) for every flag_* column
+
+
+def file_sha256(path, block_size=1 << 20):
+    """Hex SHA-256 of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def flag_columns(df):
+    return [col for col in df.columns if col.startswith("flag_")]
+
+
+def summarize(df):
+    """One row per toy_type x price_bucket cell with all metrics, totals labelled "Total".
+
+    Missing keys become "unknown" cells, so the cells always add up to the totals.
+    """
+    metrics = dict(METRICS)
+    metrics.update({f"{flag}_share": (flag, "mean") for flag in flag_columns(df)})
+    keyed = df.assign(**{key: df[key].astype(object).fillna(UNKNOWN).astype(str) for key in ("toy_type", "price_bucket")})
+
+    tables = []
+    # Cells, row totals, column totals, grand total: the keys left out are set to "Total"
+    for keys in (["toy_type", "price_bucket"], ["toy_type"], ["price_bucket"], []):
+        totals = {key: TOTAL for key in ("toy_type", "price_bucket") if key not in keys}
+        table = keyed.assign(**totals).groupby(["toy_type", "price_bucket"], sort=False).agg(**metrics)
+        tables.append(table.reset_index())
+    summary = pd.concat(tables, ignore_index=True)
+    summary[INTEGER_METRICS] = summary[INTEGER_METRICS].astype("Int64")
+
+    toy_types = sorted(set(summary["toy_type"]) - {TOTAL}) + [TOTAL]
+    buckets = [label for label in PRICE_BUCKET_LABELS + [UNKNOWN] if label in set(summary["price_bucket"])] + [TOTAL]
+    summary["toy_type"] = pd.Categorical(summary["toy_type"], categories=toy_types, ordered=True)
+    summary["price_bucket"] = pd.Categorical(summary["price_bucket"], categories=buckets, ordered=True)
+    return summary.sort_values(["toy_type", "price_bucket"]).reset_index(drop=True)
+
+
+def pivot(summary, metric):
+    """toy_type x price_bucket cross table of one metric (0 or empty where a type has no product in a bucket)."""
+    table = summary.pivot(index="toy_type", columns="price_bucket", values=metric)
+    return table.fillna(0) if metric in INTEGER_METRICS else table
+
+
+def save_summary(summary, path, source_hash):
+    table = summary.astype(object).where(summary.notna(), None)
+    data = {
+        "version": SUMMARY_VERSION,
+        "source_sha256": source_hash,
+        "columns": list(table.columns),
+        "rows": table.to_numpy().tolist(),
+    }
+    path = Path(path)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+    tmp_path.replace(path)
+
+
+def load_summary(path, source_hash=None):
+    """The summary table stored in path, or None if it is missing, outdated or (given a hash) from other data."""
+    path = Path(path)
+    if not path.exists():
+        return None
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("version") != SUMMARY_VERSION or (source_hash and data.get("source_sha256") != source_hash):
+        return None
+    summary = pd.DataFrame(data["rows"], columns=data["columns"])
+    summary[INTEGER_METRICS] = summary[INTEGER_METRICS].astype("Int64")
+    for key in ("toy_type", "price_bucket"):
+        summary[key] = pd.Categorical(summary[key], categories=list(dict.fromkeys(summary[key])), ordered=True)
+    return summary
+
+
+def aggregate(analysis_csv, summary_path=DEFAULT_SUMMARY, force=False):
+    """(summary, cached): the stored summary if it was built from the same CSV content, else a fresh one (saved)."""
+    source_hash = file_sha256(analysis_csv)
+    if not force:
+        summary = load_summary(summary_path, source_hash)
+        if summary is not None:
+            return summary, True
+    summary = summarize(read_sheets_csv(analysis_csv))
+    save_summary(summary, summary_path, source_hash)
+    return summary, False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pivot tables (toy_type x price_bucket) from the processed analysis CSV.")
+    parser.add_argument("analysis", nargs="?", default="toys_fisher_price_analysis.csv", help="Analysis CSV from features.py")
+    parser.add_argument("--summary", default=DEFAULT_SUMMARY, help="Summary JSON to read/write (cache keyed on the CSV's SHA-256)")
+    parser.add_argument("--pivot", action="append", dest="pivots", help="Metric to print as a cross table (repeatable, default: all)")
+    parser.add_argument("--force", action="store_true", help="Recompute even if the summary matches the CSV")
+    args = parser.parse_args()
+
+    summary, cached = aggregate(args.analysis, args.summary, args.force)
+    print(f"{'✅ Summary up to date' if cached else '✅ Summary saved'}: {args.summary}")
+    with pd.option_context("display.width", 200, "display.max_columns", None, "display.precision", 2):
+        for metric in args.pivots or [col for col in summary.columns if col not in ("toy_type", "price_bucket")]:
+            print(f"\n{metric}\n{pivot(summary, metric).to_string(na_rep='')}")
+
+
+if __name__ == "__main__":
+    main()
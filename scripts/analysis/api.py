@@ -0,0 +1,265 @@
+import argparse
+import asyncio
+import hashlib
+import io
+import json
+import re
+import signal
+from collections import OrderedDict
+from datetime import datetime
+from http import HTTPStatus
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import pandas as pd
+
+from scripts.analysis.aggregate import pivot, summarize
+from scripts.analysis.features import read_sheets_csv
+from scripts.analysis.query import KEY_COLUMNS, ToyIndex
+from scripts.layout import ANALYSIS_CSV, DEFAULT_DATA_DIR
+
+# Read-only local HTTP API over the latest pipeline output (standard library asyncio, no web framework).
+#
+#   GET /health                      source file, its SHA-256, rows, load time
+#   GET /products/<asin>             every row of one ASIN (one per category it is listed in, all analysis columns)
+#   GET /products?toy_type=wooden&price_min=10&price_max=30&flag=flag_eco&top=5&by=value_for_money&columns=asin,price&limit=50&offset=0
+#   GET /summary                     the toy_type x price_bucket summary table
+#   GET /summary/<metric>            one metric as a cross table {toy_type: {price_bucket: value}}
+#
+# The index, the summary (computed in memory; the API writes no files) and a
+# small response cache form one Dataset object.
+# A reload (the analysis CSV changed on disk, or SIGHUP) builds a new Dataset in
+# a worker thread and swaps the reference in one assignment: requests see either
+# the old or the new data, never a mix, and the old cache goes with the old data.
+
+DEFAULT_PORT = 8765
+# Responses kept per dataset version
+CACHE_SIZE = 512
+DEFAULT_LIMIT = 100
+# Seconds between checks of the analysis CSV for a new pipeline run
+RELOAD_INTERVAL = 5.0
+NON_NEGATIVE_INTEGER = re.compile(r"[0-9]+")
+
+
+class Dataset:
+    """One loaded version of the analysis data: index, summary and response cache."""
+
+    def __init__(self, analysis_csv):
+        self.source = Path(analysis_csv)
+        self.stat = self.source.stat()
+        # Hash and parse the same bytes, so both always describe one version of the file
+        content = self.source.read_bytes()
+        self.sha256 = hashlib.sha256(content).hexdigest()
+        features = read_sheets_csv(io.BytesIO(content))
+        self.index = ToyIndex(features)
+        self.summary = summarize(features)
+        self.loaded_at = datetime.now().isoformat(timespec="seconds")
+        self.cache = OrderedDict()
+
+    def changed_on_disk(self):
+        try:
+            stat = self.source.stat()
+        except FileNotFoundError:
+            return False
+        return (stat.st_mtime_ns, stat.st_size) != (self.stat.st_mtime_ns, self.stat.st_size)
+
+    def cached(self, key, build):
+        """(status, body) for a request key, built once per dataset version."""
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            return self.cache[key]
+        response = build()
+        self.cache[key] = response
+        if len(self.cache) > CACHE_SIZE:
+            self.cache.popitem(last=False)
+        return response
+
+
+def _json(payload):
+    return json.dumps(payload, ensure_ascii=False, allow_nan=False).encode("utf-8")
+
+
+def _records(df):
+    """Rows as JSON objects, NaN/NA as null."""
+    return json.loads(df.to_json(orient="records", force_ascii=False))
+
+
+def _number(query, name):
+    if name not in query:
+        return None
+    try:
+        return float(query[name][-1])
+    except ValueError:
+        raise ValueError(f"{name} must be a number") from None
+
+
+def _integer(query, name, default=None):
+    if name not in query:
+        return default
+    value = query[name][-1]
+    if not NON_NEGATIVE_INTEGER.fullmatch(value):
+        raise ValueError(f"{name} must be a non-negative integer")
+    return int(value)
+
+
+def _columns(index, query):
+    columns = query.get("columns", [",".join(KEY_COLUMNS)])[-1].split(",")
+    unknown = [col for col in columns if col not in index.df.columns]
+    if unknown:
+        raise ValueError(f"Unknown columns: {', '.join(unknown)}")
+    return columns
+
+
+def products(data, query):
+    index = data.index
+    filters = dict(
+        toy_type=query.get("toy_type"),
+        price_bucket=query.get("price_bucket"),
+        price_min=_number(query, "price_min"),
+        price_max=_number(query, "price_max"),
+        reviews_min=_number(query, "reviews_min"),
+        reviews_max=_number(query, "reviews_max"),
+        flags=query.get("flag", []),
+    )
+    columns = _columns(index, query)
+    top = _integer(query, "top")
+    if top is not None:
+        by = query.get("by", ["value_for_money"])[-1]
+        if by not in index.df.columns:
+            raise ValueError(f"Unknown column {by!r}")
+        rows = index.top(top, by, columns, **filters)
+    else:
+        rows = index.query(columns, **filters)
+    offset, limit = _integer(query, "offset", 0), _integer(query, "limit", DEFAULT_LIMIT)
+    return {"total": len(rows), "offset": offset, "products": _records(rows.iloc[offset:offset + limit])}
+
+
+def respond(data, path, query):
+    """(status, JSON payload) for a GET request."""
+    parts = [unquote(part) for part in path.strip("/").split("/") if part]
+    if parts in ([], ["health"]):
+        return HTTPStatus.OK, {"source": str(data.source), "sha256": data.sha256, "rows": len(data.index), "loaded_at": data.loaded_at}
+    if parts == ["products"]:
+        return HTTPStatus.OK, products(data, query)
+    if len(parts) == 2 and parts[0] == "products":
+        rows = data.index.get(parts[1])
+        if not rows:
+            return HTTPStatus.NOT_FOUND, {"error": f"Unknown ASIN {parts[1]}"}
+        return HTTPStatus.OK, {"asin": parts[1], "products": _records(pd.DataFrame(rows))}
+    if parts == ["summary"]:
+        return HTTPStatus.OK, {"summary": _records(data.summary)}
+    if len(parts) == 2 and parts[0] == "summary":
+        if parts[1] not in data.summary.columns or parts[1] in ("toy_type", "price_bucket"):
+            return HTTPStatus.NOT_FOUND, {"error": f"Unknown metric {parts[1]}"}
+        table = pivot(data.summary, parts[1])
+        return HTTPStatus.OK, {"metric": parts[1], "table": json.loads(table.to_json(orient="index", force_ascii=False))}
+    return HTTPStatus.NOT_FOUND, {"error": f"No route for {path}"}
+
+
+class ToysApi:
+    def __init__(self, analysis_csv):
+        self.analysis_csv = Path(analysis_csv)
+        self.data = Dataset(self.analysis_csv)
+        self.reloading = None
+
+    def handle_get(self, target):
+        data = self.data  # one version for the whole request
+        url = urlsplit(target)
+        query = parse_qs(url.query, keep_blank_values=True)
+        key = (url.path, tuple(sorted((name, tuple(values)) for name, values in query.items())))
+
+        def build():
+            try:
+                status, payload = respond(data, url.path, query)
+            except ValueError as e:
+                # Bad parameters, unknown flags or columns
+                status, payload = HTTPStatus.BAD_REQUEST, {"error": str(e)}
+            return status, _json(payload)
+
+        return data.cached(key, build)
+
+    async def handle(self, reader, writer):
+        try:
+            request_line = (await reader.readline()).decode("latin-1").split()
+            # Headers are not needed: read up to the empty line
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            if len(request_line) != 3:
+                status, body = HTTPStatus.BAD_REQUEST, _json({"error": "Malformed request"})
+            elif request_line[0] not in ("GET", "HEAD"):
+                status, body = HTTPStatus.METHOD_NOT_ALLOWED, _json({"error": "Read-only API: GET only"})
+            else:
+                try:
+                    status, body = self.handle_get(request_line[1])
+                except Exception as e:
+                    status, body = HTTPStatus.INTERNAL_SERVER_ERROR, _json({"error": str(e)})
+            head = (
+                f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                "Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "Connection: close\r\n\r\n"
+            )
+            writer.write(head.encode("latin-1") + (b"" if request_line[:1] == ["HEAD"] else body))
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def reload(self):
+        """Load the current files in a worker thread and swap them in; on failure keep serving the old data."""
+        if self.reloading:
+            return
+        self.reloading = True
+        try:
+            data = await asyncio.to_thread(Dataset, self.analysis_csv)
+        except Exception as e:
+            # e.g. the pipeline is still writing the file: try again on the next check
+            print(f"Reload failed, still serving {self.data.sha256[:12]}: {e}")
+        else:
+            self.data = data
+            print(f"Reloaded {data.source} ({len(data.index)} products, {data.sha256[:12]})")
+        finally:
+            self.reloading = False
+
+    async def watch(self, interval):
+        while True:
+            await asyncio.sleep(interval)
+            if self.data.changed_on_disk():
+                await self.reload()
+
+    async def serve(self, host="127.0.0.1", port=DEFAULT_PORT, reload_interval=RELOAD_INTERVAL):
+        server = await asyncio.start_server(self.handle, host, port)
+        loop = asyncio.get_running_loop()
+        if hasattr(signal, "SIGHUP"):
+            loop.add_signal_handler(signal.SIGHUP, lambda: asyncio.ensure_future(self.reload()))
+        if reload_interval:
+            watcher = asyncio.ensure_future(self.watch(reload_interval))
+        print(f"✅ Serving {len(self.data.index)} products from {self.analysis_csv} on http://{host}:{port}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if reload_interval:
+                watcher.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the processed toys dataset and its aggregates over a local read-only HTTP API.")
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR, help=f"Pipeline output directory (uses processed/ inside it, default {DEFAULT_DATA_DIR})")
+    parser.add_argument("--analysis", help=f"Analysis CSV (default: <data-dir>/processed/{ANALYSIS_CSV})")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--reload-interval", type=float, default=RELOAD_INTERVAL, help="Seconds between checks for new pipeline output (0: only on SIGHUP)")
+    args = parser.parse_args()
+
+    analysis_csv = Path(args.analysis) if args.analysis else Path(args.data_dir) / "processed" / ANALYSIS_CSV
+    api = ToysApi(analysis_csv)
+    try:
+        asyncio.run(api.serve(args.host, args.port, args.reload_interval))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
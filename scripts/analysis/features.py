@@ -0,0 +1,225 @@
+import argparse
+import re
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from scripts.analysis.keyword_flags import KeywordFlagger, load_keywords
+from scripts.analysis.outliers import outlier_flags
+
+# Feature engineering on the merged dataset.
+#
+# These are the metrics, buckets, outlier marks and keyword flags that used to
+# be added by hand in Google Sheets (toys_fisher_price_analysis.csv).
+# compute_features() returns them as numbers; format_for_sheets() turns a
+# feature frame into the exact text of the Sheets export (€ prefix, decimal
+# comma, #N/A), so the formatting stays at the edge like in the merge.
+
+# Price buckets: upper bound (exclusive) -> label; everything above the last bound is ">=40 €"
+PRICE_BUCKET_EDGES = [10, 20, 30, 40]
+PRICE_BUCKET_LABELS = ["<10 €", "10-20 €", "20-30 €", "30-40 €", ">=40 €"]
+# The Sheets lookup for the bucket order never matched, so the export holds 999 on every row
+BUCKET_ORDER = 999
+
+ANALYSIS_COLUMNS = [
+    "asin", "url", "title", "price", "old_price", "discount", "stock", "reviews_count",
+    "min_age", "max_age", "weight_grams", "short_description", "toy_type", "€/g",
+    "age_span", "avg_age", "price_review_ratio", "value_for_money", "price_per_year", "reviews_density",
+    "price_outlier_by_type", "€/g_outlier_global", "reviews_outlier_global",
+    "price_bucket", "bucket_order",
+    "flag_emotional_triggers", "flag_montessori", "flag_eco",
+]
+# Analysis columns that are not numbers
+TEXT_COLUMNS = ["asin", "url", "title", "short_description", "toy_type", "price_bucket"]
+
+# "(0.5, 7.0)" / "(3.0, 7)" / "0" from age_tuple, "3-7" / "3" from the current cleaner's age_range
+AGE_TUPLE = re.compile(r"^\(?\s*(?P<min>\d+(?:\.\d+)?)\s*(?:,\s*(?P<max>\d+(?:\.\d+)?))?\s*\)?$")
+AGE_RANGE = re.compile(r"^(?P<min>\d+(?:\.\d+)?)(?:-(?P<max>\d+(?:\.\d+)?))?$")
+
+
+def round_half_up(values, decimals=0):
+    """Spreadsheet rounding (halves away from zero) of a float array or Series."""
+    scale = 10.0 ** decimals
+    # Snap binary noise first so 1.375 and 2.675 round like their decimal text
+    scaled = np.round(np.abs(values) * scale, 6)
+    return np.sign(values) * np.floor(scaled + 0.5) / scale
+
+
+def age_bounds(df):
+    """(min_age, max_age) in years as floats, from age_tuple or (if that is empty) age_range."""
+    min_age = pd.Series(np.nan, index=df.index)
+    max_age = pd.Series(np.nan, index=df.index)
+    if "age_tuple" in df.columns:
+        parts = df["age_tuple"].astype("string").str.strip().str.extract(AGE_TUPLE)
+        min_age = pd.to_numeric(parts["min"], errors="coerce")
+        max_age = pd.to_numeric(parts["max"], errors="coerce")
+    if "age_range" in df.columns:
+        # A single age in age_range means min == max; only used where age_tuple had nothing
+        parts = df["age_range"].astype("string").str.strip().str.extract(AGE_RANGE)
+        range_min = pd.to_numeric(parts["min"], errors="coerce")
+        range_max = pd.to_numeric(parts["max"], errors="coerce").fillna(range_min)
+        missing = min_age.isna()
+        min_age = min_age.where(~missing, range_min)
+        max_age = max_age.where(~missing, range_max)
+    return min_age.astype("float64"), max_age.astype("float64")
+
+
+def keyword_flags(df, flagger=None):
+    """0/1 keyword flag columns (families from keywords.json) over the description."""
+    flagger = flagger or KeywordFlagger(load_keywords())
+    return flagger.flag_frame(df).astype("int64")
+
+
+def price_bucket(price):
+    bins = [-np.inf] + PRICE_BUCKET_EDGES + [np.inf]
+    return pd.cut(price, bins=bins, labels=PRICE_BUCKET_LABELS, right=False)
+
+
+def compute_features(merged):
+    """All analysis columns from a merged frame (numeric price/old_price/stock/weight_grams/€/g), as numbers."""
+    df = pd.DataFrame(index=merged.index)
+    for col in ["asin", "url", "title"]:
+        df[col] = merged[col]
+
+    price = merged["price"].astype("float64")
+    old_price = merged["old_price"].astype("float64")
+    reviews = merged["reviews_count"].astype("float64")
+    df["price"] = price
+    df["old_price"] = old_price
+    # Discount in % from the two prices (the scraped badge is often missing); none when not cheaper
+    discount = round_half_up((old_price - price) / old_price * 100)
+    df["discount"] = discount.where(discount > 0)
+    df["stock"] = merged["stock"].astype("Float64").astype("Int64")
+    df["reviews_count"] = merged["reviews_count"].astype("Int64")
+
+    min_age, max_age = age_bounds(merged)
+    df["min_age"] = min_age
+    df["max_age"] = max_age
+    df["weight_grams"] = round_half_up(merged["weight_grams"].astype("float64"))
+    df["short_description"] = merged["short_description"]
+    df["toy_type"] = merged["toy_type"]
+    df["€/g"] = merged["€/g"].astype("float64")
+
+    # Ages: span 0 when a bound is missing; avg_age is half the span, as in the Sheets version
+    span = (max_age - min_age).fillna(0)
+    df["age_span"] = span
+    df["avg_age"] = span / 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        df["price_review_ratio"] = (price / reviews).where(reviews != 0)
+        df["value_for_money"] = reviews / price
+        df["price_per_year"] = (price / span).where(span != 0)
+        df["reviews_density"] = (reviews / span).where(span != 0, reviews)
+
+    outliers = outlier_flags(df)
+    for flag in outliers.columns:
+        df[flag] = outliers[flag]
+
+    df["price_bucket"] = price_bucket(price)
+    df["bucket_order"] = BUCKET_ORDER
+
+    flags = keyword_flags(merged)
+    for flag in flags.columns:
+        df[flag] = flags[flag]
+    return df[ANALYSIS_COLUMNS]
+
+
+def _fixed(values, decimals):
+    """Numbers as text with a fixed number of decimals and a decimal comma; NaN -> ""."""
+    values = pd.Series(values, dtype="float64")
+    text = np.char.mod(f"%.{decimals}f", round_half_up(values.fillna(0).to_numpy(), decimals))
+    return pd.Series(text, index=values.index).str.replace(".", ",", regex=False).where(values.notna(), "")
+
+
+def _euro(values):
+    return ("€" + _fixed(values, 2)).where(values.notna(), "")
+
+
+def _integer(values):
+    return _fixed(values, 0)
+
+
+def format_for_sheets(features):
+    """Feature frame -> the text of the Sheets export (toys_fisher_price_analysis.csv)."""
+    out = features.copy()
+    out["price"] = _euro(features["price"])
+    out["old_price"] = _euro(features["old_price"])
+    out["discount"] = (_integer(features["discount"]) + "%").where(features["discount"].notna(), "")
+    out["stock"] = _integer(features["stock"].astype("Float64").astype("float64"))
+    out["reviews_count"] = _integer(features["reviews_count"].astype("float64"))
+    out["min_age"] = _fixed(features["min_age"], 2)
+    out["max_age"] = _fixed(features["max_age"], 2)
+    # Sheets' "#" number format: a weight that rounds to 0 shows as empty
+    out["weight_grams"] = _integer(features["weight_grams"].where(features["weight_grams"] != 0))
+    out["€/g"] = _euro(features["€/g"])
+    out["age_span"] = _fixed(features["age_span"], 2).where(features["age_span"] != 0, "0")
+    out["avg_age"] = _fixed(features["avg_age"], 2)
+    out["price_review_ratio"] = _euro(features["price_review_ratio"]).where(features["reviews_count"] != 0, "#N/A")
+    out["value_for_money"] = _fixed(features["value_for_money"], 2)
+    out["price_per_year"] = _euro(features["price_per_year"])
+    # Up to 3 decimals without trailing zeros
+    density = _fixed(features["reviews_density"], 3)
+    out["reviews_density"] = density.str.rstrip("0").str.rstrip(",").where(features["reviews_density"].notna(), "")
+    out["price_bucket"] = features["price_bucket"].astype(object).where(features["price_bucket"].notna(), "")
+    return out
+
+
+def write_sheets_csv(features, path):
+    """Write the analysis CSV exactly like the Sheets download (CRLF rows, no final newline)."""
+    text = format_for_sheets(features).to_csv(index=False, lineterminator="\r\n")
+    # Replaced in one step, so readers (e.g. the API's reload) never see a half-written file
+    path = Path(path)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+        f.write(text.removesuffix("\r\n"))
+    tmp_path.replace(path)
+
+
+def read_sheets_csv(path):
+    """An analysis CSV in the Sheets format back as numbers (the inverse of write_sheets_csv)."""
+    df = pd.read_csv(path, dtype=str, keep_default_na=False)
+    for col in ANALYSIS_COLUMNS:
+        if col in TEXT_COLUMNS or col not in df.columns:
+            continue
+        text = df[col].str.replace("€", "", regex=False).str.rstrip("%").str.replace(",", ".", regex=False)
+        df[col] = pd.to_numeric(text.where(~text.isin(["", "#N/A"])), errors="coerce").astype("float64")
+    if "price_bucket" in df.columns:
+        df["price_bucket"] = pd.Categorical(df["price_bucket"].replace("", None), categories=PRICE_BUCKET_LABELS, ordered=True)
+    return df
+
+
+def compare_with_export(features, expected_csv):
+    """Cells where the formatted features differ from an existing analysis CSV, as (row, column, ours, theirs)."""
+    ours = format_for_sheets(features).reset_index(drop=True)
+    theirs = pd.read_csv(expected_csv, dtype=str, keep_default_na=False)
+    ours = ours.astype(object).where(ours.notna(), "").astype(str)
+    differences = []
+    for col in ANALYSIS_COLUMNS:
+        if col not in theirs.columns:
+            differences.append((None, col, "", "<missing column>"))
+            continue
+        mismatch = ours[col] != theirs[col]
+        differences.extend((row, col, ours.at[row, col], theirs.at[row, col]) for row in ours.index[mismatch])
+    return differences
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compute the analysis features from the merged dataset.")
+    parser.add_argument("merged", nargs="?", default="toys_fisher_price_merged.csv", help="Merged CSV from merge_toys.py")
+    parser.add_argument("--output", default="toys_fisher_price_analysis.csv", help="Analysis CSV to write")
+    parser.add_argument("--check", metavar="ANALYSIS_CSV", help="Compare with an existing analysis CSV instead of writing")
+    args = parser.parse_args()
+
+    features = compute_features(pd.read_csv(args.merged))
+    if args.check:
+        differences = compare_with_export(features, args.check)
+        for row, col, ours, theirs in differences:
+            print(f"row {row} {col}: computed {ours!r}, file has {theirs!r}")
+        print(f"{len(differences)} differing cells out of {len(features) * len(ANALYSIS_COLUMNS)}")
+        return
+    write_sheets_csv(features, args.output)
+    print(f"✅ {len(features)} rows with features saved: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
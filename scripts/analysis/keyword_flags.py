@@ -0,0 +1,111 @@
+import argparse
+import json
+import re
+from collections import defaultdict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Keyword flags (emotional / Montessori / eco, or any other family in keywords.json).
+#
+# Every keyword of every family and language is compiled into one regular
+# expression shaped like a trie (e.g. "soft|sense|safe" -> "s(?:oft|afe|ense)"),
+# wrapped in a lookahead so each description is scanned once and every position
+# where any keyword starts is reported. A hit sets all families of that keyword
+# and of the keywords it contains ("wooden" also counts for "wood"), so the
+# result equals one substring test per keyword, without one pass per keyword.
+
+DEFAULT_KEYWORDS = Path(__file__).with_name("keywords.json")
+# Keywords are searched in these columns (the existing flags were set on the description)
+DEFAULT_FIELDS = ["short_description"]
+
+
+def load_keywords(path=DEFAULT_KEYWORDS):
+    """{flag column: {language: [keywords]}} from a JSON file."""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _trie(words):
+    root = {}
+    for word in words:
+        node = root
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    return root
+
+
+def _trie_pattern(node):
+    """Regex for a trie node; longer keywords are tried before a keyword ending here."""
+    branches = [re.escape(char) + _trie_pattern(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ""
+    if "" in node:
+        return f"(?:{'|'.join(branches)})?"
+    if len(branches) == 1:
+        return branches[0]
+    return f"(?:{'|'.join(branches)})"
+
+
+class KeywordFlagger:
+    """All keyword families compiled into one matcher; flags() returns one boolean column per family."""
+
+    def __init__(self, keywords, languages=None):
+        self.families = list(keywords)
+        families_of = defaultdict(set)
+        for index, family in enumerate(self.families):
+            for language, words in keywords[family].items():
+                if languages is None or language in languages:
+                    for word in words:
+                        families_of[word.lower()].add(index)
+
+        # A keyword found in the text also means every keyword inside it was found
+        self.families_of = {
+            word: sorted(set().union(*(families_of[inner] for inner in families_of if inner in word)))
+            for word in families_of
+        }
+        # Texts are lowercased once up front: much faster than re.IGNORECASE on every comparison
+        self.pattern = re.compile(f"(?=({_trie_pattern(_trie(self.families_of))}))")
+
+    def flags(self, text):
+        """Boolean DataFrame (one column per family) for a Series of texts."""
+        text = text.fillna("").astype(str)
+        found = pd.Series(text.str.lower().to_numpy(), dtype=object).str.findall(self.pattern)
+        hits = found.explode().dropna()
+
+        matrix = np.zeros((len(text), len(self.families)), dtype=bool)
+        if len(hits):
+            families = hits.map(self.families_of).explode()
+            matrix[families.index.to_numpy(), families.to_numpy(dtype=int)] = True
+        return pd.DataFrame(matrix, index=text.index, columns=self.families)
+
+    def flag_frame(self, df, fields=DEFAULT_FIELDS):
+        """Flags over the given text columns of a frame (joined with a newline, so no keyword spans two fields)."""
+        text = df[fields[0]].fillna("").astype(str)
+        for field in fields[1:]:
+            text = text + "\n" + df[field].fillna("").astype(str)
+        return self.flags(text)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Add keyword flag columns to a CSV (e.g. the merged dataset).")
+    parser.add_argument("input", help="CSV with the text columns")
+    parser.add_argument("--output", help="CSV to write (default: overwrite the input)")
+    parser.add_argument("--keywords", default=DEFAULT_KEYWORDS, help="Keyword families JSON ({flag: {language: [keywords]}})")
+    parser.add_argument("--field", action="append", dest="fields", help="Text column to search (repeatable, default: short_description)")
+    parser.add_argument("--language", action="append", dest="languages", help="Only use keywords of this language (repeatable, default: all)")
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.input)
+    flagger = KeywordFlagger(load_keywords(args.keywords), args.languages)
+    flags = flagger.flag_frame(df, args.fields or DEFAULT_FIELDS)
+    for flag in flags.columns:
+        df[flag] = flags[flag]
+    df.to_csv(args.output or args.input, index=False)
+    print(", ".join(f"{flag}: {int(flags[flag].sum())}" for flag in flags.columns))
+
+
+if __name__ == "__main__":
+    main()
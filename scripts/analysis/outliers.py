@@ -0,0 +1,255 @@
+import argparse
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Modified-IQR outlier marks: a value is an outlier outside
+# Q1 - m*IQR .. Q3 + m*IQR of its group (toy_type) or of the whole column.
+#
+# outlier_flags() computes the quartiles of all rules sharing a grouping in one
+# groupby call and broadcasts them back to the rows. For daily runs,
+# StreamingOutliers keeps a small t-digest per rule and group in a JSON state
+# file: each run only adds the new rows to the digests instead of re-sorting the
+# whole history, and flags with the (approximate) quartiles of everything seen.
+
+# Modified IQR: outside Q1 - 2*IQR .. Q3 + 2*IQR (wider than 1.5 because the sample is small)
+OUTLIER_MULTIPLIER = 2.0
+
+# (flag column, value column, group column or None for the whole column)
+OUTLIER_RULES = [
+    ("price_outlier_by_type", "price", "toy_type"),
+    ("€/g_outlier_global", "€/g", None),
+    ("reviews_outlier_global", "reviews_count", None),
+]
+
+# Centroids per digest (t-digest's delta): more is more exact and larger
+COMPRESSION = 200
+
+
+def _multiplier(flag, multipliers):
+    return (multipliers or {}).get(flag, OUTLIER_MULTIPLIER)
+
+
+def _flag(values, q1, q3, multiplier):
+    """0/1 outside Q1 - m*IQR .. Q3 + m*IQR; missing values and groups without quartiles are 0."""
+    iqr = q3 - q1
+    return ((values < q1 - multiplier * iqr) | (values > q3 + multiplier * iqr)).astype("int64")
+
+
+def quartile_bounds(df, rules=OUTLIER_RULES):
+    """{flag: (q1, q3)} per row, as float arrays: one quantile call per grouping for all its columns."""
+    by_group = {}
+    for flag, column, group in rules:
+        by_group.setdefault(group, []).append((flag, column))
+
+    bounds = {}
+    for group, members in by_group.items():
+        columns = list(dict.fromkeys(column for _, column in members))
+        values = df[columns].astype("float64")
+        if group is None:
+            quartiles = values.quantile([0.25, 0.75])
+            for flag, column in members:
+                q1, q3 = quartiles[column]
+                bounds[flag] = (np.full(len(df), q1), np.full(len(df), q3))
+            continue
+
+        grouped = values.groupby(df[group], sort=True, observed=True)
+        quartiles = grouped.quantile([0.25, 0.75]).unstack()
+        # Row -> position of its group in the (sorted) quantile result; -1 for a missing group
+        codes = grouped.ngroup().fillna(-1).to_numpy(dtype="int64")
+        for flag, column in members:
+            q1 = np.append(quartiles[(column, 0.25)].to_numpy(dtype="float64"), np.nan)[codes]
+            q3 = np.append(quartiles[(column, 0.75)].to_numpy(dtype="float64"), np.nan)[codes]
+            bounds[flag] = (q1, q3)
+    return bounds
+
+
+def outlier_flags(df, rules=OUTLIER_RULES, multipliers=None):
+    """0/1 outlier flag columns for the rules (exact quartiles, as in the Sheets version)."""
+    bounds = quartile_bounds(df, rules)
+    flags = pd.DataFrame(index=df.index)
+    for flag, column, _ in rules:
+        q1, q3 = bounds[flag]
+        flags[flag] = _flag(df[column].astype("float64"), q1, q3, _multiplier(flag, multipliers))
+    return flags
+
+
+def without_outliers(df, flags, columns=None):
+    """Rows of df not flagged by any of the given flag columns (default: all of them)."""
+    columns = columns or list(flags.columns)
+    return df[flags[columns].sum(axis=1) == 0]
+
+
+class TDigest:
+    """Mergeable quantile sketch (t-digest): weighted centroids, small at the tails.
+
+    New values are merged in batches: sorted together with the centroids and
+    cut where the k1 scale function crosses an integer, so a centroid covers
+    fewer points the closer it lies to q = 0 or 1. Quantiles interpolate between
+    centroid centres; as long as no points were merged they are exact and equal
+    to pandas' linear quantiles.
+    """
+
+    def __init__(self, compression=COMPRESSION, means=(), weights=(), minimum=np.inf, maximum=-np.inf):
+        self.compression = compression
+        self.means = np.asarray(means, dtype="float64")
+        self.weights = np.asarray(weights, dtype="float64")
+        self.minimum = minimum
+        self.maximum = maximum
+
+    @property
+    def count(self):
+        return float(self.weights.sum())
+
+    def update(self, values, weights=None):
+        values = np.asarray(values, dtype="float64")
+        weights = np.ones(len(values)) if weights is None else np.asarray(weights, dtype="float64")
+        keep = ~np.isnan(values)
+        values, weights = values[keep], weights[keep]
+        if not len(values):
+            return self
+        self.minimum = min(self.minimum, values.min())
+        self.maximum = max(self.maximum, values.max())
+
+        means = np.concatenate([self.means, values])
+        weights = np.concatenate([self.weights, weights])
+        order = np.argsort(means, kind="stable")
+        means, weights = means[order], weights[order]
+
+        total = weights.sum()
+        centre = (np.cumsum(weights) - weights / 2) / total
+        # k1 scale: centroid boundaries are where delta/(2 pi) * asin(2q - 1) crosses an integer
+        k = self.compression / (2 * np.pi) * np.arcsin(2 * centre - 1)
+        cluster = np.floor(k - k[0]).astype("int64")
+        starts = np.flatnonzero(np.r_[True, cluster[1:] != cluster[:-1]])
+
+        self.weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / self.weights
+        return self
+
+    def merge(self, other):
+        self.update(other.means, other.weights)
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        return self
+
+    def quantile(self, q):
+        """Linear-interpolated quantile(s) of everything added so far (NaN when empty)."""
+        if not len(self.weights):
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else np.nan
+        total = self.weights.sum()
+        # A centroid of w points covers positions cum - w .. cum - 1; interpolate between their middles
+        positions = np.cumsum(self.weights) - (self.weights + 1) / 2
+        positions = np.r_[0.0, positions, total - 1]
+        means = np.r_[self.minimum, self.means, self.maximum]
+        return np.interp(np.asarray(q, dtype="float64") * (total - 1), positions, means)
+
+    def to_dict(self):
+        return {
+            "compression": self.compression,
+            "min": self.minimum,
+            "max": self.maximum,
+            "means": self.means.tolist(),
+            "weights": self.weights.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["compression"], data["means"], data["weights"], data["min"], data["max"])
+
+
+class StreamingOutliers:
+    """t-digests per rule and group, persisted between runs in a JSON file."""
+
+    def __init__(self, path=None, rules=OUTLIER_RULES, compression=COMPRESSION):
+        self.path = Path(path) if path else None
+        self.rules = rules
+        self.compression = compression
+        self.digests = {}
+        if self.path and self.path.exists():
+            with open(self.path, encoding="utf-8") as f:
+                state = json.load(f)
+            self.digests = {
+                flag: {group: TDigest.from_dict(digest) for group, digest in groups.items()}
+                for flag, groups in state.items()
+            }
+
+    def _groups(self, df, group):
+        """(group key, row mask) pairs; "" is the key of a whole-column rule."""
+        if group is None:
+            return [("", np.ones(len(df), dtype=bool))]
+        keys = df[group].astype("string")
+        return [(key, (keys == key).fillna(False).to_numpy()) for key in keys.dropna().unique()]
+
+    def update(self, df):
+        """Add the values of new rows (e.g. one day's scrape) to the digests."""
+        for flag, column, group in self.rules:
+            values = df[column].astype("float64").to_numpy()
+            digests = self.digests.setdefault(flag, {})
+            for key, mask in self._groups(df, group):
+                digests.setdefault(key, TDigest(self.compression)).update(values[mask])
+        return self
+
+    def flags(self, df, multipliers=None):
+        """0/1 outlier flags for df against the quartiles of all data added so far."""
+        flags = pd.DataFrame(index=df.index)
+        for flag, column, group in self.rules:
+            q1 = np.full(len(df), np.nan)
+            q3 = np.full(len(df), np.nan)
+            for key, mask in self._groups(df, group):
+                digest = self.digests.get(flag, {}).get(key)
+                if digest is not None:
+                    q1[mask], q3[mask] = digest.quantile([0.25, 0.75])
+            flags[flag] = _flag(df[column].astype("float64"), q1, q3, _multiplier(flag, multipliers))
+        return flags
+
+    def save(self):
+        state = {flag: {group: digest.to_dict() for group, digest in groups.items()} for flag, groups in self.digests.items()}
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        tmp_path.replace(self.path)
+
+
+def parse_multipliers(items):
+    """["price_outlier_by_type=3", "2.5"] -> {"price_outlier_by_type": 3.0, flag: 2.5 for every other rule}."""
+    multipliers = {}
+    for item in items or []:
+        flag, sep, value = item.rpartition("=")
+        if sep:
+            multipliers[flag] = float(value)
+        else:
+            multipliers.update({rule[0]: float(value) for rule in OUTLIER_RULES if rule[0] not in multipliers})
+    return multipliers
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mark modified-IQR outliers (price per toy_type, €/g and reviews overall).")
+    parser.add_argument("input", help="Merged or analysis CSV (numeric price, €/g, reviews_count; toy_type)")
+    parser.add_argument("--output", help="CSV with the outlier flag columns added (default: overwrite the input)")
+    parser.add_argument("--filtered", help="Also write the rows without any outlier flag to this CSV")
+    parser.add_argument("--multiplier", action="append", metavar="[FLAG=]M", help=f"IQR multiplier, for one flag or all (repeatable, default {OUTLIER_MULTIPLIER})")
+    parser.add_argument("--state", help="t-digest state JSON: add the input to it and flag against all data seen so far (approximate)")
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.input)
+    multipliers = parse_multipliers(args.multiplier)
+    if args.state:
+        streaming = StreamingOutliers(args.state).update(df)
+        flags = streaming.flags(df, multipliers)
+        streaming.save()
+    else:
+        flags = outlier_flags(df, multipliers=multipliers)
+
+    for flag in flags.columns:
+        df[flag] = flags[flag]
+    df.to_csv(args.output or args.input, index=False)
+    if args.filtered:
+        without_outliers(df, flags).to_csv(args.filtered, index=False)
+    print(", ".join(f"{flag}: {int(flags[flag].sum())}" for flag in flags.columns))
+
+
+if __name__ == "__main__":
+    main()
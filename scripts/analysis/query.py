@@ -0,0 +1,146 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from scripts.analysis.features import PRICE_BUCKET_LABELS, compute_features, read_sheets_csv
+
+# Load the analysis data once and query it many times.
+#
+# ToyIndex holds the analysis columns as one frame in (asin, toy_type) order plus
+# a few lookup structures: a dict asin -> rows (an ASIN listed in several
+# categories has one row per category), categorical codes for toy_type and
+# price_bucket, and price / reviews_count sorted once with their row order, so a
+# price or review range is two binary searches instead of a scan. Every filter
+# returns row positions, and they combine as plain numpy masks.
+
+# The columns the notebook looks at first
+KEY_COLUMNS = ["asin", "toy_type", "price", "old_price", "discount", "reviews_count", "€/g", "price_per_year", "value_for_money", "reviews_density"]
+
+
+class _SortedColumn:
+    """One numeric column sorted once; rows in [low, high] via searchsorted (missing values never match)."""
+
+    def __init__(self, values):
+        values = np.asarray(values, dtype="float64")
+        present = np.flatnonzero(~np.isnan(values))
+        order = np.argsort(values[present], kind="stable")
+        self.rows = present[order]
+        self.values = values[self.rows]
+
+    def between(self, low=None, high=None):
+        start = 0 if low is None else np.searchsorted(self.values, low, side="left")
+        stop = len(self.values) if high is None else np.searchsorted(self.values, high, side="right")
+        return self.rows[start:stop]
+
+
+class ToyIndex:
+    """The analysis dataset in memory, with filters by toy_type, price range, reviews, flags and top-N."""
+
+    def __init__(self, features):
+        df = features.drop_duplicates(subset=["asin", "toy_type"]).sort_values(["asin", "toy_type"]).reset_index(drop=True)
+        df["toy_type"] = df["toy_type"].astype("category")
+        df["price_bucket"] = pd.Categorical(df["price_bucket"], categories=PRICE_BUCKET_LABELS, ordered=True)
+        self.df = df
+        self.positions = {asin: rows.tolist() for asin, rows in df.groupby("asin", sort=False).indices.items()}
+        self.price = _SortedColumn(df["price"])
+        self.reviews = _SortedColumn(df["reviews_count"].astype("float64"))
+        self.flags = {col: df[col].fillna(0).to_numpy(dtype=bool) for col in df.columns if col.startswith("flag_")}
+
+    @classmethod
+    def from_analysis(cls, path):
+        """From the processed analysis CSV (Sheets format, as written by features.py)."""
+        return cls(read_sheets_csv(path))
+
+    @classmethod
+    def from_merged(cls, path):
+        """From the merged CSV, computing the features on the way."""
+        return cls(compute_features(pd.read_csv(path)))
+
+    def __len__(self):
+        return len(self.df)
+
+    def get(self, asin, columns=None):
+        """All rows of an ASIN (one per category it is listed in) as dicts; empty if the ASIN is unknown."""
+        rows = self.df.iloc[self.positions.get(asin, [])]
+        return (rows[columns] if columns else rows).to_dict(orient="records")
+
+    def _mask(self, positions):
+        mask = np.zeros(len(self.df), dtype=bool)
+        mask[positions] = True
+        return mask
+
+    def select(self, toy_type=None, price_min=None, price_max=None, reviews_min=None, reviews_max=None, flags=(), price_bucket=None):
+        """Row positions matching all given filters (toy_type / price_bucket: one value or a list)."""
+        mask = np.ones(len(self.df), dtype=bool)
+        for column, wanted in (("toy_type", toy_type), ("price_bucket", price_bucket)):
+            if wanted is not None:
+                categories = self.df[column].cat.categories
+                wanted = [wanted] if isinstance(wanted, str) else list(wanted)
+                codes = [categories.get_loc(value) for value in wanted if value in categories]
+                mask &= np.isin(self.df[column].cat.codes.to_numpy(), codes)
+        if price_min is not None or price_max is not None:
+            mask &= self._mask(self.price.between(price_min, price_max))
+        if reviews_min is not None or reviews_max is not None:
+            mask &= self._mask(self.reviews.between(reviews_min, reviews_max))
+        for flag in flags:
+            if flag not in self.flags:
+                raise ValueError(f"Unknown flag {flag!r} (expected one of {', '.join(self.flags)})")
+            mask &= self.flags[flag]
+        return np.flatnonzero(mask)
+
+    def query(self, columns=None, **filters):
+        """Products matching the filters (see select), in (asin, toy_type) order."""
+        rows = self.df.iloc[self.select(**filters)]
+        return rows[columns] if columns else rows
+
+    def top(self, n=10, by="value_for_money", columns=None, ascending=False, **filters):
+        """The n best products by a column among those matching the filters (missing values last)."""
+        positions = self.select(**filters)
+        values = self.df[by].to_numpy(dtype="float64")[positions]
+        values = values if ascending else -values
+        values = np.where(np.isnan(values), np.inf, values)
+        if n < len(positions):
+            keep = np.argpartition(values, n)[:n]
+            positions, values = positions[keep], values[keep]
+        rows = self.df.iloc[positions[np.argsort(values, kind="stable")]]
+        return rows[columns] if columns else rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the analysis dataset (filters and top-N).")
+    parser.add_argument("analysis", nargs="?", default="toys_fisher_price_analysis.csv", help="Analysis CSV from features.py")
+    parser.add_argument("--merged", action="store_true", help="The input is the merged CSV (features are computed)")
+    parser.add_argument("--asin", help="Show one product")
+    parser.add_argument("--toy-type", action="append", dest="toy_types")
+    parser.add_argument("--bucket", action="append", dest="buckets", help=f"Price bucket ({', '.join(PRICE_BUCKET_LABELS)})")
+    parser.add_argument("--price-min", type=float)
+    parser.add_argument("--price-max", type=float)
+    parser.add_argument("--reviews-min", type=float)
+    parser.add_argument("--flag", action="append", dest="flags", default=[], help="Only products with this flag (e.g. flag_eco; repeatable)")
+    parser.add_argument("--top", type=int, help="Only the N best products")
+    parser.add_argument("--by", default="value_for_money", help="Column for --top (default value_for_money)")
+    parser.add_argument("--columns", default=",".join(KEY_COLUMNS), help="Comma-separated columns to show")
+    args = parser.parse_args()
+
+    index = ToyIndex.from_merged(args.analysis) if args.merged else ToyIndex.from_analysis(args.analysis)
+    columns = args.columns.split(",")
+    if args.asin:
+        rows = index.get(args.asin, columns)
+        print(pd.DataFrame(rows).to_string(index=False) if rows else f"Unknown ASIN {args.asin}")
+        return
+
+    filters = dict(
+        toy_type=args.toy_types, price_bucket=args.buckets, price_min=args.price_min, price_max=args.price_max,
+        reviews_min=args.reviews_min, flags=args.flags,
+    )
+    if args.top:
+        result = index.top(args.top, args.by, columns, **filters)
+    else:
+        result = index.query(columns, **filters)
+    print(result.to_string(index=False))
+    print(f"{len(result)} of {len(index)} products")
+
+
+if __name__ == "__main__":
+    main()
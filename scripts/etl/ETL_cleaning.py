@@ -1,457 +1,193 @@
-import pandas as pd
-import numpy as np
-import re
-
-#------------------------------------------------------------
-#BABY_TOYS_CLEENING
-#------------------------------------------------------------
-
-
-# 1. Load raw CSV
-df = pd.read_csv("baby_toys_raw_2025-09-15.csv")
-
-# 2. Remove duplicates by ASIN
-df = df.drop_duplicates(subset="asin")
-
-# 3. Clean title: remove "Fisher-Price"
-df["title"] = df["title"].str.replace(r"(?i)^Fisher-Price\s*", "", regex=True)
-
-# 4. Price / old_price -> European format with comma
-def clean_price(x):
-    if pd.isna(x) or x == "":
-        return ""
-    x = str(x).replace("€", "").strip()
-    x = x.replace(".", ",")  # decimal dot to comma
-    x = re.sub(r"[^\d,]", "", x)
-    return x
-
-df["price"] = df["price"].apply(clean_price)
-df["old_price"] = df["old_price"].apply(clean_price)
-
-# 5. Discount -> number or empty
-def clean_discount(x):
-    if pd.isna(x) or x == "":
-        return ""
-    x = str(x).replace("%", "").replace("-", "").strip()
-    return x if re.match(r"^\d+(\,\d+)?$", x.replace(".", ",")) else ""
-
-df["discount"] = df["discount"].apply(clean_discount)
-
-# 6. Stock -> number or "unlimited"
-def parse_stock(x):
-    if pd.isna(x) or x.strip() == "" or "In stock" in str(x):
-        return "unlimited"
-    match = re.search(r"\d+", str(x))
-    if match:
-        return int(match.group())
-    return "unlimited"
-
-df["stock"] = df["stock"].apply(parse_stock)
-
-# 7. Reviews_count -> extract number only
-def parse_reviews(x):
-    if pd.isna(x) or x.strip() == "":
-        return 0
-    match = re.search(r"\d+", str(x).replace(",", ""))
-    return int(match.group()) if match else 0
-
-df["reviews_count"] = df["reviews_count"].apply(parse_reviews)
-
-# Helper: format age without .0 if integer
-def format_age(val):
-    if isinstance(val, float) and val.is_integer():
-        return str(int(val))
-    elif isinstance(val, int):
-        return str(val)
-    else:
-        return str(val)
-
-# 8. Age_range -> convert months to years, handle warnings correctly
-def parse_age(x, weight_text=""):
-    ages_min = []
-    ages_max = []
-    combined = str(x) + " " + str(weight_text)
-    combined = combined.lower()
-    # Extract ages from warning
-    warning_match = re.findall(r"under (\d+) months", combined)
-    for w in warning_match:
-        ages_min.append(round(int(w) / 12))
-
-    # Extract explicit ranges: separate months and years
-    ranges = re.findall(r"(\d+)\s*(month|year)", combined)
-    for n, unit in ranges:
-        n = int(n)
-        if unit == "month":
-            n = round(n / 12)
-        if ages_min == []:
-            ages_min.append(n)
-        ages_max.append(n)
-    if not ages_min and not ages_max:
-        return ""
-
-    min_age = min(ages_min) if ages_min else min(ages_max)
-    max_age = max(ages_max) if ages_max else min_age
-    return f"{format_age(min_age)}-{format_age(max_age)}" if min_age != max_age else format_age(min_age)
-
-df["age_range"] = df.apply(lambda row: parse_age(row["age_range"], row.get("weight", "")), axis=1)
-
-# 9. Dimensions and Weight (weight rounded to integer type)
-def parse_dimensions_weight(x):
-    if pd.isna(x):
-        return pd.Series([np.nan, np.nan])
-
-    x_lower = x.lower()
-    # remove warning text
-    x_lower = re.sub(r"warning.*", "", x_lower)
-
-    # Weight extraction
-    weight_match = re.search(r"(\d+\.?\d*)\s*(kg|g)", x_lower)
-    weight = np.nan
-    if weight_match:
-        w, unit = weight_match.groups()
-        weight = float(w.replace(",", "."))  # Ensure decimal point for conversion
-        if unit == "kg":
-            weight *= 1000
-        weight = int(round(weight))  # int
-
-    # Dimensions: take first 3 numbers as is
-    dims_match = re.findall(r"(\d+\.?\d*)", x_lower)
-    dims = ""
-    if len(dims_match) >= 3:
-        dims = " x ".join(dims_match[:3])
-
-    return pd.Series([dims, weight])
-
-df[["dimensions_cm", "weight_grams"]] = df["weight"].apply(parse_dimensions_weight)
-
-# Drop original weight column
-df = df.drop(columns=["weight"])
-
-# 10. Price per gram €/g rounded to 2 decimals and formatted with comma
-def compute_price_per_gram(price, weight):
-    if price == "" or pd.isna(weight) or weight == 0 or pd.isna(price):
-        return ""
-    p = float(price.replace(",", "."))
-    price_per_gram = round(p / weight, 2)
-    return str(price_per_gram).replace(".", ",")  # Convert to European format
-
-df["€/g"] = df.apply(lambda row: compute_price_per_gram(row["price"], row["weight_grams"]), axis=1)
-
-# Convert weight_grams to string with comma for European format
-def format_european_number(x):
-    if pd.isna(x):
-        return ""
-    return str(x).replace(".", ",")
-
-df["weight_grams"] = df["weight_grams"].apply(format_european_number)
-
-# 11. Move short_description to last column
-cols = [c for c in df.columns if c != "short_description"] + ["short_description"]
-df = df[cols]
-
-# 12. Save cleaned CSV
-df.to_csv("baby_toys_cleaned_2025-09-15.csv", index=False)
-
-print("Cleaning completed, file saved: baby_toys_cleaned_2025-09-15.csv")
-
-#------------------------------------------------------------
-#WOODEN_TOYS_CLEENING
-#------------------------------------------------------------
-
-# 1. Load raw CSV
-df = pd.read_csv("wooden_toys_raw_2025-09-15.csv")
-
-# 2. Remove duplicates by ASIN
-df = df.drop_duplicates(subset="asin")
-
-# 3. Clean title: remove "Fisher-Price"
-df["title"] = df["title"].str.replace(r"(?i)^Fisher-Price\s*", "", regex=True)
-
-# 4. Price / old_price -> European format with comma
-def clean_price(x):
-    if pd.isna(x) or x == "":
-        return ""
-    x = str(x).replace("€", "").strip()
-    x = x.replace(".", ",")  # decimal dot to comma
-    x = re.sub(r"[^\d,]", "", x)
-    return x
-
-df["price"] = df["price"].apply(clean_price)
-df["old_price"] = df["old_price"].apply(clean_price)
-
-# 5. Discount -> number or empty
-def clean_discount(x):
-    if pd.isna(x) or x == "":
-        return ""
-    x = str(x).replace("%", "").replace("-", "").strip()
-    return x if re.match(r"^\d+(\,\d+)?$", x.replace(".", ",")) else ""
-
-df["discount"] = df["discount"].apply(clean_discount)
-
-# 6. Stock -> number or "unlimited"
-def parse_stock(x):
-    if pd.isna(x) or x.strip() == "" or "In stock" in str(x):
-        return "unlimited"
-    match = re.search(r"\d+", str(x))
-    if match:
-        return int(match.group())
-    return "unlimited"
-
-df["stock"] = df["stock"].apply(parse_stock)
-
-# 7. Reviews_count -> extract number only
-def parse_reviews(x):
-    if pd.isna(x) or x.strip() == "":
-        return 0
-    match = re.search(r"\d+", str(x).replace(",", ""))
-    return int(match.group()) if match else 0
-
-df["reviews_count"] = df["reviews_count"].apply(parse_reviews)
-
-# Helper: format age without .0 if integer
-def format_age(val):
-    if isinstance(val, float) and val.is_integer():
-        return str(int(val))
-    elif isinstance(val, int):
-        return str(val)
-    else:
-        return str(val)
-
-# 8. Age_range -> convert months to years, handle warnings correctly
-def parse_age(x, weight_text=""):
-    ages_min = []
-    ages_max = []
-    combined = str(x) + " " + str(weight_text)
-    combined = combined.lower()
-    # Extract ages from warning
-    warning_match = re.findall(r"under (\d+) months", combined)
-    for w in warning_match:
-        ages_min.append(round(int(w) / 12))
-
-    # Extract explicit ranges: separate months and years
-    ranges = re.findall(r"(\d+)\s*(month|year)", combined)
-    for n, unit in ranges:
-        n = int(n)
-        if unit == "month":
-            n = round(n / 12)
-        if ages_min == []:
-            ages_min.append(n)
-        ages_max.append(n)
-    if not ages_min and not ages_max:
-        return ""
-
-    min_age = min(ages_min) if ages_min else min(ages_max)
-    max_age = max(ages_max) if ages_max else min_age
-    return f"{format_age(min_age)}-{format_age(max_age)}" if min_age != max_age else format_age(min_age)
-
-df["age_range"] = df.apply(lambda row: parse_age(row["age_range"], row.get("weight", "")), axis=1)
-
-# 9. Dimensions and Weight (weight rounded to integer type)
-def parse_dimensions_weight(x):
-    if pd.isna(x):
-        return pd.Series([np.nan, np.nan])
-
-    x_lower = x.lower()
-    # remove warning text
-    x_lower = re.sub(r"warning.*", "", x_lower)
-
-    # Weight extraction
-    weight_match = re.search(r"(\d+\.?\d*)\s*(kg|g)", x_lower)
-    weight = np.nan
-    if weight_match:
-        w, unit = weight_match.groups()
-        weight = float(w.replace(",", "."))  # Ensure decimal point for conversion
-        if unit == "kg":
-            weight *= 1000
-        weight = int(round(weight))  # int
-
-    # Dimensions: take first 3 numbers as is
-    dims_match = re.findall(r"(\d+\.?\d*)", x_lower)
-    dims = ""
-    if len(dims_match) >= 3:
-        dims = " x ".join(dims_match[:3])
-
-    return pd.Series([dims, weight])
-
-df[["dimensions_cm", "weight_grams"]] = df["weight"].apply(parse_dimensions_weight)
-
-# Drop original weight column
-df = df.drop(columns=["weight"])
-
-# 10. Price per gram €/g rounded to 2 decimals and formatted with comma
-def compute_price_per_gram(price, weight):
-    if price == "" or pd.isna(weight) or weight == 0 or pd.isna(price):
-        return ""
-    p = float(price.replace(",", "."))
-    price_per_gram = round(p / weight, 2)
-    return str(price_per_gram).replace(".", ",")  # Convert to European format
-
-df["€/g"] = df.apply(lambda row: compute_price_per_gram(row["price"], row["weight_grams"]), axis=1)
-
-# Convert weight_grams to string with comma for European format
-def format_european_number(x):
-    if pd.isna(x):
-        return ""
-    return str(x).replace(".", ",")
-
-df["weight_grams"] = df["weight_grams"].apply(format_european_number)
-
-# 11. Move short_description to last column
-cols = [c for c in df.columns if c != "short_description"] + ["short_description"]
-df = df[cols]
-
-# 12. Save cleaned CSV
-df.to_csv("wooden_toys_cleaned_2025-09-15.csv", index=False)
-
-print("Cleaning completed, file saved: baby_toys_cleaned_2025-09-15.csv")
-
-#------------------------------------------------------------
-#SUSTAINABLE_TOYS_CLEENING
-#------------------------------------------------------------
-
-# 1. Load raw CSV
-df = pd.read_csv("sustainable_toys_raw_2025-09-15.csv")
-
-# 2. Remove duplicates by ASIN
-df = df.drop_duplicates(subset="asin")
-
-# 3. Clean title: remove "Fisher-Price"
-df["title"] = df["title"].str.replace(r"(?i)^Fisher-Price\s*", "", regex=True)
-
-# 4. Price / old_price -> European format with comma
-def clean_price(x):
-    if pd.isna(x) or x == "":
-        return ""
-    x = str(x).replace("€", "").strip()
-    x = x.replace(".", ",")  # decimal dot to comma
-    x = re.sub(r"[^\d,]", "", x)
-    return x
-
-df["price"] = df["price"].apply(clean_price)
-df["old_price"] = df["old_price"].apply(clean_price)
-
-# 5. Discount -> number or empty
-def clean_discount(x):
-    if pd.isna(x) or x == "":
-        return ""
-    x = str(x).replace("%", "").replace("-", "").strip()
-    return x if re.match(r"^\d+(\,\d+)?$", x.replace(".", ",")) else ""
-
-df["discount"] = df["discount"].apply(clean_discount)
-
-# 6. Stock -> number or "unlimited"
-def parse_stock(x):
-    if pd.isna(x) or x.strip() == "" or "In stock" in str(x):
-        return "unlimited"
-    match = re.search(r"\d+", str(x))
-    if match:
-        return int(match.group())
-    return "unlimited"
-
-df["stock"] = df["stock"].apply(parse_stock)
-
-# 7. Reviews_count -> extract number only
-def parse_reviews(x):
-    if pd.isna(x) or x.strip() == "":
-        return 0
-    match = re.search(r"\d+", str(x).replace(",", ""))
-    return int(match.group()) if match else 0
-
-df["reviews_count"] = df["reviews_count"].apply(parse_reviews)
-
-# Helper: format age without .0 if integer
-def format_age(val):
-    if isinstance(val, float) and val.is_integer():
-        return str(int(val))
-    elif isinstance(val, int):
-        return str(val)
-    else:
-        return str(val)
-
-# 8. Age_range -> convert months to years, handle warnings correctly
-def parse_age(x, weight_text=""):
-    ages_min = []
-    ages_max = []
-    combined = str(x) + " " + str(weight_text)
-    combined = combined.lower()
-    # Extract ages from warning
-    warning_match = re.findall(r"under (\d+) months", combined)
-    for w in warning_match:
-        ages_min.append(round(int(w) / 12))
-
-    # Extract explicit ranges: separate months and years
-    ranges = re.findall(r"(\d+)\s*(month|year)", combined)
-    for n, unit in ranges:
-        n = int(n)
-        if unit == "month":
-            n = round(n / 12)
-        if ages_min == []:
-            ages_min.append(n)
-        ages_max.append(n)
-    if not ages_min and not ages_max:
-        return ""
-
-    min_age = min(ages_min) if ages_min else min(ages_max)
-    max_age = max(ages_max) if ages_max else min_age
-    return f"{format_age(min_age)}-{format_age(max_age)}" if min_age != max_age else format_age(min_age)
-
-df["age_range"] = df.apply(lambda row: parse_age(row["age_range"], row.get("weight", "")), axis=1)
-
-# 9. Dimensions and Weight (weight rounded to integer type)
-def parse_dimensions_weight(x):
-    if pd.isna(x):
-        return pd.Series([np.nan, np.nan])
-
-    x_lower = x.lower()
-    # remove warning text
-    x_lower = re.sub(r"warning.*", "", x_lower)
-
-    # Weight extraction
-    weight_match = re.search(r"(\d+\.?\d*)\s*(kg|g)", x_lower)
-    weight = np.nan
-    if weight_match:
-        w, unit = weight_match.groups()
-        weight = float(w.replace(",", "."))  # Ensure decimal point for conversion
-        if unit == "kg":
-            weight *= 1000
-        weight = int(round(weight))  # int
-
-    # Dimensions: take first 3 numbers as is
-    dims_match = re.findall(r"(\d+\.?\d*)", x_lower)
-    dims = ""
-    if len(dims_match) >= 3:
-        dims = " x ".join(dims_match[:3])
-
-    return pd.Series([dims, weight])
-
-df[["dimensions_cm", "weight_grams"]] = df["weight"].apply(parse_dimensions_weight)
-
-# Drop original weight column
-df = df.drop(columns=["weight"])
-
-# 10. Price per gram €/g rounded to 2 decimals and formatted with comma
-def compute_price_per_gram(price, weight):
-    if price == "" or pd.isna(weight) or weight == 0 or pd.isna(price):
-        return ""
-    p = float(price.replace(",", "."))
-    price_per_gram = round(p / weight, 2)
-    return str(price_per_gram).replace(".", ",")  # Convert to European format
-
-df["€/g"] = df.apply(lambda row: compute_price_per_gram(row["price"], row["weight_grams"]), axis=1)
-
-# Convert weight_grams to string with comma for European format
-def format_european_number(x):
-    if pd.isna(x):
-        return ""
-    return str(x).replace(".", ",")
-
-df["weight_grams"] = df["weight_grams"].apply(format_european_number)
-
-# 11. Move short_description to last column
-cols = [c for c in df.columns if c != "short_description"] + ["short_description"]
-df = df[cols]
-
-# 12. Save cleaned CSV
-df.to_csv("sustainable_toys_cleaned_2025-09-15.csv", index=False)
-
-print("Cleaning completed, file saved: baby_toys_cleaned_2025-09-15.csv")
+import numpy as np
+import pandas as pd
+import argparse
+import glob
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from scripts.etl.parsers import (
+    TITLE_BRAND,
+    clean_discount,
+    clean_price,
+    compute_price_per_gram,
+    format_european_number,
+    parse_age,
+    parse_dimensions_weight,
+    parse_reviews,
+    parse_stock,
+)
+from scripts.etl import storage
+from scripts.etl.vectorized_cleaning import clean_dataframe_vectorized
+
+# Raw files are named <category>_raw_<YYYY-MM-DD>.csv by the scraper
+RAW_FILE = re.compile(r"^(?P<category>.+)_raw_(?P<date>\d{4}-\d{2}-\d{2})\.csv$")
+
+# Column dtypes of a cleaned file written with --typed (plain decimal point, empty = missing)
+TYPED_DTYPES = {
+    "price": "float64",
+    "old_price": "float64",
+    "discount": "float64",
+    "stock": "Int64",
+    "reviews_count": "Int64",
+    "weight_grams": "Int64",
+    "€/g": "float64",
+}
+
+
+def clean_dataframe(df):
+    """Run the full cleaning pipeline on one raw scraper DataFrame, row by row."""
+    # 2. Remove duplicates by ASIN
+    df = df.drop_duplicates(subset="asin")
+
+    # 3. Clean title: remove "Fisher-Price"
+    df["title"] = df["title"].str.replace(TITLE_BRAND, "", regex=True)
+
+    # 4. - 7. Prices, discount, stock, reviews
+    df["price"] = df["price"].apply(clean_price)
+    df["old_price"] = df["old_price"].apply(clean_price)
+    df["discount"] = df["discount"].apply(clean_discount)
+    df["stock"] = df["stock"].apply(parse_stock)
+    df["reviews_count"] = df["reviews_count"].apply(parse_reviews)
+
+    # 8. Age range (warnings can sit in the weight cell)
+    df["age_range"] = df.apply(lambda row: parse_age(row["age_range"], row.get("weight", "")), axis=1)
+
+    # 9. Dimensions and weight, then drop the original weight column
+    df[["dimensions_cm", "weight_grams"]] = df["weight"].apply(parse_dimensions_weight)
+    df = df.drop(columns=["weight"])
+
+    # 10. Price per gram and European formatted weight
+    df["€/g"] = df.apply(lambda row: compute_price_per_gram(row["price"], row["weight_grams"]), axis=1)
+    df["weight_grams"] = df["weight_grams"].apply(format_european_number)
+
+    # 11. Move short_description to last column
+    cols = [c for c in df.columns if c != "short_description"] + ["short_description"]
+    return df[cols]
+
+
+# "vectorized" (default) and "rowwise" produce the same output; rowwise is the reference implementation
+ENGINES = {
+    "rowwise": clean_dataframe,
+    "vectorized": clean_dataframe_vectorized,
+}
+
+
+def cleaned_path(raw_path, output_dir=None):
+    """baby_toys_raw_2025-09-15.csv -> <output_dir>/baby_toys_cleaned_2025-09-15.csv"""
+    raw_path = Path(raw_path)
+    match = RAW_FILE.match(raw_path.name)
+    if not match:
+        raise ValueError(f"Not a raw scraper file (<category>_raw_<date>.csv): {raw_path}")
+    directory = Path(output_dir) if output_dir is not None else raw_path.parent
+    return directory / f"{match['category']}_cleaned_{match['date']}.csv"
+
+
+def read_cleaned(path, typed=False, chunksize=None):
+    """Load a cleaned CSV (or an iterator of chunks); typed files come back with TYPED_DTYPES instead of being re-parsed."""
+    return pd.read_csv(path, dtype=TYPED_DTYPES if typed else None, chunksize=chunksize)
+
+
+def clean(df, engine="vectorized", typed=False):
+    if typed and engine != "vectorized":
+        raise ValueError("Typed output is only produced by the vectorized engine")
+    return clean_dataframe_vectorized(df, typed=True) if typed else ENGINES[engine](df)
+
+
+def clean_file(raw_path, output_dir=None, engine="vectorized", typed=False):
+    """Clean one raw CSV and save it next to it (or in output_dir). Returns the cleaned path."""
+    output_path = cleaned_path(raw_path, output_dir)
+
+    # 1. Load raw CSV
+    df = clean(pd.read_csv(raw_path), engine, typed)
+
+    # 12. Save cleaned CSV
+    df.to_csv(output_path, index=False)
+    print(f"Cleaning completed, file saved: {output_path}")
+    return output_path
+
+
+def find_raw_files(patterns=(), date=None, input_dir="."):
+    """Resolve file names/glob patterns, or all raw files of a date (default: every date) in input_dir."""
+    if not patterns:
+        patterns = [os.path.join(input_dir, f"*_raw_{date or '*'}.csv")]
+    files = []
+    for pattern in patterns:
+        files.extend(path for path in sorted(glob.glob(pattern)) if path not in files)
+    if date:
+        files = [path for path in files if f"_raw_{date}." in Path(path).name]
+    return files
+
+
+def clean_files(raw_files, output_dir=None, workers=None, engine="vectorized", typed=False):
+    """Clean several raw files in parallel, one process per file."""
+    if not raw_files:
+        print("No raw files to clean.")
+        return []
+    if output_dir is not None:
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+    # Validate names before starting any worker
+    for path in raw_files:
+        cleaned_path(path, output_dir)
+
+    workers = min(workers or os.cpu_count() or 1, len(raw_files))
+    if workers == 1:
+        return [clean_file(path, output_dir, engine, typed) for path in raw_files]
+    n = len(raw_files)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(clean_file, raw_files, [output_dir] * n, [engine] * n, [typed] * n))
+
+
+def clean_partition(root, toy_type, scrape_date, output_root=None, engine="vectorized", typed=False):
+    """Clean one raw Parquet partition into the cleaned stage of output_root (default: the same dataset)."""
+    df = storage.read_partition(root, "raw", toy_type, scrape_date, categories=False)
+    # Empty cells come back as "" from Parquet but as NaN from the CSV the parsers were written for
+    df = clean(df.replace("", np.nan), engine, typed)
+    path = storage.write_partition(df, output_root or root, "cleaned", toy_type, scrape_date)
+    print(f"Cleaning completed, partition saved: {path}")
+    return path
+
+
+def clean_partitions(root, dates=None, output_root=None, workers=None, engine="vectorized", typed=False):
+    """Clean every raw partition (of the given dates) of a Parquet dataset, one process per partition."""
+    keys = storage.partitions(root, "raw", dates=dates)
+    if not keys:
+        print("No raw partitions to clean.")
+        return []
+    workers = min(workers or os.cpu_count() or 1, len(keys))
+    if workers == 1:
+        return [clean_partition(root, toy_type, scrape_date, output_root, engine, typed) for toy_type, scrape_date in keys]
+    n = len(keys)
+    toy_types, scrape_dates = zip(*keys)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(clean_partition, [root] * n, toy_types, scrape_dates, [output_root] * n, [engine] * n, [typed] * n))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Clean raw scraper CSVs (<category>_raw_<date>.csv).")
+    parser.add_argument("files", nargs="*", help="Raw CSV files or glob patterns (default: all raw files in --input-dir)")
+    parser.add_argument("--date", help="Only clean raw files of this scrape date (YYYY-MM-DD)")
+    parser.add_argument("--input-dir", default=".", help="Where to look for raw files when no files are given")
+    parser.add_argument("--output-dir", help="Where to write *_cleaned_<date>.csv (default: next to each raw file)")
+    parser.add_argument("--workers", type=int, help="Number of worker processes (default: one per CPU)")
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="vectorized", help="Column-wise (fast) or row-wise (reference) parsers")
+    parser.add_argument("--typed", action="store_true", help="Write numeric columns as plain numbers (float/int) instead of European strings")
+    parser.add_argument("--storage", choices=["csv", "parquet"], default="csv", help="parquet: --input-dir/--output-dir are Parquet dataset roots (raw -> cleaned stage)")
+    args = parser.parse_args()
+    if args.typed and args.engine != "vectorized":
+        parser.error("--typed requires --engine vectorized")
+
+    if args.storage == "parquet":
+        if args.files:
+            parser.error("--storage parquet cleans the partitions under --input-dir; do not pass files")
+        dates = [args.date] if args.date else None
+        clean_partitions(args.input_dir, dates, args.output_dir, args.workers, args.engine, args.typed)
+        return
+
+    raw_files = find_raw_files(args.files, args.date, args.input_dir)
+    clean_files(raw_files, args.output_dir, args.workers, args.engine, args.typed)
+
+
+if __name__ == "__main__":
+    main()
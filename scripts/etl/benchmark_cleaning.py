@@ -0,0 +1,89 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from scripts.etl.ETL_cleaning import clean_dataframe
+from scripts.etl.vectorized_cleaning import clean_dataframe_vectorized
+
+# Field shapes seen in the scraped raw files, including the awkward ones
+STOCK_TEXTS = ["In stock", "Only 3 left in stock.", "Only 12 left in stock - order soon.", "Temporarily out of stock.", ""]
+REVIEW_TEXTS = ["{n:,} global ratings", "{n} global rating", ""]
+AGE_TEXTS = ["18 months and up", "3 - 7 years", "6 months - 3 years", "36 months", "2 Jahre und älter", ""]
+WEIGHT_TEXTS = [
+    "{a} x {b} x {c} cm; {w} g",
+    "{a} x {b} x {c} cm; {kg} kg",
+    "{w} g",
+    "{a} x {b} cm",
+    "Warning: not suitable for children under 36 months. {a} x {b} x {c} cm; {w} g",
+    "",
+]
+
+
+def make_synthetic_raw(n_rows, seed=0):
+    """Raw scraper-shaped DataFrame with n_rows unique products and realistic text variety."""
+    rng = np.random.default_rng(seed)
+    price = rng.uniform(3, 120, n_rows).round(2)
+    old_price = (price * rng.uniform(1.0, 2.0, n_rows)).round(2)
+    reviews = rng.integers(0, 60000, n_rows)
+    dims = rng.uniform(1, 60, (n_rows, 3)).round(2)
+    grams = rng.integers(20, 5000, n_rows)
+
+    def pick(options):
+        return np.asarray(options, dtype=object)[rng.integers(0, len(options), n_rows)]
+
+    weight = [
+        template.format(a=a, b=b, c=c, w=w, kg=w / 1000)
+        for template, (a, b, c), w in zip(pick(WEIGHT_TEXTS), dims, grams)
+    ]
+    reviews_text = [template.format(n=n) for template, n in zip(pick(REVIEW_TEXTS), reviews)]
+
+    df = pd.DataFrame({
+        "asin": [f"B{i:09d}" for i in range(n_rows)],
+        "url": [f"https://www.amazon.de/dp/B{i:09d}" for i in range(n_rows)],
+        "title": pick(["Fisher-Price Baby Blocks", "Fisher-Price Wooden Stacker", "Rattle Set"]),
+        "price": [f"€{p:.2f}" for p in price],
+        "old_price": [f"€{p:.2f}" for p in old_price],
+        "discount": pick(["-25%", "-7%", "", "Save 10%"]),
+        "stock": pick(STOCK_TEXTS),
+        "reviews_count": reviews_text,
+        "age_range": pick(AGE_TEXTS),
+        "weight": weight,
+        "short_description": pick(["Classic toy from 6 months", "Made from FSC wood\nPlastic free packaging"]),
+    })
+    # Empty strings come back as NaN from a CSV round-trip; mimic that
+    return df.replace("", np.nan)
+
+
+def time_it(function, df):
+    start = time.perf_counter()
+    result = function(df)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare row-wise and vectorized cleaning on synthetic raw data.")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Rows for the vectorized run")
+    parser.add_argument("--rowwise-rows", type=int, default=50_000, help="Rows for the (slow) row-wise run; its rate is extrapolated")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    df = make_synthetic_raw(args.rows, args.seed)
+    sample = df.head(args.rowwise_rows)
+
+    rowwise, rowwise_seconds = time_it(clean_dataframe, sample.copy())
+    vectorized_sample, _ = time_it(clean_dataframe_vectorized, sample.copy())
+    same = rowwise.to_csv(index=False) == vectorized_sample.to_csv(index=False)
+
+    _, vectorized_seconds = time_it(clean_dataframe_vectorized, df)
+
+    rowwise_rate = len(sample) / rowwise_seconds
+    vectorized_rate = len(df) / vectorized_seconds
+    print(f"Row-wise:   {len(sample):>9,} rows in {rowwise_seconds:7.2f}s  ({rowwise_rate:,.0f} rows/s)")
+    print(f"Vectorized: {len(df):>9,} rows in {vectorized_seconds:7.2f}s  ({vectorized_rate:,.0f} rows/s)")
+    print(f"Speed-up: {vectorized_rate / rowwise_rate:.1f}x; identical output on {len(sample):,} rows: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import argparse
+import time
+
+from benchmarks import baseline_parsers
+from scripts.etl import parsers
+from scripts.etl.benchmark_cleaning import make_synthetic_raw
+
+# Parser -> (raw columns it reads, in call order; the original function in baseline_parsers)
+CASES = {
+    "clean_price": (["price"], "clean_price"),
+    "clean_discount": (["discount"], "clean_discount"),
+    "parse_stock": (["stock"], "parse_stock"),
+    "parse_reviews": (["reviews_count"], "parse_reviews"),
+    "parse_age": (["age_range", "weight"], "parse_age"),
+    # The original returned a pd.Series per row; split_dimensions_weight returns the same values as a tuple
+    "split_dimensions_weight": (["weight"], "parse_dimensions_weight"),
+}
+
+
+def per_row_ns(function, rows):
+    start = time.perf_counter()
+    for args in rows:
+        function(*args)
+    return (time.perf_counter() - start) / len(rows) * 1e9
+
+
+def same_results(baseline, parser, rows):
+    """True if the original and the new parser agree on every row (NaN equal to NaN)."""
+    for args in rows:
+        expected, actual = baseline(*args), parser(*args)
+        if hasattr(expected, "tolist"):
+            expected = tuple(expected.tolist())
+        if expected != actual and str(expected) != str(actual):
+            return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-row cost of the ETL parsers: original (re per call), compiled, and memoized.")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--distinct", type=int, default=2_000, help="Distinct products the rows are drawn from (repeats hit the cache)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # A catalogue with repeated texts: rows are sampled from `distinct` products
+    df = make_synthetic_raw(args.distinct, args.seed).sample(args.rows, replace=True, random_state=args.seed)
+
+    print(f"{'parser':<24} {'original':>10} {'compiled':>10} {'cold cache':>11} {'warm cache':>11}   (ns/row, {args.rows:,} rows)")
+    for name, (columns, baseline_name) in CASES.items():
+        rows = list(zip(*(df[column].tolist() for column in columns)))
+        baseline = getattr(baseline_parsers, baseline_name)
+        memoized = getattr(parsers, name)
+        if not same_results(baseline, memoized.__wrapped__, rows[:5_000]):
+            raise SystemExit(f"{name} differs from the original parser")
+        memoized.cache_clear()
+        original = per_row_ns(baseline, rows)
+        compiled = per_row_ns(memoized.__wrapped__, rows)
+        cold = per_row_ns(memoized, rows)
+        warm = per_row_ns(memoized, rows)
+        print(
+            f"{name:<24} {original:>10,.0f} {compiled:>10,.0f} {cold:>11,.0f} {warm:>11,.0f}"
+            f"   hit rate {memoized.cache_info().hits / (2 * len(rows)):.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
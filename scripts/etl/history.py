@@ -0,0 +1,180 @@
+import argparse
+import sqlite3
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from scripts.merge.merge_toys import CLEANED_FILE, desired_columns, load_cleaned, merge_frames
+
+# Append-only price/review history across scrape dates (SQLite, standard library).
+#
+# Two tables:
+#   observations (asin, scrape_date, toy_type) -> row_hash   one small row per product and crawl
+#   versions     (asin, row_hash) -> the product's columns   stored once per distinct content
+#
+# A daily crawl in which most products did not change adds only observation
+# rows; the full row (title, description, prices, ...) is stored again only when
+# something in it changed. The observations primary key makes a product's
+# history an index range scan, and the (scrape_date, toy_type) index does the
+# same for a category snapshot of one day. Versions are never updated or
+# deleted; adding a date that is already stored again (re-cleaned after a
+# replay, say) points its observations at the corrected rows.
+
+DEFAULT_HISTORY = "toys_history.sqlite"
+
+# Stored product columns (the merged columns except toy_type, which is part of the observation)
+VERSION_COLUMNS = [col for col in desired_columns if col != "toy_type"]
+NUMERIC_COLUMNS = ["price", "old_price", "discount", "stock", "reviews_count", "weight_grams", "€/g"]
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS versions (
+    asin TEXT NOT NULL,
+    row_hash INTEGER NOT NULL,
+    {", ".join(f'"{col}" {"REAL" if col in NUMERIC_COLUMNS else "TEXT"}' for col in VERSION_COLUMNS if col != "asin")},
+    PRIMARY KEY (asin, row_hash)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS observations (
+    asin TEXT NOT NULL,
+    scrape_date TEXT NOT NULL,
+    toy_type TEXT NOT NULL,
+    row_hash INTEGER NOT NULL,
+    PRIMARY KEY (asin, scrape_date, toy_type)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS observations_by_date ON observations (scrape_date, toy_type);
+"""
+
+
+def normalized(df):
+    """Merged-shaped rows with numeric columns as float64 and text as str/None, so typed and string inputs agree."""
+    df = df.copy()
+    for col in df.columns:
+        if col in NUMERIC_COLUMNS:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("float64")
+        else:
+            df[col] = df[col].astype(object).where(df[col].notna(), None)
+            df[col] = df[col].map(lambda value: value if value is None else str(value))
+    return df
+
+
+def row_hashes(df, columns):
+    """64-bit content hash per row over the given columns (vectorized, signed so SQLite can store it)."""
+    return pd.util.hash_pandas_object(df[columns], index=False).to_numpy().view(np.int64)
+
+
+def _sql_values(df):
+    """Rows as tuples of plain Python values, missing values as None (SQL NULL)."""
+    return df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+
+
+class HistoryStore:
+    """(asin, scrape_date) history of the merged product rows; stored versions are append-only."""
+
+    def __init__(self, path=DEFAULT_HISTORY):
+        self.path = Path(path)
+        self.connection = sqlite3.connect(self.path)
+        self.connection.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def append(self, df, scrape_date):
+        """Add (or correct) one crawl (merged-shaped rows with toy_type). Returns (new or changed observations, new versions)."""
+        df = normalized(df[VERSION_COLUMNS + ["toy_type"]])
+        df = df[df["asin"].notna()].drop_duplicates(subset=["asin", "toy_type"])
+        df["row_hash"] = row_hashes(df, VERSION_COLUMNS)
+
+        with self.connection:
+            before = self.connection.total_changes
+            self.connection.executemany(
+                "INSERT INTO observations (asin, scrape_date, toy_type, row_hash) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (asin, scrape_date, toy_type) DO UPDATE SET row_hash = excluded.row_hash WHERE row_hash != excluded.row_hash",
+                ((asin, scrape_date, kind, row_hash) for asin, kind, row_hash in _sql_values(df[["asin", "toy_type", "row_hash"]])),
+            )
+            observed = self.connection.total_changes - before
+
+            columns = ["asin", "row_hash"] + VERSION_COLUMNS[1:]
+            names = ", ".join(f'"{col}"' for col in columns)
+            self.connection.executemany(
+                f"INSERT OR IGNORE INTO versions ({names}) VALUES ({', '.join('?' * len(columns))})",
+                _sql_values(df[columns]),
+            )
+            versions = self.connection.total_changes - before - observed
+        return observed, versions
+
+    def append_cleaned(self, path, typed=False):
+        """Add a cleaned <category>_cleaned_<date>.csv (date and toy_type from the file name)."""
+        scrape_date = CLEANED_FILE.match(Path(path).name)["date"]
+        return self.append(merge_frames(load_cleaned([path], typed), typed), scrape_date)
+
+    def _query(self, where, params, columns=None):
+        columns = columns or VERSION_COLUMNS
+        names = ", ".join(f'v."{col}"' for col in columns)
+        query = (
+            f"SELECT o.scrape_date, o.toy_type, {names} FROM observations o "
+            f"JOIN versions v ON v.asin = o.asin AND v.row_hash = o.row_hash WHERE {where}"
+        )
+        return pd.read_sql_query(query, self.connection, params=params)
+
+    def asin_history(self, asin, columns=None):
+        """Every stored crawl of one product, oldest first."""
+        return self._query("o.asin = ? ORDER BY o.scrape_date, o.toy_type", [asin], columns)
+
+    def snapshot(self, scrape_date, toy_type=None, columns=None):
+        """All products of one crawl date (optionally one toy_type), as they were that day."""
+        if toy_type is None:
+            return self._query("o.scrape_date = ? ORDER BY o.toy_type, o.asin", [scrape_date], columns)
+        return self._query("o.scrape_date = ? AND o.toy_type = ? ORDER BY o.asin", [scrape_date, toy_type], columns)
+
+    def dates(self):
+        return [row[0] for row in self.connection.execute("SELECT DISTINCT scrape_date FROM observations ORDER BY scrape_date")]
+
+    def counts(self):
+        """(observations, versions) stored."""
+        observations = self.connection.execute("SELECT COUNT(*) FROM observations").fetchone()[0]
+        versions = self.connection.execute("SELECT COUNT(*) FROM versions").fetchone()[0]
+        return observations, versions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Append cleaned crawls to the price/review history and query it.")
+    parser.add_argument("--history", default=DEFAULT_HISTORY, help="History database (SQLite)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    add = commands.add_parser("add", help="Append cleaned CSVs (<category>_cleaned_<date>.csv)")
+    add.add_argument("files", nargs="+")
+    add.add_argument("--typed", action="store_true", help="Files were cleaned with --typed")
+    asin = commands.add_parser("asin", help="History of one product")
+    asin.add_argument("asin")
+    asin.add_argument("--columns", default="price,old_price,discount,stock,reviews_count", help="Comma-separated columns to show")
+    snapshot = commands.add_parser("snapshot", help="All products of one crawl date")
+    snapshot.add_argument("date")
+    snapshot.add_argument("--toy-type")
+    snapshot.add_argument("--output", help="Write the snapshot to this CSV instead of printing it")
+    args = parser.parse_args()
+
+    with HistoryStore(args.history) as store:
+        if args.command == "add":
+            for path in args.files:
+                observed, versions = store.append_cleaned(path, args.typed)
+                print(f"{path}: {observed} new/changed observations, {versions} changed/new rows stored")
+            observations, versions = store.counts()
+            print(f"✅ History: {observations} observations, {versions} distinct rows, dates {', '.join(store.dates())}")
+        elif args.command == "asin":
+            print(store.asin_history(args.asin, args.columns.split(",")).to_string(index=False))
+        else:
+            df = store.snapshot(args.date, args.toy_type)
+            if args.output:
+                df.to_csv(args.output, index=False)
+                print(f"✅ {len(df)} rows saved: {args.output}")
+            else:
+                print(df.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
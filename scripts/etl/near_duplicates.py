@@ -0,0 +1,174 @@
+import argparse
+import re
+import zlib
+
+import numpy as np
+import pandas as pd
+
+# Near-duplicate products (colour variants, bundles, language versions under other ASINs).
+#
+# Each product's title + description is cut into overlapping word shingles and
+# summarized by a MinHash signature (NUM_PERM hash functions; two signatures
+# agree in a position with probability = Jaccard similarity of the shingle
+# sets). Locality-sensitive hashing splits the signatures into BANDS bands and
+# only products that share a whole band are compared: every pair inside a
+# bucket (up to BUCKET_WINDOW neighbours for oversized buckets), so the work
+# grows with the number of products and bucket sizes instead of with the number
+# of all pairs. Pairs whose signatures agree on at least `threshold` of the
+# positions are joined into groups (transitively), and every product gets the
+# smallest ASIN of its group as product_group.
+
+DEFAULT_FIELDS = ["title", "short_description"]
+# Words per shingle
+SHINGLE_SIZE = 3
+NUM_PERM = 128
+# 16 bands of 8 rows: pairs above ~(1/16)^(1/8) = 0.71 similarity very likely share a band
+BANDS = 16
+THRESHOLD = 0.7
+SEED = 42
+
+# Model numbers differ between variants of the same toy ("HJP90", "HXT85"), so they are not compared
+PRODUCT_CODE = re.compile(r"\b[a-z]{2,4}\d{2,3}\b")
+WORD = re.compile(r"\w+")
+
+# Multiply-shift hashing: the high 32 bits of (a * x + b) mod 2^64 for odd a (no division needed)
+SHIFT = np.uint64(32)
+FNV_PRIME = np.uint64(0x100000001B3)
+# Signature cells computed at once (bounds memory for long documents and many products)
+BLOCK_CELLS = 1 << 24
+# Signature value of documents without shingles
+EMPTY = np.iinfo(np.uint32).max
+# A bucket member is compared with at most this many following members (all pairs in smaller buckets)
+BUCKET_WINDOW = 50
+
+
+def document_text(df, fields=DEFAULT_FIELDS):
+    text = df[fields[0]].fillna("").astype(str)
+    for field in fields[1:]:
+        text = text + "\n" + df[field].fillna("").astype(str)
+    return text
+
+
+def shingle_hashes(texts, size=SHINGLE_SIZE):
+    """(hashes, offsets): 32-bit hashes of each text's distinct word shingles, document i at hashes[offsets[i]:offsets[i + 1]]."""
+    hashes, offsets = [], [0]
+    for text in texts:
+        words = WORD.findall(PRODUCT_CODE.sub(" ", text.lower()))
+        grams = {" ".join(words[i:i + size]) for i in range(max(len(words) - size + 1, 1 if words else 0))}
+        hashes.extend(zlib.crc32(gram.encode("utf-8")) for gram in grams)
+        offsets.append(len(hashes))
+    return np.array(hashes, dtype=np.uint64), np.array(offsets, dtype=np.int64)
+
+
+def minhash_signatures(hashes, offsets, num_perm=NUM_PERM, seed=SEED):
+    """(documents, num_perm) MinHash signatures; documents without shingles get EMPTY rows (they match nothing)."""
+    rng = np.random.default_rng(seed)
+    a = rng.integers(0, 1 << 63, num_perm, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, 1 << 63, num_perm, dtype=np.uint64)
+
+    n_docs = len(offsets) - 1
+    signatures = np.full((n_docs, num_perm), EMPTY, dtype=np.uint32)
+    docs_per_block = max(1, int(BLOCK_CELLS // (num_perm * max(1, len(hashes) / max(n_docs, 1)))))
+    for first in range(0, n_docs, docs_per_block):
+        last = min(first + docs_per_block, n_docs)
+        start, stop = offsets[first], offsets[last]
+        if stop == start:
+            continue
+        # (num_perm, shingles), so each document's shingles are contiguous for reduceat
+        values = np.multiply(a[:, None], hashes[None, start:stop])
+        values += b[:, None]
+        values >>= SHIFT
+        counts = np.diff(offsets[first:last + 1])
+        filled = np.flatnonzero(counts)
+        # Minimum over each document's shingles (reduceat needs non-empty segments)
+        minima = np.minimum.reduceat(values.astype(np.uint32), offsets[first + filled] - start, axis=1)
+        signatures[first + filled] = minima.T
+    return signatures
+
+
+def lsh_candidates(signatures, bands=BANDS, window=BUCKET_WINDOW):
+    """Candidate pairs (u, v), u < v: products sharing all rows of at least one band.
+
+    Every pair of a bucket is a candidate as long as the bucket has at most `window` + 1
+    members; in larger buckets each member is paired with the next `window` ones.
+    """
+    n_docs, num_perm = signatures.shape
+    rows = num_perm // bands
+    empty = signatures[:, 0] == EMPTY
+    pairs = []
+    for band in range(bands):
+        # Fold the band's rows into one 64-bit bucket key (a collision only adds a candidate that fails the check)
+        keys = np.zeros(n_docs, dtype=np.uint64)
+        for column in signatures[:, band * rows:(band + 1) * rows].T:
+            keys = (keys * FNV_PRIME) ^ column.astype(np.uint64)
+        keys = np.where(empty, np.arange(n_docs, dtype=np.uint64), keys)
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        # Members of a bucket are adjacent after sorting: pair each with the one `step` places further
+        for step in range(1, min(window, n_docs - 1) + 1):
+            same = np.flatnonzero(sorted_keys[step:] == sorted_keys[:-step])
+            if not len(same):
+                break
+            pairs.append(np.stack([order[same], order[same + step]], axis=1))
+    if not pairs:
+        return np.empty((0, 2), dtype=np.int64)
+    pairs = np.sort(np.concatenate(pairs), axis=1)
+    return np.unique(pairs, axis=0)
+
+
+def similar_pairs(signatures, threshold=THRESHOLD, bands=BANDS):
+    """LSH candidate pairs whose signatures agree on at least `threshold` of the positions."""
+    pairs = lsh_candidates(signatures, bands)
+    agreement = (signatures[pairs[:, 0]] == signatures[pairs[:, 1]]).mean(axis=1)
+    return pairs[agreement >= threshold]
+
+
+def connected_groups(n_docs, u, v):
+    """Component label (smallest member index) per document for the undirected edges u-v."""
+    labels = np.arange(n_docs)
+    while True:
+        low = np.minimum(labels[u], labels[v])
+        updated = labels.copy()
+        np.minimum.at(updated, u, low)
+        np.minimum.at(updated, v, low)
+        # Pointer jumping: follow labels to their own label until stable
+        updated = updated[updated]
+        if np.array_equal(updated, labels):
+            return labels
+        labels = updated
+
+
+def product_groups(df, threshold=THRESHOLD, fields=DEFAULT_FIELDS, bands=BANDS, num_perm=NUM_PERM):
+    """product_group per row: the smallest ASIN among the row's near-duplicates (its own ASIN if it has none)."""
+    hashes, offsets = shingle_hashes(document_text(df, fields))
+    signatures = minhash_signatures(hashes, offsets, num_perm)
+    pairs = similar_pairs(signatures, threshold, bands)
+    labels = connected_groups(len(df), pairs[:, 0], pairs[:, 1])
+
+    asins = df["asin"].astype(str).to_numpy()
+    return pd.Series(asins, index=df.index).groupby(labels).transform("min").rename("product_group")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Group near-duplicate products (MinHash/LSH over title and description) into product_group.")
+    parser.add_argument("input", help="CSV with asin and the text columns (e.g. the merged dataset)")
+    parser.add_argument("--output", help="CSV to write (default: overwrite the input)")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help=f"Minimum estimated Jaccard similarity of the word shingles (default {THRESHOLD})")
+    parser.add_argument("--field", action="append", dest="fields", help="Text column to compare (repeatable, default: title and short_description)")
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.input)
+    df["product_group"] = product_groups(df, args.threshold, args.fields or DEFAULT_FIELDS)
+    df.to_csv(args.output or args.input, index=False)
+
+    sizes = df["product_group"].value_counts()
+    print(f"✅ {len(df)} products in {len(sizes)} groups ({int((sizes > 1).sum())} with near-duplicates): {args.output or args.input}")
+    for group in sizes[sizes > 1].index:
+        members = df.loc[df["product_group"] == group].drop_duplicates(subset="asin")
+        print(f"  {group}:")
+        for asin, title in zip(members["asin"], members["title"].fillna("")):
+            print(f"    {asin}  {title[:80]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+import re
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# Row-wise parsers for the raw scraper fields.
+#
+# All patterns are compiled once here (the vectorized engine uses the same
+# objects), and every parser is memoized: texts such as "18 months and up",
+# "In stock" or a shared weight/dimensions cell repeat thousands of times in a
+# large catalogue, so most rows are answered from the cache without any regex work.
+
+CACHE_SIZE = 65536
+
+TITLE_BRAND = re.compile(r"(?i)^Fisher-Price\s*")
+NON_PRICE_CHARS = re.compile(r"[^\d,]")
+# Typed mode keeps the scraper's decimal point and drops currency/thousands marks
+NON_DECIMAL_CHARS = re.compile(r"[^\d.]")
+DISCOUNT_NUMBER = re.compile(r"^\d+(\,\d+)?$")
+FIRST_NUMBER = re.compile(r"\d+")
+AGE_WARNING = re.compile(r"under (\d+) months")
+AGE_VALUE = re.compile(r"(\d+)\s*(month|year)")
+# Same matches as AGE_VALUE, without groups (for findall on the whole match)
+AGE_VALUE_MATCH = re.compile(r"\d+\s*(?:month|year)")
+WARNING_TEXT = re.compile(r"warning.*")
+WEIGHT = re.compile(r"(\d+\.?\d*)\s*(kg|g)")
+DIMENSION_NUMBER = re.compile(r"(\d+\.?\d*)")
+
+
+def cache_info():
+    """Hit/miss statistics of every memoized parser."""
+    return {name: parser.cache_info() for name, parser in MEMOIZED.items()}
+
+
+# 4. Price / old_price -> European format with comma
+@lru_cache(maxsize=CACHE_SIZE, typed=True)
+def clean_price(x):
+    if pd.isna(x) or x == "":
+        return ""
+    x = str(x).replace("€", "").strip()
+    x = x.replace(".", ",")  # decimal dot to comma
+    x = NON_PRICE_CHARS.sub("", x)
+    return x
+
+
+# 5. Discount -> number or empty
+@lru_cache(maxsize=CACHE_SIZE, typed=True)
+def clean_discount(x):
+    if pd.isna(x) or x == "":
+        return ""
+    x = str(x).replace("%", "").replace("-", "").strip()
+    return x if DISCOUNT_NUMBER.match(x.replace(".", ",")) else ""
+
+
+# 6. Stock -> number or "unlimited"
+@lru_cache(maxsize=CACHE_SIZE, typed=True)
+def parse_stock(x):
+    if pd.isna(x) or x.strip() == "" or "In stock" in str(x):
+        return "unlimited"
+    match = FIRST_NUMBER.search(str(x))
+    if match:
+        return int(match.group())
+    return "unlimited"
+
+
+# 7. Reviews_count -> extract number only
+@lru_cache(maxsize=CACHE_SIZE, typed=True)
+def parse_reviews(x):
+    if pd.isna(x) or x.strip() == "":
+        return 0
+    match = FIRST_NUMBER.search(str(x).replace(",", ""))
+    return int(match.group()) if match else 0
+
+
+# Helper: format age without .0 if integer
+def format_age(val):
+    if isinstance(val, float) and val.is_integer():
+        return str(int(val))
+    elif isinstance(val, int):
+        return str(val)
+    else:
+        return str(val)
+
+
+# 8. Age_range -> convert months to years, handle warnings correctly
+@lru_cache(maxsize=CACHE_SIZE, typed=True)
+def parse_age(x, weight_text=""):
+    ages_min = []
+    ages_max = []
+    combined = str(x) + " " + str(weight_text)
+    combined = combined.lower()
+    # Extract ages from warning
+    warning_match = AGE_WARNING.findall(combined)
+    for w in warning_match:
+        ages_min.append(round(int(w) / 12))
+
+    # Extract explicit ranges: separate months and years
+    ranges = AGE_VALUE.findall(combined)
+    for n, unit in ranges:
+        n = int(n)
+        if unit == "month":
+            n = round(n / 12)
+        if ages_min == []:
+            ages_min.append(n)
+        ages_max.append(n)
+    if not ages_min and not ages_max:
+        return ""
+
+    min_age = min(ages_min) if ages_min else min(ages_max)
+    max_age = max(ages_max) if ages_max else min_age
+    return f"{format_age(min_age)}-{format_age(max_age)}" if min_age != max_age else format_age(min_age)
+
+
+# 9. Dimensions and Weight (weight rounded to integer type)
+@lru_cache(maxsize=CACHE_SIZE, typed=True)
+def split_dimensions_weight(x):
+    """(dimensions, weight in grams) of a weight cell; the cached core of parse_dimensions_weight."""
+    if pd.isna(x):
+        return np.nan, np.nan
+
+    x_lower = x.lower()
+    # remove warning text
+    x_lower = WARNING_TEXT.sub("", x_lower)
+
+    # Weight extraction
+    weight_match = WEIGHT.search(x_lower)
+    weight = np.nan
+    if weight_match:
+        w, unit = weight_match.groups()
+        weight = float(w.replace(",", "."))  # Ensure decimal point for conversion
+        if unit == "kg":
+            weight *= 1000
+        weight = int(round(weight))  # int
+
+    # Dimensions: take first 3 numbers as is
+    dims_match = DIMENSION_NUMBER.findall(x_lower)
+    dims = ""
+    if len(dims_match) >= 3:
+        dims = " x ".join(dims_match[:3])
+
+    return dims, weight
+
+
+def parse_dimensions_weight(x):
+    return pd.Series(split_dimensions_weight(x))
+
+
+# 10. Price per gram €/g rounded to 2 decimals and formatted with comma
+@lru_cache(maxsize=CACHE_SIZE, typed=True)
+def compute_price_per_gram(price, weight):
+    if price == "" or pd.isna(weight) or weight == 0 or pd.isna(price):
+        return ""
+    p = float(price.replace(",", "."))
+    price_per_gram = round(p / weight, 2)
+    return str(price_per_gram).replace(".", ",")  # Convert to European format
+
+
+# Convert weight_grams to string with comma for European format
+def format_european_number(x):
+    if pd.isna(x):
+        return ""
+    return str(x).replace(".", ",")
+
+
+MEMOIZED = {
+    "clean_price": clean_price,
+    "clean_discount": clean_discount,
+    "parse_stock": parse_stock,
+    "parse_reviews": parse_reviews,
+    "parse_age": parse_age,
+    "split_dimensions_weight": split_dimensions_weight,
+    "compute_price_per_gram": compute_price_per_gram,
+}
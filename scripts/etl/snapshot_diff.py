@@ -0,0 +1,149 @@
+import argparse
+import re
+from pathlib import Path
+
+import pandas as pd
+
+from scripts.etl.ETL_cleaning import RAW_FILE, clean
+from scripts.etl.history import normalized, row_hashes
+from scripts.etl.storage import toy_type_of
+from scripts.merge.merge_toys import CLEANED_FILE, desired_columns, load_cleaned, merge_frames, normalize
+
+# What changed between two crawls of a category.
+#
+# Both snapshots (raw or cleaned CSVs) are brought to the merged columns with
+# numbers as numbers, hashed per row, and joined on asin (pandas' merge is a hash
+# join, so the whole diff is linear in the number of products). Only rows whose
+# hash differs are compared column by column; the result is one long table with
+# a line per new/removed product and per changed value.
+#
+# Cleaning keeps only the "only N left" count of the stock text (in stock and
+# unavailable both become "unlimited"), so raw snapshots also carry the stock
+# state read from the scraped text, and stock changes are compared on that.
+
+# Columns compared value by value; any other difference is reported once as "content"
+TRACKED_COLUMNS = ["price", "old_price", "discount", "stock", "reviews_count"]
+CONTENT_COLUMNS = [col for col in desired_columns if col not in ("asin", "toy_type")]
+
+CHANGE_COLUMNS = ["asin", "change", "old", "new", "delta", "title"]
+
+ONLY_LEFT = re.compile(r"(?i)only (\d+) left")
+UNAVAILABLE = re.compile(r"(?i)unavailable|out of stock")
+
+
+def load_snapshot(path, typed=False):
+    """Merged-shaped, normalized rows of a raw (<category>_raw_<date>.csv) or cleaned CSV."""
+    name = Path(path).name
+    raw = RAW_FILE.match(name)
+    if raw:
+        raw_df = pd.read_csv(path)
+        df = merge_frames([normalize(clean(raw_df), toy_type_of(raw["category"]))])
+        states = raw_stock_state(raw_df["stock"]).groupby(raw_df["asin"]).first()
+    elif CLEANED_FILE.match(name):
+        df = merge_frames(load_cleaned([path], typed), typed)
+        states = None
+    else:
+        raise ValueError(f"Not a raw or cleaned file (<category>_raw|cleaned_<date>.csv): {path}")
+    df = normalized(df)
+    # Cleaned files only know the "only N left" count
+    df["stock_state"] = stock_state(df["stock"]) if states is None else df["asin"].map(states).fillna("in stock")
+    return df[df["asin"].notna()].drop_duplicates(subset="asin").reset_index(drop=True)
+
+
+def stock_state(stock):
+    """Cleaned stock: NaN (no "only N left" message) -> "in stock", N -> "only N left"."""
+    text = "only " + stock.map("{:.0f}".format) + " left"
+    return text.where(stock.notna(), "in stock")
+
+
+def raw_stock_state(stock):
+    """Scraped stock text -> "unavailable" (unavailable / out of stock), "only N left" or "in stock" (anything else)."""
+    text = stock.fillna("").astype(str)
+    count = text.str.extract(ONLY_LEFT, expand=False)
+    state = ("only " + count + " left").where(count.notna(), "in stock")
+    return state.mask(text.str.contains(UNAVAILABLE), "unavailable")
+
+
+def diff_snapshots(old, new):
+    """Long table (asin, change, old, new, delta, title) of everything that differs between two snapshots."""
+    old = old.assign(row_hash=row_hashes(old, CONTENT_COLUMNS + ["stock_state"]))
+    new = new.assign(row_hash=row_hashes(new, CONTENT_COLUMNS + ["stock_state"]))
+    joined = old[["asin", "row_hash"]].merge(new[["asin", "row_hash"]], on="asin", how="outer", suffixes=("_old", "_new"), indicator=True)
+
+    changes = []
+    added = new[new["asin"].isin(joined.loc[joined["_merge"] == "right_only", "asin"])]
+    changes.append(pd.DataFrame({"asin": added["asin"], "change": "new", "new": added["price"], "title": added["title"]}))
+    removed = old[old["asin"].isin(joined.loc[joined["_merge"] == "left_only", "asin"])]
+    changes.append(pd.DataFrame({"asin": removed["asin"], "change": "removed", "old": removed["price"], "title": removed["title"]}))
+
+    # Column-wise comparison only for the rows whose content hash changed
+    changed = joined.loc[(joined["_merge"] == "both") & (joined["row_hash_old"] != joined["row_hash_new"]), "asin"]
+    before = old.set_index("asin").loc[changed]
+    after = new.set_index("asin").loc[changed]
+    tracked_change = pd.Series(False, index=changed)
+    for col in TRACKED_COLUMNS:
+        # Stock is compared on its state, which also tells in stock from unavailable
+        source = "stock_state" if col == "stock" else col
+        differs = ~((before[source] == after[source]) | (before[source].isna() & after[source].isna()))
+        tracked_change |= differs
+        if not differs.any():
+            continue
+        rows = pd.DataFrame({
+            "asin": changed[differs.to_numpy()].to_numpy(),
+            "change": col,
+            "old": before.loc[differs, source].to_numpy(),
+            "new": after.loc[differs, source].to_numpy(),
+            "title": after.loc[differs, "title"].to_numpy(),
+        })
+        if col != "stock":
+            rows["delta"] = rows["new"] - rows["old"]
+        changes.append(rows)
+
+    # Text or other columns changed while every tracked value stayed the same
+    other = after[~tracked_change.to_numpy()]
+    changes.append(pd.DataFrame({"asin": other.index, "change": "content", "title": other["title"].to_numpy()}))
+
+    changes = [df for df in changes if len(df)]
+    if not changes:
+        # Identical snapshots (the usual case for two crawls on the same day)
+        return pd.DataFrame(columns=CHANGE_COLUMNS)
+    report = pd.concat(changes, ignore_index=True).reindex(columns=CHANGE_COLUMNS)
+    order = {change: position for position, change in enumerate(["new", "removed"] + TRACKED_COLUMNS + ["content"])}
+    return report.sort_values(["change", "asin"], key=lambda col: col.map(order) if col.name == "change" else col, kind="stable").reset_index(drop=True)
+
+
+def summarize(report, old, new):
+    counts = report["change"].value_counts()
+    lines = [f"{len(old)} -> {len(new)} products"]
+    lines += [f"{change}: {counts[change]}" for change in ["new", "removed"] + TRACKED_COLUMNS + ["content"] if change in counts]
+    reviews = report.loc[report["change"] == "reviews_count", "delta"]
+    if len(reviews):
+        lines.append(f"reviews gained: {reviews.clip(lower=0).sum():.0f}, lost: {abs(reviews.clip(upper=0).sum()):.0f}")
+    prices = report.loc[report["change"] == "price", "delta"]
+    if len(prices):
+        lines.append(f"price up: {int((prices > 0).sum())}, down: {int((prices < 0).sum())}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report what changed between two crawls (raw or cleaned CSVs) of a category.")
+    parser.add_argument("old", help="Earlier snapshot (<category>_raw_<date>.csv or <category>_cleaned_<date>.csv)")
+    parser.add_argument("new", help="Later snapshot")
+    parser.add_argument("--typed", action="store_true", help="Cleaned inputs were written with --typed")
+    parser.add_argument("--output", help="Write the change table to this CSV")
+    args = parser.parse_args()
+
+    old, new = load_snapshot(args.old, args.typed), load_snapshot(args.new, args.typed)
+    report = diff_snapshots(old, new)
+    print(summarize(report, old, new))
+    if args.output:
+        report.to_csv(args.output, index=False)
+        print(f"✅ {len(report)} changes saved: {args.output}")
+    elif report.empty:
+        print("No changes.")
+    else:
+        print(report.assign(title=report["title"].str.slice(0, 40)).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
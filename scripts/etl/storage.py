@@ -0,0 +1,120 @@
+import os
+from pathlib import Path
+
+import pandas as pd
+
+# Optional Parquet backend for the raw, cleaned and merged stages.
+#
+# A dataset root holds one file per stage, toy type and scrape date:
+#
+#   <root>/<stage>/toy_type=<toy_type>/scrape_date=<YYYY-MM-DD>/part-0.parquet
+#
+# (hive partitioning, so pyarrow/duckdb/Spark read the keys back as columns).
+# Repetitive text columns are stored dictionary-encoded and read back as pandas
+# categoricals; readers can project columns (e.g. asin, price, reviews_count
+# without the descriptions) and only touch the files of the partitions they ask for.
+#
+# pyarrow is imported on first use, so the default CSV pipeline does not need it.
+
+STAGES = ("raw", "cleaned", "merged")
+PARTITION_KEYS = ("toy_type", "scrape_date")
+PART_FILE = "part-0.parquet"
+COMPRESSION = "zstd"
+
+# Low-cardinality text columns stored as dictionaries (only when they hold text)
+CATEGORICAL_COLUMNS = ["stock", "discount", "age_range", "age_tuple", "toy_type"]
+
+
+def toy_type_of(category_name):
+    """baby_toys -> baby (the toy_type used by the merge and the analysis)."""
+    return category_name.removesuffix("_toys")
+
+
+def _check_stage(stage):
+    if stage not in STAGES:
+        raise ValueError(f"Unknown stage {stage!r} (expected one of {', '.join(STAGES)})")
+
+
+def partition_path(root, stage, toy_type, scrape_date):
+    _check_stage(stage)
+    return Path(root) / stage / f"toy_type={toy_type}" / f"scrape_date={scrape_date}" / PART_FILE
+
+
+def partitions(root, stage, toy_types=None, dates=None):
+    """Sorted (toy_type, scrape_date) pairs present for a stage, optionally filtered."""
+    _check_stage(stage)
+    found = []
+    for path in (Path(root) / stage).glob(f"toy_type=*/scrape_date=*/{PART_FILE}"):
+        toy_type = path.parent.parent.name.split("=", 1)[1]
+        scrape_date = path.parent.name.split("=", 1)[1]
+        if (toy_types is None or toy_type in toy_types) and (dates is None or scrape_date in dates):
+            found.append((toy_type, scrape_date))
+    return sorted(found)
+
+
+def _for_storage(df):
+    """Give object columns one Arrow type: text as str (what a CSV round-trip returns), repetitive text as categories."""
+    df = df.copy()
+    for col in df.columns:
+        if df[col].dtype != object and not pd.api.types.is_string_dtype(df[col]):
+            continue
+        df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+        if col in CATEGORICAL_COLUMNS:
+            df[col] = df[col].astype("category")
+    return df
+
+
+def _decode_categories(df):
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype(df[col].cat.categories.dtype)
+    return df
+
+
+def write_partition(df, root, stage, toy_type, scrape_date):
+    """Write one partition (replacing it atomically). Partition keys are dropped from the columns."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    path = partition_path(root, stage, toy_type, scrape_date)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    df = _for_storage(df.drop(columns=[key for key in PARTITION_KEYS if key in df.columns]))
+    table = pa.Table.from_pandas(df, preserve_index=False)
+
+    tmp = path.with_suffix(".tmp")
+    pq.write_table(table, tmp, compression=COMPRESSION, use_dictionary=[c for c in CATEGORICAL_COLUMNS if c in df.columns])
+    os.replace(tmp, path)
+    return path
+
+
+def read_partition(root, stage, toy_type, scrape_date, columns=None, categories=True):
+    """One partition as a DataFrame (without the key columns). categories=False decodes dictionaries to plain values."""
+    df = pd.read_parquet(partition_path(root, stage, toy_type, scrape_date), columns=columns)
+    return df if categories else _decode_categories(df)
+
+
+def read_dataset(root, stage, columns=None, toy_types=None, dates=None, categories=True):
+    """All (or the selected) partitions of a stage, with toy_type and scrape_date as columns.
+
+    Only the requested columns are read, and partitions outside toy_types/dates
+    are skipped without being opened.
+    """
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    _check_stage(stage)
+    partitioning = ds.partitioning(
+        pa.schema([("toy_type", pa.dictionary(pa.int32(), pa.string())), ("scrape_date", pa.string())]),
+        flavor="hive",
+        dictionaries="infer",
+    )
+    dataset = ds.dataset(Path(root) / stage, format="parquet", partitioning=partitioning)
+
+    condition = None
+    for key, values in (("toy_type", toy_types), ("scrape_date", dates)):
+        if values is not None:
+            expression = ds.field(key).isin(list(values))
+            condition = expression if condition is None else condition & expression
+
+    df = dataset.to_table(columns=columns, filter=condition).to_pandas()
+    return df if categories else _decode_categories(df)
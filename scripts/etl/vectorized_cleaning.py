@@ -0,0 +1,220 @@
+import numpy as np
+import pandas as pd
+
+from scripts.etl.parsers import (
+    AGE_VALUE,
+    AGE_VALUE_MATCH,
+    AGE_WARNING,
+    DIMENSION_NUMBER,
+    DISCOUNT_NUMBER,
+    FIRST_NUMBER,
+    NON_DECIMAL_CHARS,
+    NON_PRICE_CHARS,
+    TITLE_BRAND,
+    WARNING_TEXT,
+    WEIGHT,
+)
+
+# Column-at-a-time versions of the row-wise parsers in parsers.py.
+# They produce the same cleaned CSV, but run as pandas .str regex passes and
+# NumPy arithmetic instead of one Python call (and one pd.Series) per row.
+#
+# With typed=True the numeric columns stay numbers (float64 / nullable Int64)
+# instead of European-formatted strings; the comma only comes back in the
+# Excel/Sheets export of merge_toys.py.
+
+
+def _text(series):
+    """str(x) of every value, as the row-wise parsers see it (NaN -> "nan")."""
+    return series.astype(object).where(series.notna(), "nan").astype(str)
+
+
+def _round_like_python(values, decimals=0):
+    """round(x, decimals) for a float array, with Python's exact half-to-even result.
+
+    NumPy scales by 10**decimals before rounding, which can land on .5 where the
+    exact decimal value does not; those few ambiguous values are redone with round().
+    """
+    scale = 10.0 ** decimals
+    scaled = values * scale
+    rounded = np.rint(scaled) / scale
+    ambiguous = np.abs(np.abs(scaled - np.floor(scaled)) - 0.5) < 1e-9
+    if ambiguous.any():
+        rounded[ambiguous] = [round(float(v), decimals) for v in values[ambiguous]]
+    return rounded
+
+
+def _to_float(series):
+    """float(x) per value (Python's parser, so results match the row-wise code bit for bit)."""
+    return series.to_numpy(dtype=object).astype(float)
+
+
+def _first_int(extracted):
+    return pd.Series(_to_float(extracted), index=extracted.index)
+
+
+def clean_price_column(series):
+    cleaned = _text(series).str.replace(".", ",", regex=False).str.replace(NON_PRICE_CHARS, "", regex=True)
+    return cleaned.where(series.notna() & (series != ""), "").astype(object)
+
+
+def clean_discount_column(series):
+    stripped = _text(series).str.replace("%", "", regex=False).str.replace("-", "", regex=False).str.strip()
+    valid = stripped.str.replace(".", ",", regex=False).str.match(DISCOUNT_NUMBER)
+    return stripped.where(series.notna() & (series != "") & valid, "").astype(object)
+
+
+def price_value_column(series):
+    """Typed price: float64, NaN when missing."""
+    number = _text(series).str.replace(NON_DECIMAL_CHARS, "", regex=True)
+    return pd.to_numeric(number.where(series.notna() & (number != "")), errors="coerce").astype("float64")
+
+
+def discount_value_column(series):
+    """Typed discount: percent as float64, NaN when missing or not a number."""
+    discount = clean_discount_column(series).str.replace(",", ".", regex=False)
+    return pd.to_numeric(discount.where(discount != ""), errors="coerce").astype("float64")
+
+
+def stock_count_column(series):
+    """Typed stock: Int64 count, <NA> for "unlimited"."""
+    text = _text(series)
+    digits = _first_int(text.str.extract(f"({FIRST_NUMBER.pattern})", expand=False))
+    limited = series.notna() & ~text.str.contains("In stock", regex=False) & digits.notna()
+    return digits.where(limited).astype("Int64")
+
+
+def parse_stock_column(series):
+    stock = stock_count_column(series)
+    return stock.astype(object).where(stock.notna(), "unlimited")
+
+
+def parse_reviews_column(series):
+    text = _text(series).str.replace(",", "", regex=False)
+    count = _first_int(text.str.extract(f"({FIRST_NUMBER.pattern})", expand=False))
+    return count.where(series.notna()).fillna(0).astype("int64")
+
+
+def _per_unique(series, parse):
+    """Run a column parser once per distinct value and broadcast the result back to every row.
+
+    Age and weight texts repeat across colour variants and bundles, so this
+    shrinks the regex work to the number of distinct strings.
+    """
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    parsed = parse(pd.Series(uniques, dtype=object))
+    return parsed.take(codes).set_axis(series.index)
+
+
+def _parse_unique_ages(combined):
+    # Warnings ("under 36 months") set the minimum age
+    warnings = combined.str.findall(AGE_WARNING).explode().dropna()
+    warning_years = pd.Series(_round_like_python(_to_float(warnings) / 12), index=warnings.index)
+    warning_min = warning_years.groupby(level=0).min()
+
+    # Explicit ages: the first one is the minimum (if there is no warning), the largest the maximum
+    ranges = combined.str.findall(AGE_VALUE_MATCH).explode().dropna()
+    parts = _per_unique(ranges, lambda matches: matches.str.extract(AGE_VALUE))
+    years = _to_float(parts[0])
+    months = (parts[1] == "month").to_numpy()
+    years[months] = _round_like_python(years[months] / 12)
+    range_years = pd.Series(years, index=ranges.index)
+    range_first = range_years.groupby(level=0).first()
+    range_max = range_years.groupby(level=0).max()
+
+    min_age = warning_min.reindex(combined.index).fillna(range_first.reindex(combined.index))
+    max_age = range_max.reindex(combined.index).fillna(min_age)
+
+    min_text = min_age.astype("Int64").astype(str)
+    max_text = max_age.astype("Int64").astype(str)
+    result = min_text.where(min_age == max_age, min_text + "-" + max_text)
+    return result.where(min_age.notna(), "").astype(object)
+
+
+def parse_age_column(age, weight):
+    combined = (_text(age) + " " + _text(weight)).str.lower()
+    return _per_unique(combined, _parse_unique_ages)
+
+
+def _parse_unique_dimensions_weight(series):
+    text = series.where(series.isna(), _text(series).str.lower().str.replace(WARNING_TEXT, "", regex=True))
+
+    # Weight: first "<number> g|kg", in grams, rounded to int
+    weight_match = text.str.extract(WEIGHT)
+    weight = _to_float(weight_match[0])
+    weight = np.where((weight_match[1] == "kg").to_numpy(), weight * 1000, weight)
+
+    # Dimensions: first three numbers as written
+    numbers = text.str.findall(DIMENSION_NUMBER)
+    complete = numbers.str.len() >= 3
+    dims = numbers.str[:3].str.join(" x ").where(complete, "").where(series.notna())
+
+    return pd.DataFrame({"dimensions_cm": dims.astype(object), "weight_grams": _round_like_python(weight)}, index=series.index)
+
+
+def parse_dimensions_weight_columns(series):
+    """Return (dimensions_cm, weight_grams) columns."""
+    parsed = _per_unique(series, _parse_unique_dimensions_weight)
+    weight = parsed["weight_grams"]
+    # The row-wise version yields int64 only when every row has a weight
+    if weight.notna().all():
+        weight = weight.astype("int64")
+    return parsed["dimensions_cm"], weight
+
+
+def price_per_gram_values(price, weight):
+    """Typed €/g: price / weight rounded to 2 decimals, NaN without a price or weight."""
+    valid = price.notna() & weight.notna() & (weight != 0)
+    per_gram = _round_like_python(price.where(valid).to_numpy(dtype=float) / weight.to_numpy(dtype=float), 2)
+    return pd.Series(per_gram, index=price.index).where(valid)
+
+
+def price_per_gram_column(price, weight):
+    valid = price.notna() & (price != "") & weight.notna() & (weight != 0)
+    p = _to_float(price.where(valid).str.replace(",", ".", regex=False))
+    per_gram = _round_like_python(p / weight.to_numpy(dtype=float), 2)
+    text = pd.Series(per_gram, index=price.index).astype(str).str.replace(".", ",", regex=False)
+    return text.where(valid, "").astype(object)
+
+
+def format_european_column(series):
+    return series.astype(str).str.replace(".", ",", regex=False).where(series.notna(), "").astype(object)
+
+
+def clean_dataframe_vectorized(df, typed=False):
+    """Vectorized equivalent of ETL_cleaning.clean_dataframe (same columns, same CSV output).
+
+    typed=True keeps price, old_price, discount and €/g as float64 and stock and
+    weight_grams as Int64 (stock <NA> = unlimited) instead of formatted strings.
+    """
+    df = df.drop_duplicates(subset="asin").copy()
+
+    df["title"] = df["title"].str.replace(TITLE_BRAND, "", regex=True)
+
+    if typed:
+        df["price"] = price_value_column(df["price"])
+        df["old_price"] = price_value_column(df["old_price"])
+        df["discount"] = discount_value_column(df["discount"])
+        df["stock"] = stock_count_column(df["stock"])
+    else:
+        df["price"] = clean_price_column(df["price"])
+        df["old_price"] = clean_price_column(df["old_price"])
+        df["discount"] = clean_discount_column(df["discount"])
+        df["stock"] = parse_stock_column(df["stock"])
+    df["reviews_count"] = parse_reviews_column(df["reviews_count"])
+
+    weight_text = df["weight"] if "weight" in df.columns else pd.Series("", index=df.index)
+    df["age_range"] = parse_age_column(df["age_range"], weight_text)
+
+    df["dimensions_cm"], df["weight_grams"] = parse_dimensions_weight_columns(df["weight"])
+    df = df.drop(columns=["weight"])
+
+    if typed:
+        df["€/g"] = price_per_gram_values(df["price"], df["weight_grams"])
+        df["weight_grams"] = df["weight_grams"].astype("Int64")
+    else:
+        df["€/g"] = price_per_gram_column(df["price"], df["weight_grams"])
+        df["weight_grams"] = format_european_column(df["weight_grams"])
+
+    cols = [c for c in df.columns if c != "short_description"] + ["short_description"]
+    return df[cols]
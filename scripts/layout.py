@@ -0,0 +1,15 @@
+from pathlib import Path
+
+# Where the pipeline writes its outputs, shared by the pipeline and the tools that read them (api.py).
+#
+#   <data dir>/processed/toys_fisher_price_analysis.csv   features
+#   <data dir>/processed/toys_fisher_price_summary.json   aggregate
+#   <data dir>/processed/toys_fisher_price_product_groups.csv   near-duplicate groups
+
+DEFAULT_DATA_DIR = "build"
+# The repo's committed crawls and reference outputs
+REFERENCE_DATA_DIR = Path(__file__).resolve().parents[1] / "data"
+
+ANALYSIS_CSV = "toys_fisher_price_analysis.csv"
+SUMMARY_JSON = "toys_fisher_price_summary.json"
+GROUPS_CSV = "toys_fisher_price_product_groups.csv"
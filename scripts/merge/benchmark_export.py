@@ -0,0 +1,69 @@
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from scripts.merge.merge_toys import CHUNK_SIZE, XlsxSink, desired_columns, format_toys_sheet
+
+
+def make_synthetic_merged(n_rows, seed=0):
+    """Merged-shaped DataFrame (desired_columns, numeric columns as numbers)."""
+    rng = np.random.default_rng(seed)
+    price = rng.uniform(3, 120, n_rows).round(2)
+    grams = rng.integers(20, 5000, n_rows).astype(float)
+    df = pd.DataFrame({
+        "asin": [f"B{i:09d}" for i in range(n_rows)],
+        "url": [f"https://www.amazon.de/dp/B{i:09d}" for i in range(n_rows)],
+        "title": rng.choice(["Baby Blocks", "Wooden Stacker", "Rattle Set"], n_rows),
+        "price": price,
+        "old_price": (price * rng.uniform(1.0, 2.0, n_rows)).round(2),
+        "discount": rng.choice([np.nan, 7.0, 25.0], n_rows),
+        "stock": rng.choice([np.nan, 3.0, 12.0], n_rows),
+        "reviews_count": rng.integers(0, 60000, n_rows),
+        "age_tuple": None,
+        "dimensions_cm": "13 x 12.5 x 21.01",
+        "weight_grams": grams,
+        "€/g": (price / grams).round(2),
+        "short_description": rng.choice(["Classic toy from 6 months", "Made from FSC wood\nPlastic free packaging"], n_rows),
+        "toy_type": rng.choice(["baby", "wooden", "sustainable"], n_rows),
+    })
+    return df[desired_columns]
+
+
+def export_to_excel(df, path):
+    """The previous export: pd.ExcelWriter + to_excel."""
+    with pd.ExcelWriter(path, engine="xlsxwriter") as writer:
+        df.to_excel(writer, index=False, sheet_name="Toys")
+        format_toys_sheet(writer.book, writer.sheets["Toys"])
+
+
+def export_streaming(df, path, chunksize=CHUNK_SIZE):
+    sink = XlsxSink(path)
+    try:
+        for start in range(0, len(df), chunksize):
+            sink.write(df.iloc[start:start + chunksize])
+    finally:
+        sink.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the pandas to_excel export with the streaming XLSX writer.")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    df = make_synthetic_merged(args.rows, args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, export in (("to_excel", export_to_excel), ("streaming", export_streaming)):
+            path = Path(tmp) / f"{label}.xlsx"
+            start = time.perf_counter()
+            export(df, path)
+            seconds = time.perf_counter() - start
+            print(f"{label:<10} {len(df):>9,} rows in {seconds:7.2f}s  ({len(df) / seconds:,.0f} rows/s, {path.stat().st_size / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,84 +1,270 @@
-import pandas as pd
-import numpy as np
-
-# -----------------
-# 1. Load cleaned files
-wooden = pd.read_csv("wooden_toys_cleaned_2025-09-15.csv")
-baby = pd.read_csv("baby_toys_cleaned_2025-09-15.csv")
-sustainable = pd.read_csv("sustainable_toys_cleaned_2025-09-15.csv")
-
-# 2. Add toy_type column
-wooden['toy_type'] = 'wooden'
-baby['toy_type'] = 'baby'
-sustainable['toy_type'] = 'sustainable'
-
-# 3. Define desired columns
-desired_columns = [
-    'asin', 'url', 'title', 'price', 'old_price', 'discount', 'stock',
-    'reviews_count', 'age_tuple', 'dimensions_cm', 'weight_grams', '€/g',
-    'short_description', 'toy_type'
-]
-
-# 4. Ensure all DataFrames have all desired columns
-for i, df in enumerate([wooden, baby, sustainable]):
-    for col in desired_columns:
-        if col not in df.columns:
-            df[col] = None
-    if i == 0:
-        wooden = df[desired_columns]
-    elif i == 1:
-        baby = df[desired_columns]
-    else:
-        sustainable = df[desired_columns]
-
-# 5. Concatenate all DataFrames
-all_toys = pd.concat([wooden, baby, sustainable], ignore_index=True)
-
-# -----------------
-# 6. Convert stock column to numeric (replace 'unlimited' with NaN)
-all_toys['stock'] = pd.to_numeric(all_toys['stock'].replace('unlimited', np.nan), errors='coerce')
-
-# 7. Convert numeric columns (price, old_price, weight_grams, €/g)
-numeric_cols = ['price', 'old_price', 'weight_grams', '€/g']
-for col in numeric_cols:
-    all_toys[col] = all_toys[col].apply(lambda x: float(str(x).replace(',', '.')) if pd.notnull(x) else np.nan)
-
-# -----------------
-# 8. Save merged dataset for Python analysis
-all_toys.to_csv("toys_fisher_price_merged.csv", index=False)
-
-# 9. Save CSV for Excel / Google Sheets (semicolon separator, keep comma for decimals)
-all_toys.to_csv("toys_fisher_price_merged_excel.csv", index=False, sep=";", encoding="utf-8-sig")
-
-# 10. Save pretty Excel file with formatting
-output_file = "toys_fisher_price_merged.xlsx"
-
-with pd.ExcelWriter(output_file, engine="xlsxwriter") as writer:
-    all_toys.to_excel(writer, index=False, sheet_name="Toys")
-    workbook  = writer.book
-    worksheet = writer.sheets["Toys"]
-
-    # Wrap text for description
-    wrap_format = workbook.add_format({'text_wrap': True, 'valign': 'top'})
-
-    # Set column widths
-    worksheet.set_column("A:A", 12)   # asin
-    worksheet.set_column("B:B", 20)   # url
-    worksheet.set_column("C:C", 40)   # title
-    worksheet.set_column("D:E", 10)   # price, old_price
-    worksheet.set_column("F:F", 10)   # discount
-    worksheet.set_column("G:G", 10)   # stock
-    worksheet.set_column("H:H", 12)   # reviews_count
-    worksheet.set_column("I:I", 15)   # age_tuple
-    worksheet.set_column("J:K", 15)   # dimensions_cm, weight_grams
-    worksheet.set_column("L:L", 10)   # €/g
-    worksheet.set_column("M:M", 50, wrap_format)  # short_description
-    worksheet.set_column("N:N", 12)   # toy_type
-
-print("✅ Merged dataset saved in 3 formats: CSV (Python), CSV (Excel), XLSX with formatting.")
-
-
-
-
-
-
+import argparse
+import re
+from pathlib import Path
+
+import pandas as pd
+import numpy as np
+
+from scripts.etl import storage
+from scripts.etl.ETL_cleaning import read_cleaned
+
+# Cleaned files are named <category>_cleaned_<YYYY-MM-DD>.csv by ETL_cleaning.py
+CLEANED_FILE = re.compile(r"^(?P<category>.+)_cleaned_(?P<date>\d{4}-\d{2}-\d{2})\.csv$")
+
+DEFAULT_INPUTS = [
+    "wooden_toys_cleaned_2025-09-15.csv",
+    "baby_toys_cleaned_2025-09-15.csv",
+    "sustainable_toys_cleaned_2025-09-15.csv",
+]
+
+desired_columns = [
+    'asin', 'url', 'title', 'price', 'old_price', 'discount', 'stock',
+    'reviews_count', 'age_tuple', 'dimensions_cm', 'weight_grams', '€/g',
+    'short_description', 'toy_type'
+]
+
+# Columns stored as European strings ("11,99") in non-typed cleaned files
+# (discount too: read_csv guesses it as a number, Parquet keeps the text)
+numeric_cols = ['price', 'old_price', 'discount', 'weight_grams', '€/g']
+
+# Rows per chunk when streaming cleaned CSVs into the outputs
+CHUNK_SIZE = 50_000
+
+# Header cell style of the XLSX (the one pandas' to_excel used)
+HEADER_FORMAT = {"bold": True, "border": 1, "align": "center", "valign": "top"}
+# Excel's limit of hyperlinks per worksheet; later urls are written as plain text
+MAX_SHEET_LINKS = 65_530
+
+MERGED_CSV = "toys_fisher_price_merged.csv"
+EXCEL_CSV = "toys_fisher_price_merged_excel.csv"
+XLSX = "toys_fisher_price_merged.xlsx"
+
+
+def toy_type(path):
+    """wooden_toys_cleaned_2025-09-15.csv -> "wooden"."""
+    match = CLEANED_FILE.match(Path(path).name)
+    if not match:
+        raise ValueError(f"Not a cleaned file (<category>_cleaned_<date>.csv): {path}")
+    return storage.toy_type_of(match["category"])
+
+
+def european_to_float(series):
+    """"11,99" -> 11.99 for a whole column (NaN stays NaN)."""
+    text = series.astype(str).str.replace(",", ".", regex=False)
+    return pd.to_numeric(text.where(series.notna()), errors="coerce").astype("float64")
+
+
+def age_tuple_from_range(age_range):
+    """"3-7" -> "(3.0, 7.0)", "3" -> "(3.0, 3.0)": the age_tuple text of older cleaned files."""
+    parts = age_range.astype("string").str.extract(r"^(?P<min>\d+(?:\.\d+)?)(?:-(?P<max>\d+(?:\.\d+)?))?$")
+    min_age = pd.to_numeric(parts["min"], errors="coerce")
+    max_age = pd.to_numeric(parts["max"], errors="coerce").fillna(min_age)
+    text = "(" + min_age.map("{:.1f}".format) + ", " + max_age.map("{:.1f}".format) + ")"
+    return text.where(min_age.notna(), None).astype(object)
+
+
+def normalize(df, toy_type):
+    """2. - 4. Tag a cleaned frame with its toy_type and align it on desired_columns."""
+    df['toy_type'] = toy_type
+    # The current cleaner writes age_range ("3-7"); keep the ages in the merged age_tuple column
+    if 'age_tuple' not in df.columns and 'age_range' in df.columns:
+        df['age_tuple'] = age_tuple_from_range(df['age_range'])
+    for col in desired_columns:
+        if col not in df.columns:
+            df[col] = None
+    return df[desired_columns]
+
+
+def load_cleaned(paths, typed=False):
+    """1. - 4. Load cleaned files, tag them with toy_type and align them on desired_columns."""
+    return [normalize(read_cleaned(path, typed), toy_type(path)) for path in paths]
+
+
+def merge_frames(frames, typed=False):
+    """5. - 7. Concatenate and make the numeric columns numeric.
+
+    Typed inputs already are (float64 / Int64, stock <NA> = unlimited); string
+    inputs are parsed back from their European format. Every conversion is
+    column-wise, so merging chunk by chunk gives the same rows as one concat.
+    """
+    all_toys = pd.concat(frames, ignore_index=True)
+    if typed:
+        return all_toys
+
+    # 6. Convert stock column to numeric (replace 'unlimited' with NaN); always float so chunks agree
+    all_toys['stock'] = pd.to_numeric(all_toys['stock'].replace('unlimited', np.nan), errors='coerce').astype("float64")
+
+    # 7. Convert numeric columns (price, old_price, discount, weight_grams, €/g)
+    for col in numeric_cols:
+        all_toys[col] = european_to_float(all_toys[col])
+    return all_toys
+
+
+def iter_cleaned_chunks(paths, typed=False, chunksize=CHUNK_SIZE):
+    """Merged chunks of at most chunksize rows, file by file: only one chunk is in memory at a time."""
+    for path in paths:
+        kind = toy_type(path)
+        for chunk in read_cleaned(path, typed, chunksize):
+            yield merge_frames([normalize(chunk, kind)], typed)
+
+
+def iter_merged_partitions(root, dates=None, typed=False):
+    """Merge the cleaned partitions of a Parquet dataset into its merged stage, one toy_type/date partition at a time.
+
+    Yields each merged partition for the Excel/Sheets exports.
+    """
+    keys = storage.partitions(root, "cleaned", dates=dates)
+    if not keys:
+        raise ValueError(f"No cleaned partitions under {root}")
+    for kind, scrape_date in keys:
+        df = storage.read_partition(root, "cleaned", kind, scrape_date, categories=False)
+        part = merge_frames([normalize(df, kind)], typed)
+        storage.write_partition(part, root, "merged", kind, scrape_date)
+        yield part
+
+
+class CsvSink:
+    """Appends chunks to one CSV file, header only before the first chunk."""
+
+    def __init__(self, path, encoding="utf-8", **options):
+        self.file = open(path, "w", encoding=encoding, newline="")
+        self.options = options
+        self.header = True
+
+    def write(self, chunk):
+        chunk.to_csv(self.file, index=False, header=self.header, **self.options)
+        self.header = False
+
+    def close(self):
+        self.file.close()
+
+
+class XlsxSink:
+    """Writes chunks row by row to the "Toys" sheet.
+
+    xlsxwriter runs in constant_memory mode, so each row is flushed to disk as
+    soon as the next one starts, and rows go straight to write_row instead of
+    through pandas' per-cell to_excel machinery.
+    """
+
+    def __init__(self, path):
+        import xlsxwriter  # only needed when an XLSX is requested
+
+        # Only the url column becomes links; no per-string URL pattern check on every other cell
+        self.workbook = xlsxwriter.Workbook(str(path), {"constant_memory": True, "strings_to_urls": False})
+        self.worksheet = self.workbook.add_worksheet("Toys")
+        self.header_format = self.workbook.add_format(HEADER_FORMAT)
+        format_toys_sheet(self.workbook, self.worksheet)
+        self.row = 0
+        self.links = 0
+
+    def write(self, chunk):
+        if self.row == 0:
+            self.worksheet.write_row(0, 0, list(chunk.columns), self.header_format)
+            self.row = 1
+        url_col = chunk.columns.get_loc("url") if "url" in chunk.columns else None
+        # Plain Python values, missing ones as None (written as empty cells)
+        for values in chunk.astype(object).where(chunk.notna(), None).to_numpy().tolist():
+            self.worksheet.write_row(self.row, 0, values)
+            if url_col is not None and values[url_col] and self.links < MAX_SHEET_LINKS:
+                # Same cell again as a hyperlink (the row is still in the buffer); too long URLs stay text
+                if self.worksheet.write_url(self.row, url_col, values[url_col]) >= 0:
+                    self.links += 1
+            self.row += 1
+
+    def close(self):
+        self.workbook.close()
+
+
+def format_toys_sheet(workbook, worksheet):
+    # Wrap text for description
+    wrap_format = workbook.add_format({'text_wrap': True, 'valign': 'top'})
+
+    # Set column widths
+    worksheet.set_column("A:A", 12)   # asin
+    worksheet.set_column("B:B", 20)   # url
+    worksheet.set_column("C:C", 40)   # title
+    worksheet.set_column("D:E", 10)   # price, old_price
+    worksheet.set_column("F:F", 10)   # discount
+    worksheet.set_column("G:G", 10)   # stock
+    worksheet.set_column("H:H", 12)   # reviews_count
+    worksheet.set_column("I:I", 15)   # age_tuple
+    worksheet.set_column("J:K", 15)   # dimensions_cm, weight_grams
+    worksheet.set_column("L:L", 10)   # €/g
+    worksheet.set_column("M:M", 50, wrap_format)  # short_description
+    worksheet.set_column("N:N", 12)   # toy_type
+
+
+def write_outputs(chunks, output_dir=".", merged_csv=True, xlsx=True):
+    """8. - 10. Stream merged chunks into the output files; returns the number of rows written."""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    sinks = []
+    try:
+        # 8. Merged dataset for Python analysis (plain decimal point)
+        if merged_csv:
+            sinks.append(CsvSink(output_dir / MERGED_CSV))
+        # 9. CSV for Excel / Google Sheets (semicolon separator, comma for decimals: the only place numbers get one)
+        sinks.append(CsvSink(output_dir / EXCEL_CSV, encoding="utf-8-sig", sep=";", decimal=","))
+        # 10. Pretty Excel file with formatting (numbers stay numeric cells); optional, it is the slowest output
+        if xlsx:
+            sinks.append(XlsxSink(output_dir / XLSX))
+
+        rows = 0
+        for chunk in chunks:
+            for sink in sinks:
+                sink.write(chunk)
+            rows += len(chunk)
+        return rows
+    finally:
+        for sink in sinks:
+            sink.close()
+
+
+def save_outputs(all_toys, output_dir=".", xlsx=True):
+    """Write an in-memory merged frame to the output files."""
+    return write_outputs([all_toys], output_dir, xlsx=xlsx)
+
+
+def export_xlsx(merged_csv, xlsx_path=None, chunksize=CHUNK_SIZE):
+    """Build the XLSX later, only when needed, by streaming an existing merged CSV."""
+    merged_csv = Path(merged_csv)
+    xlsx_path = Path(xlsx_path) if xlsx_path else merged_csv.with_name(XLSX)
+    sink = XlsxSink(xlsx_path)
+    try:
+        for chunk in pd.read_csv(merged_csv, chunksize=chunksize):
+            sink.write(chunk)
+    finally:
+        sink.close()
+    return xlsx_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge cleaned category files into one dataset (CSV, Excel CSV, XLSX).")
+    parser.add_argument("files", nargs="*", default=DEFAULT_INPUTS, help="Cleaned CSV files (<category>_cleaned_<date>.csv)")
+    parser.add_argument("--output-dir", default=".", help="Where to write the merged files")
+    parser.add_argument("--typed", action="store_true", help="Inputs were cleaned with --typed (numeric columns already numbers)")
+    parser.add_argument("--storage", choices=["csv", "parquet"], default="csv", help="parquet: merge the cleaned stage of the dataset at --input-dir into its merged stage")
+    parser.add_argument("--input-dir", default=".", help="Parquet dataset root (with --storage parquet)")
+    parser.add_argument("--date", help="Only merge this scrape date (with --storage parquet)")
+    parser.add_argument("--chunksize", type=int, default=CHUNK_SIZE, help="Rows read per chunk from each cleaned CSV")
+    parser.add_argument("--no-xlsx", dest="xlsx", action="store_false", help="Skip the XLSX (build it later with --xlsx-from)")
+    parser.add_argument("--xlsx-from", metavar="MERGED_CSV", help="Only build the XLSX from an existing merged CSV, next to it")
+    args = parser.parse_args()
+
+    if args.xlsx_from:
+        print(f"✅ XLSX saved: {export_xlsx(args.xlsx_from, chunksize=args.chunksize)}")
+        return
+
+    if args.storage == "parquet":
+        rows = write_outputs(iter_merged_partitions(args.input_dir, [args.date] if args.date else None, args.typed), args.output_dir, merged_csv=False, xlsx=args.xlsx)
+        print(f"✅ {rows} rows merged into {Path(args.input_dir) / 'merged'}; exports in {args.output_dir}.")
+        return
+
+    rows = write_outputs(iter_cleaned_chunks(args.files, args.typed, args.chunksize), args.output_dir, xlsx=args.xlsx)
+    formats = "CSV (Python), CSV (Excel), XLSX with formatting" if args.xlsx else "CSV (Python), CSV (Excel)"
+    print(f"✅ Merged dataset ({rows} rows) saved: {formats}.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,339 @@
+import argparse
+import hashlib
+import json
+import re
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+
+import pandas as pd
+
+from scripts.analysis.aggregate import aggregate, file_sha256
+from scripts.analysis.features import compute_features, write_sheets_csv
+from scripts.etl import storage
+from scripts.etl.history import DEFAULT_HISTORY, HistoryStore
+from scripts.etl.ETL_cleaning import clean_file, cleaned_path
+from scripts.etl.near_duplicates import product_groups
+from scripts.layout import ANALYSIS_CSV, DEFAULT_DATA_DIR, GROUPS_CSV, REFERENCE_DATA_DIR, SUMMARY_JSON
+from scripts.merge.merge_toys import DEFAULT_INPUTS, EXCEL_CSV, MERGED_CSV, XLSX, iter_cleaned_chunks, toy_type, write_outputs
+
+# One command for scrape -> clean -> merge -> features -> aggregate.
+#
+# Every step is a Stage with input and output files and the stages it depends
+# on. The runner starts each stage as soon as its dependencies are done, so the
+# categories are scraped and cleaned side by side, and skips a stage when the
+# SHA-256 of its inputs (and its parameters) equals that of its last successful
+# run and its outputs are still the files it wrote. Only what is downstream of
+# a changed file runs again, and a stage whose output comes out byte-identical
+# stops the recomputation right there. A stage that raises, leaves one of its
+# outputs unwritten or cannot read its inputs fails on its own: what depends on
+# it is blocked, the other branches carry on.
+#
+# Layout under the output directory (build/ by default; the raw crawls are read
+# from the repo's data/raw unless --raw-dir or --scrape says otherwise):
+#   raw/<category>_raw_<date>.csv      cleaned/<category>_cleaned_<date>.csv
+#   merged/toys_fisher_price_merged*.csv (+ .xlsx)
+#   processed/toys_fisher_price_analysis.csv, toys_fisher_price_summary.json,
+#             toys_fisher_price_product_groups.csv (near-duplicate ASINs)
+#   toys_history.sqlite (with history=True: every cleaned crawl appended)
+#
+# The files committed under data/ are the reference outputs (features --check
+# compares against the hand-edited analysis CSV), so a run that would replace
+# one of them stops before any stage starts unless explicitly allowed.
+
+STATE_FILE = ".pipeline_state.json"
+RAW_FILE = re.compile(r"^(?P<category>.+)_raw_(?P<date>\d{4}-\d{2}-\d{2})\.csv$")
+# The merge keeps the order of its default inputs (wooden, baby, sustainable), other toy types follow
+MERGE_ORDER = [toy_type(path) for path in DEFAULT_INPUTS]
+
+
+class Stage:
+    """A pipeline step: run() reads the input files and writes the output files."""
+
+    def __init__(self, name, run, inputs=(), outputs=(), deps=(), params=None):
+        self.name = name
+        self.run = run
+        self.inputs = [Path(path) for path in inputs]
+        self.outputs = [Path(path) for path in outputs]
+        self.deps = list(deps)
+        self.params = params or {}
+
+    def input_key(self):
+        """Hash of the parameters and input contents, or None for a stage without inputs (always runs)."""
+        if not self.inputs:
+            return None
+        digest = hashlib.sha256(json.dumps(self.params, sort_keys=True, default=str).encode("utf-8"))
+        for path in self.inputs:
+            digest.update(f"\n{path.name}:{file_sha256(path)}".encode("utf-8"))
+        return digest.hexdigest()
+
+
+class PipelineState:
+    """Input key and output hashes of each stage's last successful run (JSON file)."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.stages = {}
+        if self.path.exists():
+            with open(self.path, encoding="utf-8") as f:
+                self.stages = json.load(f)
+
+    def up_to_date(self, stage, key):
+        entry = self.stages.get(stage.name)
+        if key is None or entry is None or entry["input_key"] != key:
+            return False
+        return all(path.exists() and file_sha256(path) == entry["outputs"].get(str(path)) for path in stage.outputs)
+
+    def record(self, stage, key):
+        self.stages[stage.name] = {
+            "input_key": key,
+            "outputs": {str(path): file_sha256(path) for path in stage.outputs if path.exists()},
+            "finished": datetime.now().isoformat(timespec="seconds"),
+        }
+
+    def save(self):
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.stages, f, indent=1, sort_keys=True)
+        tmp_path.replace(self.path)
+
+
+def reference_outputs(stages):
+    """Stage outputs that would replace files of the repo's reference data."""
+    return [
+        path for stage in stages for path in stage.outputs
+        if path.exists() and path.resolve().is_relative_to(REFERENCE_DATA_DIR)
+    ]
+
+
+def run_stages(stages, state_path, workers=None, force=False, allow_reference=False):
+    """Run the stages in dependency order, independent ones concurrently; returns {stage name: status}."""
+    stages = {stage.name: stage for stage in stages}
+    for stage in stages.values():
+        missing = set(stage.deps) - set(stages)
+        if missing:
+            raise ValueError(f"Stage {stage.name} depends on unknown stages: {', '.join(sorted(missing))}")
+    if not allow_reference:
+        protected = reference_outputs(stages.values())
+        if protected:
+            raise ValueError(f"Would overwrite reference data: {', '.join(map(str, protected))} (use another output directory)")
+
+    state = PipelineState(state_path)
+    pending = dict(stages)
+    status = {}
+    running = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while pending or running:
+            # Start (or skip) everything whose dependencies are settled; a skip can unblock more stages
+            progressed = True
+            while progressed:
+                progressed = False
+                for name, stage in list(pending.items()):
+                    if any(status.get(dep) is None for dep in stage.deps):
+                        continue
+                    del pending[name]
+                    progressed = True
+                    if any(status[dep] not in ("done", "unchanged") for dep in stage.deps):
+                        status[name] = "blocked"
+                        continue
+                    try:
+                        key = stage.input_key()
+                    except OSError as e:
+                        status[name] = "failed"
+                        print(f"[{name}] failed: cannot read its inputs: {e}")
+                        continue
+                    if not force and state.up_to_date(stage, key):
+                        status[name] = "unchanged"
+                        print(f"[{name}] unchanged, skipped")
+                        continue
+                    print(f"[{name}] running")
+                    running[pool.submit(stage.run)] = (stage, key)
+
+            if not running:
+                if pending:
+                    raise ValueError(f"Dependency cycle between stages: {', '.join(sorted(pending))}")
+                break
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                stage, key = running.pop(future)
+                try:
+                    future.result()
+                except Exception as e:
+                    status[stage.name] = "failed"
+                    print(f"[{stage.name}] failed: {e}")
+                    continue
+                # e.g. a scrape that collected no products writes no raw file
+                missing = [str(path) for path in stage.outputs if not path.exists()]
+                if missing:
+                    status[stage.name] = "failed"
+                    print(f"[{stage.name}] failed: did not write {', '.join(missing)}")
+                    continue
+                status[stage.name] = "done"
+                state.record(stage, key)
+                state.save()
+    return status
+
+
+def find_raw(raw_dir, date=None):
+    """{category: raw CSV} of one scrape date in raw_dir (default: the latest date present)."""
+    found = {}
+    for path in Path(raw_dir).glob("*_raw_*.csv"):
+        match = RAW_FILE.match(path.name)
+        if match:
+            found.setdefault(match["date"], {})[match["category"]] = path
+    if not found:
+        return date, {}
+    date = date or max(found)
+    return date, found.get(date, {})
+
+
+def scrape_category(category, raw_dir, config=None, **overrides):
+    from scripts.scraping.amazon_scraper import DEFAULT_CONFIG, scrape_all  # selenium only needed when scraping
+
+    # The pipeline works on CSV files, whatever storage the config sets
+    if not scrape_all(config or DEFAULT_CONFIG, [category], raw_dir, **{**overrides, "storage": "csv"}):
+        raise RuntimeError(f"Scraping {category} failed")
+
+
+def add_to_history(cleaned_files, history_path, typed=False):
+    with HistoryStore(history_path) as store:
+        for path in cleaned_files:
+            store.append_cleaned(path, typed)
+
+
+def merge_cleaned(cleaned_files, merged_dir, typed=False, xlsx=True):
+    write_outputs(iter_cleaned_chunks(cleaned_files, typed), merged_dir, xlsx=xlsx)
+
+
+def build_features(merged_csv, analysis_csv):
+    write_sheets_csv(compute_features(pd.read_csv(merged_csv)), analysis_csv)
+
+
+def build_summary(analysis_csv, summary_json):
+    aggregate(analysis_csv, summary_json)
+
+
+def build_groups(merged_csv, groups_csv):
+    """asin, toy_type, title and product_group of every merged row (see near_duplicates.py)."""
+    merged = pd.read_csv(merged_csv)
+    groups = merged[["asin", "toy_type", "title"]].assign(product_group=product_groups(merged))
+    groups.to_csv(groups_csv, index=False)
+
+
+def pipeline_stages(data_dir=DEFAULT_DATA_DIR, categories=(), date=None, scrape=False, config=None, typed=False, xlsx=True, engine="vectorized", scrape_options=None, history=False, raw_dir=None):
+    """The stage graph for one scrape date: per category scrape (optional) and clean, then merge, features, aggregate, product groups (and history).
+
+    Raw files are read from (or scraped into) `raw_dir`, default <data_dir>/raw.
+    """
+    data_dir = Path(data_dir)
+    raw_dir = Path(raw_dir) if raw_dir else data_dir / "raw"
+    cleaned_dir = data_dir / "cleaned"
+    merged_dir, processed_dir = data_dir / "merged", data_dir / "processed"
+    for directory in (raw_dir, cleaned_dir, merged_dir, processed_dir):
+        directory.mkdir(parents=True, exist_ok=True)
+
+    if scrape:
+        # The scraper names its files after the day it runs
+        date = datetime.now().strftime("%Y-%m-%d")
+        raw_files = {category: raw_dir / f"{category}_raw_{date}.csv" for category in categories}
+    else:
+        date, raw_files = find_raw(raw_dir, date)
+        if categories:
+            raw_files = {category: path for category, path in raw_files.items() if category in categories}
+    if not raw_files:
+        raise ValueError(f"No raw files for {date or 'any date'} in {raw_dir}")
+
+    stages = []
+    cleaned_files = {}
+    for category, raw_path in sorted(raw_files.items()):
+        clean_deps = []
+        if scrape:
+            stages.append(Stage(f"scrape:{category}", partial(scrape_category, category, raw_dir, config, **(scrape_options or {})), outputs=[raw_path]))
+            clean_deps = [f"scrape:{category}"]
+        cleaned_files[category] = cleaned_path(raw_path, cleaned_dir)
+        stages.append(Stage(
+            f"clean:{category}", partial(clean_file, raw_path, cleaned_dir, engine, typed),
+            inputs=[raw_path], outputs=[cleaned_files[category]], deps=clean_deps,
+            params={"engine": engine, "typed": typed},
+        ))
+
+    def merge_position(category):
+        kind = storage.toy_type_of(category)
+        return (MERGE_ORDER.index(kind) if kind in MERGE_ORDER else len(MERGE_ORDER), kind)
+
+    merge_inputs = [cleaned_files[category] for category in sorted(cleaned_files, key=merge_position)]
+    merged_outputs = [merged_dir / MERGED_CSV, merged_dir / EXCEL_CSV] + ([merged_dir / XLSX] if xlsx else [])
+    stages.append(Stage(
+        "merge", partial(merge_cleaned, merge_inputs, merged_dir, typed, xlsx),
+        inputs=merge_inputs, outputs=merged_outputs, deps=[f"clean:{category}" for category in cleaned_files],
+        params={"typed": typed, "xlsx": xlsx},
+    ))
+
+    if history:
+        stages.append(Stage(
+            "history", partial(add_to_history, merge_inputs, data_dir / DEFAULT_HISTORY, typed),
+            inputs=merge_inputs, deps=[f"clean:{category}" for category in cleaned_files], params={"typed": typed},
+        ))
+
+    analysis_csv = processed_dir / ANALYSIS_CSV
+    stages.append(Stage(
+        "features", partial(build_features, merged_dir / MERGED_CSV, analysis_csv),
+        inputs=[merged_dir / MERGED_CSV], outputs=[analysis_csv], deps=["merge"],
+    ))
+    summary_json = processed_dir / SUMMARY_JSON
+    stages.append(Stage(
+        "aggregate", partial(build_summary, analysis_csv, summary_json),
+        inputs=[analysis_csv], outputs=[summary_json], deps=["features"],
+    ))
+    groups_csv = processed_dir / GROUPS_CSV
+    stages.append(Stage(
+        "groups", partial(build_groups, merged_dir / MERGED_CSV, groups_csv),
+        inputs=[merged_dir / MERGED_CSV], outputs=[groups_csv], deps=["merge"],
+    ))
+    return stages
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run scrape -> clean -> merge -> features -> aggregate, skipping stages whose inputs are unchanged.")
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR, help=f"Output root for cleaned/, merged/ and processed/ (default {DEFAULT_DATA_DIR})")
+    parser.add_argument("--raw-dir", help="Raw crawls to process (default: the repo's data/raw; <data-dir>/raw with --scrape)")
+    parser.add_argument("--category", action="append", dest="categories", help="Only this category (repeatable; default: all raw files of the date, or all configured when scraping)")
+    parser.add_argument("--date", help="Scrape date of the raw files to process (default: the latest)")
+    parser.add_argument("--scrape", action="store_true", help="Scrape the categories first (today's date)")
+    parser.add_argument("--config", help="Categories JSON config for --scrape")
+    parser.add_argument("--backend", choices=["selenium", "http"], help="Scraper product page backend (with --scrape)")
+    parser.add_argument("--incremental", action="store_true", default=None, help="Incremental scraping (with --scrape)")
+    parser.add_argument("--typed", action="store_true", help="Clean and merge in typed mode")
+    parser.add_argument("--no-xlsx", dest="xlsx", action="store_false", help="Skip the merged XLSX")
+    parser.add_argument("--history", action="store_true", help=f"Also append the cleaned crawl to <data-dir>/{DEFAULT_HISTORY}")
+    parser.add_argument("--workers", type=int, help="Stages running at the same time (default: Python's thread pool default)")
+    parser.add_argument("--force", action="store_true", help="Run every stage even if its inputs are unchanged")
+    parser.add_argument("--overwrite-reference", action="store_true", help="Allow replacing the committed files under data/ (e.g. --data-dir data)")
+    args = parser.parse_args()
+    if args.date and args.scrape:
+        parser.error("--scrape always writes today's raw files; do not pass --date")
+
+    categories = args.categories or []
+    if args.scrape and not categories:
+        from scripts.scraping.amazon_scraper import DEFAULT_CONFIG, load_config
+
+        categories = [category["name"] for category in load_config(args.config or DEFAULT_CONFIG)[1]]
+
+    raw_dir = args.raw_dir or (None if args.scrape else REFERENCE_DATA_DIR / "raw")
+    stages = pipeline_stages(
+        args.data_dir, categories, args.date, args.scrape, args.config, args.typed, args.xlsx,
+        scrape_options={"backend": args.backend, "incremental": args.incremental}, history=args.history, raw_dir=raw_dir,
+    )
+    try:
+        status = run_stages(stages, Path(args.data_dir) / STATE_FILE, args.workers, args.force, args.overwrite_reference)
+    except ValueError as e:
+        raise SystemExit(f"❌ {e}")
+    summary = ", ".join(f"{count} {label}" for label, count in pd.Series(status).value_counts().items())
+    if "failed" in status.values():
+        raise SystemExit(f"❌ Pipeline failed: {summary}")
+    print(f"✅ Pipeline finished: {summary}")
+
+
+if __name__ == "__main__":
+    main()
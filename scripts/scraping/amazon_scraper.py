@@ -0,0 +1,565 @@
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.by import By
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import NoSuchElementException, TimeoutException, WebDriverException
+import pandas as pd
+import argparse
+import json
+import os
+import re
+import time
+from copy import deepcopy
+from datetime import datetime
+from pathlib import Path
+
+from scripts.scraping import html_backend
+from scripts.scraping.crawl_stats import CrawlTimer
+from scripts.scraping.incremental import ListingState, find_previous_raw, listing_signal, load_previous_products, plan_visits
+from scripts.scraping.js_extractor import extract_product_js
+from scripts.scraping.journal import ProductJournal
+from scripts.scraping.page_cache import PageCache
+from scripts.scraping.product_selectors import (
+    AGE_RANGE_XPATH,
+    DISCOUNT_CSS,
+    OLD_PRICE_CSS,
+    PRICE_FRACTION_CSS,
+    PRICE_SYMBOL_CSS,
+    PRICE_WHOLE_CSS,
+    REVIEWS_COUNT_CSS,
+    SHORT_DESCRIPTION_CSS,
+    STOCK_CSS,
+    TITLE_ID,
+    WEIGHT_XPATH,
+)
+from scripts.scraping.worker_pool import RateLimiter, scrape_parallel
+
+# Categories and crawl settings live next to this module
+DEFAULT_CONFIG = Path(__file__).with_name("categories.json")
+
+DEFAULT_SETTINGS = {
+    "chrome_driver_path": None,
+    "skip_links": 4,
+    "store_page_timeout": 30,
+    "page_timeout": 10,
+    # Parallel mode: number of headless browsers and the minimum gap between two page requests
+    "workers": 1,
+    "min_request_interval": 1.0,
+    # "selenium" renders every product page; "http" fetches static HTML and only falls back to the browser when needed
+    "backend": "selenium",
+    # Selenium backend: read all fields in one execute_script call instead of ~12 find_element calls
+    "batch_extraction": False,
+    # Incremental mode: reuse yesterday's row when the store listing is unchanged,
+    # but still revisit the least recently visited share and anything older than the staleness limit
+    "incremental": False,
+    "refresh_fraction": 0.1,
+    "max_staleness_days": 7,
+    # Directory for compressed page snapshots (replay with scripts.scraping.page_cache); None = off
+    "page_cache_dir": None,
+    # "csv": <name>_raw_<date>.csv files; "parquet": raw partitions of a dataset rooted at the output dir
+    "storage": "csv",
+}
+
+# A product page is ready for extraction once these elements are in the DOM
+PRODUCT_READY_LOCATORS = [
+    (By.ID, TITLE_ID),
+    (By.ID, "availability"),
+]
+STORE_READY_LOCATOR = (By.CSS_SELECTOR, 'a[href*="/dp/"]')
+# Store pages lazy-load their product grid: poll the link count until it stops growing
+STORE_POLL_INTERVAL = 1.0
+
+# Selenium configuration
+options = Options()
+options.add_argument("--disable-blink-features=AutomationControlled")
+options.add_argument("--no-sandbox")
+options.add_argument("--disable-dev-shm-usage")
+options.add_argument("--disable-gpu")
+options.add_argument("--window-size=1920,1080")
+options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/90.0.4430.212 Safari/537.36")
+
+
+def load_config(config_path=DEFAULT_CONFIG):
+    """Read the category list and crawl settings from a JSON config file."""
+    with open(config_path, encoding="utf-8") as f:
+        config = json.load(f)
+
+    settings = dict(DEFAULT_SETTINGS)
+    settings.update(config.get("settings", {}))
+    # The environment wins over the config so the same file works on every machine
+    settings["chrome_driver_path"] = os.environ.get("CHROMEDRIVER_PATH") or settings["chrome_driver_path"]
+
+    categories = config.get("categories", [])
+    for category in categories:
+        if "name" not in category or "url" not in category:
+            raise ValueError(f"Category entry needs 'name' and 'url': {category}")
+        category.setdefault("title_filter", [])
+    return settings, categories
+
+
+def create_driver(settings, headless=False):
+    """Start one Chrome session; chromedriver is resolved by Selenium if no path is set."""
+    driver_options = options
+    if headless:
+        driver_options = deepcopy(options)
+        driver_options.add_argument("--headless=new")
+    if settings["chrome_driver_path"]:
+        service = Service(settings["chrome_driver_path"])
+        return webdriver.Chrome(service=service, options=driver_options)
+    return webdriver.Chrome(options=driver_options)
+
+
+def extract_asin(url):
+    if not url:
+        return ""
+    match = re.search(r"/dp/([A-Z0-9]{10})", url)
+    if match:
+        return match.group(1)
+    return ""
+
+
+def wait_for_product_page(driver, timeout):
+    """Block until title and availability are present; False if the timeout ran out first."""
+    try:
+        WebDriverWait(driver, timeout).until(
+            EC.all_of(*[EC.presence_of_element_located(locator) for locator in PRODUCT_READY_LOCATORS])
+        )
+        return True
+    except TimeoutException:
+        return False
+
+
+class links_settled:
+    """Wait condition: product links are present and their count is unchanged since the last poll."""
+
+    def __init__(self, locator):
+        self.locator = locator
+        self.last_count = -1
+
+    def __call__(self, driver):
+        count = len(driver.find_elements(*self.locator))
+        settled = count > 0 and count == self.last_count
+        self.last_count = count
+        return settled
+
+
+def matches_title_filter(title, title_filter):
+    """A product passes if its title contains any filter keyword (or no filter is set)."""
+    if not title:
+        return False
+    if not title_filter:
+        return True
+    return any(keyword in title for keyword in title_filter)
+
+
+def get_old_price(driver):
+    for css in OLD_PRICE_CSS:
+        try:
+            return driver.find_element(By.CSS_SELECTOR, css).text.strip()
+        except NoSuchElementException:
+            continue
+    return ""
+
+
+def extract_product(driver, product_link):
+    """Read all product fields from the product page open in the current tab."""
+    asin = extract_asin(product_link)
+
+    # Product title
+    try:
+        title = driver.find_element(By.ID, TITLE_ID).text.strip()
+    except NoSuchElementException:
+        title = ""
+
+    # Current price
+    try:
+        price_currency = driver.find_element(By.CSS_SELECTOR, PRICE_SYMBOL_CSS).text.strip()
+        price_whole = driver.find_element(By.CSS_SELECTOR, PRICE_WHOLE_CSS).text.strip()
+        price_fraction = driver.find_element(By.CSS_SELECTOR, PRICE_FRACTION_CSS).text.strip()
+        price = f"{price_currency}{price_whole}.{price_fraction}"
+    except NoSuchElementException:
+        price = ""
+
+    # Old price
+    old_price = get_old_price(driver)
+
+    # Discount
+    try:
+        discount = driver.find_element(By.CSS_SELECTOR, DISCOUNT_CSS).text.strip()
+    except NoSuchElementException:
+        discount = ""
+
+    # Stock status
+    try:
+        stock = driver.find_element(By.CSS_SELECTOR, STOCK_CSS).text.strip()
+    except NoSuchElementException:
+        stock = ""
+
+    # Number of reviews
+    try:
+        reviews_count = driver.find_element(By.CSS_SELECTOR, REVIEWS_COUNT_CSS).text.strip()
+    except NoSuchElementException:
+        reviews_count = ""
+
+    # Age range
+    try:
+        age_range = driver.find_element(By.XPATH, AGE_RANGE_XPATH).text.strip()
+    except NoSuchElementException:
+        age_range = ""
+
+    # Weight
+    try:
+        weight = driver.find_element(By.XPATH, WEIGHT_XPATH).text.strip()
+    except NoSuchElementException:
+        weight = ""
+
+    # Short description
+    try:
+        short_description_elements = driver.find_elements(By.CSS_SELECTOR, SHORT_DESCRIPTION_CSS)
+        short_description = "\n".join([item.text.strip() for item in short_description_elements])
+    except NoSuchElementException:
+        short_description = ""
+
+    return {
+        'asin': asin,
+        'url': product_link,
+        'title': title,
+        'price': price,
+        'old_price': old_price,
+        'discount': discount,
+        'stock': stock,
+        'reviews_count': reviews_count,
+        'age_range': age_range,
+        'weight': weight,
+        'short_description': short_description
+    }
+
+
+def read_product(driver, product_link, settings, snapshot=None):
+    """Extract the open product page field by field or in one script round-trip, and log the cost."""
+    if snapshot is not None:
+        snapshot(extract_asin(product_link), product_link, driver.page_source)
+    start = time.perf_counter()
+    if settings["batch_extraction"]:
+        product = extract_product_js(driver, product_link, extract_asin(product_link))
+        mode = "1 script call"
+    else:
+        product = extract_product(driver, product_link)
+        mode = "per-element lookups"
+    print(f"{product['asin']}: extracted in {(time.perf_counter() - start) * 1000:.0f} ms ({mode})")
+    return product
+
+
+def collect_product_links(driver, category, settings, timer, signals=None):
+    """Open a store page and return (link, title) pairs that pass the category filter.
+
+    If a `signals` dict is given, it is filled with a fingerprint of each product tile.
+    """
+    with timer.phase("navigating"):
+        driver.get(category["url"])
+    with timer.phase("waiting"):
+        try:
+            WebDriverWait(driver, settings["store_page_timeout"], poll_frequency=STORE_POLL_INTERVAL).until(
+                links_settled(STORE_READY_LOCATOR)
+            )
+        except TimeoutException:
+            print(f"[{category['name']}] Product links still loading after {settings['store_page_timeout']}s")
+
+    items = driver.find_elements(*STORE_READY_LOCATOR)
+    print(f"[{category['name']}] Found {len(items)} product links.")
+
+    links = []
+    for index, item in enumerate(items[settings["skip_links"]:], start=1):
+        product_link = item.get_attribute('href')
+        if not product_link:
+            print(f"Product {index}: link missing")
+            continue
+
+        title = item.get_attribute('title') or item.get_attribute('aria-label') or item.text
+        if not matches_title_filter(title, category["title_filter"]):
+            print(f"Product {index}: does not match criteria")
+            continue
+
+        links.append((product_link, title))
+        if signals is not None:
+            signals[product_link] = listing_signal(title, item.text)
+    return links
+
+
+def scrape_product_page(driver, product_link, settings, timer, snapshot=None):
+    """Load a product page in the driver's only tab and extract it (used by pool workers)."""
+    with timer.phase("navigating"):
+        driver.get(product_link)
+    with timer.phase("waiting"):
+        if not wait_for_product_page(driver, settings["page_timeout"]):
+            print(f"{extract_asin(product_link)}: page not ready after {settings['page_timeout']}s, extracting what is there")
+    with timer.phase("extracting"):
+        return read_product(driver, product_link, settings, snapshot)
+
+
+def scrape_product_http(session, product_link, settings, timer, snapshot=None):
+    """Fetch a product page without a browser and parse it with the shared selectors."""
+    with timer.phase("fetching"):
+        page_source = html_backend.fetch_product_html(session, product_link, settings["page_timeout"])
+    if snapshot is not None:
+        snapshot(extract_asin(product_link), product_link, page_source)
+    with timer.phase("extracting"):
+        return html_backend.parse_product_html(page_source, product_link, extract_asin(product_link))
+
+
+def scrape_category_http(driver, links, settings, timer, on_product, snapshot=None):
+    """HTTP backend: plain requests for every product page, Selenium only for pages that need it.
+
+    The store page itself is rendered by JavaScript, so links are still collected
+    with the browser; the browser then re-scrapes only the products whose static
+    HTML had no title (robot check or JS-only page). A product whose fallback
+    fails is logged and left out, like a failed page in the Selenium crawl.
+    """
+    session = html_backend.create_session(pool_size=max(settings["workers"], 1))
+    try:
+        products = scrape_parallel(
+            links,
+            start_driver=lambda: session,
+            scrape_page=lambda worker_session, link, worker_timer: scrape_product_http(worker_session, link, settings, worker_timer, snapshot),
+            workers=max(settings["workers"], 1),
+            limiter=RateLimiter(settings["min_request_interval"]),
+            timer=timer,
+            close_driver=lambda worker_session: None,
+            # Pages that still need the browser are journaled after the fallback below
+            on_product=lambda product: None if html_backend.needs_browser(product) else on_product(product),
+        )
+    finally:
+        session.close()
+
+    scraped = {product["url"] for product in products}
+    fallback = [link for link, _ in links if link not in scraped]
+    fallback += [product["url"] for product in products if html_backend.needs_browser(product)]
+    if fallback:
+        print(f"{len(fallback)} product pages need the browser, re-scraping them with Selenium...")
+        fallback_products = {}
+        for product_link in fallback:
+            try:
+                fallback_products[product_link] = scrape_product_page(driver, product_link, settings, timer, snapshot)
+                on_product(fallback_products[product_link])
+            except Exception as e:
+                print(f"{extract_asin(product_link)}: browser fallback failed, product skipped: {e}")
+
+        # Rows that needed the browser are only kept if the fallback produced them
+        by_url = {product["url"]: product for product in products if not html_backend.needs_browser(product)}
+        by_url.update(fallback_products)
+        products = [by_url[link] for link, _ in links if link in by_url]
+    return products
+
+
+def scrape_links(driver, links, settings, timer, journal, snapshot=None):
+    """Scrape the given product links.
+
+    With one worker the products are opened in a second tab of the shared driver;
+    with more, the links go to a pool of headless browsers. Each finished product
+    is appended to the journal, and its page source passed to `snapshot` if given.
+    """
+    if settings["backend"] == "http":
+        return scrape_category_http(driver, links, settings, timer, journal.append, snapshot)
+
+    if settings["workers"] > 1:
+        return scrape_parallel(
+            links,
+            start_driver=lambda: create_driver(settings, headless=True),
+            scrape_page=lambda worker_driver, link, worker_timer: scrape_product_page(worker_driver, link, settings, worker_timer, snapshot),
+            workers=settings["workers"],
+            limiter=RateLimiter(settings["min_request_interval"]),
+            timer=timer,
+            on_product=journal.append,
+        )
+
+    products = []
+    for index, (product_link, title) in enumerate(links, start=1):
+        try:
+            print(f"Processing product {index}: {title[:50]}...")
+
+            with timer.phase("navigating"):
+                driver.execute_script(f"window.open('{product_link}', '_blank');")
+                driver.switch_to.window(driver.window_handles[1])
+
+            with timer.phase("waiting"):
+                if not wait_for_product_page(driver, settings["page_timeout"]):
+                    print(f"Product {index}: page not ready after {settings['page_timeout']}s, extracting what is there")
+
+            with timer.phase("extracting"):
+                products.append(read_product(driver, product_link, settings, snapshot))
+            journal.append(products[-1])
+
+            with timer.phase("navigating"):
+                driver.close()
+                driver.switch_to.window(driver.window_handles[0])
+
+        except Exception as e:
+            print(f"Error while processing product {index}: {e}")
+            if len(driver.window_handles) > 1:
+                driver.close()
+                driver.switch_to.window(driver.window_handles[0])
+            continue
+
+    return products
+
+
+def save_products(products, category_name, run_date, output_dir=".", storage="csv"):
+    if not products:
+        print(f"[{category_name}] No product data could be collected.")
+        return None
+
+    df = pd.DataFrame(products)
+    if storage == "parquet":
+        from scripts.etl import storage as parquet_storage  # pyarrow only needed here
+
+        filename = parquet_storage.write_partition(df, output_dir, "raw", parquet_storage.toy_type_of(category_name), run_date)
+    else:
+        filename = Path(output_dir) / f'{category_name}_raw_{run_date}.csv'
+        df.to_csv(filename, index=False, encoding='utf-8-sig')
+    print(f"[{category_name}] Data successfully saved to {filename}")
+    return filename
+
+
+def crawl_category(driver, category, settings, timer, run_date, output_dir=".", resume=False):
+    """Collect one store page's links, drop those already done (resume) or unchanged (incremental), scrape the rest and save."""
+    name = category["name"]
+    journal = ProductJournal.for_run(output_dir, name, run_date)
+    previous = []
+    if resume:
+        previous = journal.load()
+    else:
+        journal.reset()
+
+    signals = {} if settings["incremental"] else None
+    links = collect_product_links(driver, category, settings, timer, signals)
+
+    done_asins = {product["asin"] for product in previous if product.get("asin")}
+    if done_asins:
+        remaining = [(link, title) for link, title in links if extract_asin(link) not in done_asins]
+        print(f"[{name}] Resuming: {len(links) - len(remaining)} products already journaled, {len(remaining)} left.")
+        links = remaining
+
+    reused = []
+    if settings["incremental"]:
+        state = ListingState.for_category(output_dir, name)
+        previous_raw = find_previous_raw(output_dir, name, run_date, settings["storage"])
+        links, reused, stats = plan_visits(
+            links, signals, state, load_previous_products(previous_raw), run_date,
+            settings["refresh_fraction"], settings["max_staleness_days"],
+        )
+        print(f"[{name}] Incremental (previous: {previous_raw}): {stats['new_or_changed']} new/changed, "
+              f"{stats['refreshed']} refreshed, {stats['reused']} unchanged -> {stats['reused']} of {stats['links']} full visits avoided.")
+        for product in reused:
+            journal.append(product)
+
+    snapshot = None
+    if settings["page_cache_dir"]:
+        snapshot = PageCache(settings["page_cache_dir"]).writer(name, run_date)
+    products = scrape_links(driver, links, settings, timer, journal, snapshot)
+
+    if settings["incremental"]:
+        for product in products:
+            if product["asin"]:
+                state.record(product["asin"], signals.get(product["url"]), visited_on=run_date)
+        for product in reused:
+            state.record(product["asin"], signals.get(product["url"]))
+        state.save()
+
+    return save_products(previous + reused + products, name, run_date, output_dir, settings["storage"])
+
+
+def scrape_all(config_path=DEFAULT_CONFIG, names=None, output_dir=".", resume=False, **overrides):
+    """Scrape all (or the named) categories from the config in one warm browser session.
+
+    `overrides` replace config settings (page_timeout, workers, backend, ...). With
+    `resume`, products already in today's journal are kept and not scraped again.
+    A category that fails is logged and skipped; returns False if any category failed.
+    """
+    settings, categories = load_config(config_path)
+    settings.update({key: value for key, value in overrides.items() if value is not None})
+    run_date = datetime.now().strftime("%Y-%m-%d")
+    if names:
+        unknown = set(names) - {c["name"] for c in categories}
+        if unknown:
+            raise ValueError(f"Unknown categories: {', '.join(sorted(unknown))}")
+        categories = [c for c in categories if c["name"] in names]
+
+    timer = CrawlTimer()
+    driver = None
+    failed = []
+    try:
+        for category in categories:
+            print(f"Starting data collection for {category['name']}...")
+            # One category failing (store page timeout, crashed tab) does not stop the others
+            try:
+                if driver is None:
+                    with timer.phase("startup"):
+                        driver = create_driver(settings)
+                crawl_category(driver, category, settings, timer, run_date, output_dir, resume)
+            except WebDriverException as e:
+                print(f"[{category['name']}] WebDriver error, category skipped: {e}")
+                failed.append(category["name"])
+                # The session may be gone with the error: the next category starts a fresh browser
+                quit_driver(driver)
+                driver = None
+            except Exception as e:
+                print(f"[{category['name']}] Unexpected error, category skipped: {e}")
+                failed.append(category["name"])
+    finally:
+        quit_driver(driver)
+        timer.report()
+
+    if failed:
+        print(f"Failed categories: {', '.join(failed)}")
+    return not failed
+
+
+def quit_driver(driver):
+    if driver is None:
+        return
+    try:
+        driver.quit()
+    except WebDriverException as e:
+        print(f"WebDriver error while closing the browser: {e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape Amazon store pages listed in a categories config.")
+    parser.add_argument("--config", default=DEFAULT_CONFIG, help="Path to the categories JSON config")
+    parser.add_argument("--category", action="append", dest="categories", help="Only scrape this category (repeatable)")
+    parser.add_argument("--output-dir", default=".", help="Directory for the *_raw_<date>.csv files (dataset root with --storage parquet)")
+    parser.add_argument("--page-timeout", type=float, help="Seconds to wait for a product page (overrides the config)")
+    parser.add_argument("--workers", type=int, help="Number of parallel headless browsers for product pages")
+    parser.add_argument("--backend", choices=["selenium", "http"], help="Product page extraction backend")
+    parser.add_argument("--batch-extraction", action="store_true", default=None, help="Read all product fields in one execute_script call")
+    parser.add_argument("--min-interval", type=float, dest="min_request_interval", help="Minimum seconds between two product page requests across all workers")
+    parser.add_argument("--resume", action="store_true", help="Keep products already journaled today and scrape only the rest")
+    parser.add_argument("--page-cache", dest="page_cache_dir", help="Save every product page source to this cache directory")
+    parser.add_argument("--incremental", action="store_true", default=None, help="Skip product pages whose store listing is unchanged since the previous crawl")
+    parser.add_argument("--storage", choices=["csv", "parquet"], help="Write raw data as CSV files or as a partitioned Parquet dataset")
+    args = parser.parse_args()
+
+    success = scrape_all(
+        args.config,
+        args.categories,
+        args.output_dir,
+        resume=args.resume,
+        page_timeout=args.page_timeout,
+        workers=args.workers,
+        min_request_interval=args.min_request_interval,
+        backend=args.backend,
+        batch_extraction=args.batch_extraction,
+        incremental=args.incremental,
+        page_cache_dir=args.page_cache_dir,
+        storage=args.storage,
+    )
+    if success:
+        print("Done!")
+    else:
+        print("An error occurred. Please try again later.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+
+class CrawlTimer:
+    """Accumulates wall-clock time per crawl phase (navigating, waiting, extracting, ...)."""
+
+    def __init__(self):
+        self.totals = defaultdict(float)
+        self.counts = defaultdict(int)
+        self.started = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.totals[name] += time.perf_counter() - start
+            self.counts[name] += 1
+
+    def add(self, name, seconds, count=1):
+        self.totals[name] += seconds
+        self.counts[name] += count
+
+    def merge(self, other):
+        for name, seconds in other.totals.items():
+            self.add(name, seconds, other.counts[name])
+
+    def report(self, label="Crawl"):
+        elapsed = time.perf_counter() - self.started
+        print(f"{label} timing ({elapsed:.1f}s wall clock):")
+        for name, seconds in sorted(self.totals.items(), key=lambda kv: -kv[1]):
+            share = seconds / elapsed * 100 if elapsed else 0.0
+            per_call = seconds / self.counts[name] if self.counts[name] else 0.0
+            print(f"  {name:<12} {seconds:8.1f}s  {share:5.1f}%  ({self.counts[name]} x {per_call:.2f}s)")
@@ -0,0 +1,170 @@
+import argparse
+import re
+from functools import lru_cache
+
+import requests
+from lxml import etree, html
+from requests.adapters import HTTPAdapter
+
+from scripts.scraping.product_selectors import (
+    AGE_RANGE_XPATH,
+    DISCOUNT_CSS,
+    OLD_PRICE_CSS,
+    PRICE_FRACTION_CSS,
+    PRICE_SYMBOL_CSS,
+    PRICE_WHOLE_CSS,
+    REVIEWS_COUNT_CSS,
+    SHORT_DESCRIPTION_CSS,
+    STOCK_CSS,
+    TITLE_ID,
+    WEIGHT_XPATH,
+)
+
+# Same browser identity as the Selenium options, plus the headers a browser sends anyway
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/90.0.4430.212 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-GB,en;q=0.9,de;q=0.8",
+}
+
+_COMPOUND = re.compile(r"^([\w*]+)?((?:\.[\w-]+|#[\w-]+|\[[\w-]+='[^']*'\])*)$")
+_PART = re.compile(r"\.([\w-]+)|#([\w-]+)|\[([\w-]+)='([^']*)'\]")
+
+
+@lru_cache(maxsize=None)
+def css_xpath(css, relative=False):
+    """Compile the simple CSS used in product_selectors (tag, .class, #id, [attr='v'], descendants) to XPath.
+
+    The XPath searches the whole document; with `relative` only below the element it is evaluated on.
+    """
+    steps = []
+    for compound in css.split():
+        match = _COMPOUND.match(compound)
+        if not match:
+            raise ValueError(f"Unsupported CSS selector: {css}")
+        tag, rest = match.group(1) or "*", match.group(2)
+        conditions = []
+        for cls, id_, attr, value in _PART.findall(rest):
+            if cls:
+                conditions.append(f"contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')")
+            elif id_:
+                conditions.append(f"@id='{id_}'")
+            else:
+                conditions.append(f"@{attr}='{value}'")
+        steps.append(tag + "".join(f"[{c}]" for c in conditions))
+    return etree.XPath((".//" if relative else "//") + "//".join(steps))
+
+
+@lru_cache(maxsize=None)
+def raw_xpath(expression):
+    return etree.XPath(expression)
+
+
+def element_text(element):
+    """Visible text of an element with whitespace collapsed, like Selenium's `.text` on one line."""
+    if element is None:
+        return ""
+    parts = element.xpath(".//text()[not(ancestor::script) and not(ancestor::style)]")
+    return " ".join("".join(parts).split())
+
+
+def own_text(element):
+    """Text directly inside an element, without its children (e.g. "11" of "11<span>,</span>")."""
+    if element is None:
+        return ""
+    return " ".join("".join(element.xpath("text()")).split())
+
+
+def price_text(element):
+    """Amazon renders prices twice (screen-reader copy + visible copy); keep one of them."""
+    if element is None:
+        return ""
+    offscreen = css_xpath("span.a-offscreen", relative=True)(element)
+    if offscreen:
+        return element_text(offscreen[0])
+    return element_text(element)
+
+
+def first(tree, css):
+    found = css_xpath(css)(tree)
+    return found[0] if found else None
+
+
+def create_session(pool_size=10):
+    """One pooled keep-alive session, shared by all HTTP workers."""
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=2)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def fetch_product_html(session, product_link, timeout):
+    response = session.get(product_link, timeout=timeout)
+    response.raise_for_status()
+    return response.text
+
+
+def parse_product_html(page_source, product_link, asin):
+    """Extract the product fields from raw product page HTML, using the Selenium selectors."""
+    tree = html.fromstring(page_source)
+
+    title_element = tree.get_element_by_id(TITLE_ID, None)
+    title = element_text(title_element)
+
+    # Current price
+    price_parts = [first(tree, css) for css in (PRICE_SYMBOL_CSS, PRICE_WHOLE_CSS, PRICE_FRACTION_CSS)]
+    if all(part is not None for part in price_parts):
+        price_currency, price_whole, price_fraction = element_text(price_parts[0]), own_text(price_parts[1]), element_text(price_parts[2])
+        price = f"{price_currency}{price_whole}.{price_fraction}"
+    else:
+        price = ""
+
+    # Old price: first selector that matches wins
+    old_price = ""
+    for css in OLD_PRICE_CSS:
+        element = first(tree, css)
+        if element is not None:
+            old_price = price_text(element)
+            break
+
+    # Age range / weight come from the product details table
+    age_range = raw_xpath(AGE_RANGE_XPATH)(tree)
+    weight = raw_xpath(WEIGHT_XPATH)(tree)
+
+    return {
+        'asin': asin,
+        'url': product_link,
+        'title': title,
+        'price': price,
+        'old_price': old_price,
+        'discount': element_text(first(tree, DISCOUNT_CSS)),
+        'stock': element_text(first(tree, STOCK_CSS)),
+        'reviews_count': element_text(first(tree, REVIEWS_COUNT_CSS)),
+        'age_range': element_text(age_range[0]) if age_range else "",
+        'weight': element_text(weight[0]) if weight else "",
+        'short_description': "\n".join(element_text(item) for item in css_xpath(SHORT_DESCRIPTION_CSS)(tree)),
+    }
+
+
+def needs_browser(product):
+    """Captcha/robot-check and JS-only pages have no product title in the static HTML."""
+    return not product["title"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract product fields from a saved product page HTML file.")
+    parser.add_argument("html_file", help="Saved /dp/ page source")
+    parser.add_argument("--url", default="", help="Product URL the page was saved from")
+    parser.add_argument("--asin", default="", help="ASIN of the product")
+    args = parser.parse_args()
+
+    with open(args.html_file, encoding="utf-8") as f:
+        product = parse_product_html(f.read(), args.url, args.asin)
+    for key, value in product.items():
+        print(f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
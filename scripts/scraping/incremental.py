@@ -0,0 +1,113 @@
+import hashlib
+import json
+import math
+import re
+from datetime import date
+from pathlib import Path
+
+import pandas as pd
+
+from scripts.etl.storage import partition_path, partitions, toy_type_of
+
+RAW_FILE_DATE = re.compile(r"_raw_(\d{4}-\d{2}-\d{2})\.csv$")
+ASIN_FROM_URL = re.compile(r"/dp/([A-Z0-9]{10})")
+
+
+def listing_signal(*parts):
+    """Fingerprint of what the store page shows for a product (title, tile text with price/rating)."""
+    normalized = "\n".join(" ".join(str(part or "").split()) for part in parts)
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+def find_previous_raw(output_dir, category_name, run_date, storage="csv"):
+    """Latest `<name>_raw_<date>.csv` (or raw Parquet partition) in output_dir from before run_date, or None."""
+    candidates = []
+    if storage == "parquet":
+        toy_type = toy_type_of(category_name)
+        dates = [scrape_date for _, scrape_date in partitions(output_dir, "raw", toy_types=[toy_type]) if scrape_date < run_date]
+        return partition_path(output_dir, "raw", toy_type, max(dates)) if dates else None
+    for path in Path(output_dir).glob(f"{category_name}_raw_*.csv"):
+        match = RAW_FILE_DATE.search(path.name)
+        if match and match.group(1) < run_date:
+            candidates.append((match.group(1), path))
+    return max(candidates)[1] if candidates else None
+
+
+def load_previous_products(path):
+    """Rows of a previous raw CSV/Parquet file keyed by ASIN, as the original strings."""
+    if path is None:
+        return {}
+    if Path(path).suffix == ".parquet":
+        df = pd.read_parquet(path).astype(object)
+        df = df.where(df.notna(), "").astype(str)
+    else:
+        df = pd.read_csv(path, dtype=str, keep_default_na=False, encoding="utf-8-sig")
+    return {row["asin"]: row for row in df.to_dict("records") if row.get("asin")}
+
+
+class ListingState:
+    """Per-category store of listing signals and last full visit date per ASIN (JSON file)."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.entries = {}
+        if self.path.exists():
+            with open(self.path, encoding="utf-8") as f:
+                self.entries = json.load(f)
+
+    @classmethod
+    def for_category(cls, output_dir, category_name):
+        return cls(Path(output_dir) / f"{category_name}_listing_state.json")
+
+    def record(self, asin, signal, visited_on=None):
+        entry = self.entries.setdefault(asin, {})
+        entry["signal"] = signal
+        if visited_on is not None:
+            entry["last_full_visit"] = visited_on
+
+    def save(self):
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, indent=1, sort_keys=True)
+        tmp_path.replace(self.path)
+
+
+def plan_visits(links, signals, state, previous_products, run_date, refresh_fraction, max_staleness_days):
+    """Split store links into pages to visit and products to carry over from the previous crawl.
+
+    A product is carried over when its listing signal is unchanged and a previous
+    row exists. Of those, the least recently visited `refresh_fraction` (and any
+    not visited for `max_staleness_days`) are still visited, so every product is
+    refreshed on a rotating schedule.
+    """
+    to_visit, unchanged = [], []
+    for link, title in links:
+        asin = ASIN_FROM_URL.search(link)
+        asin = asin.group(1) if asin else ""
+        entry = state.entries.get(asin)
+        if asin and entry and entry.get("signal") == signals.get(link) and asin in previous_products:
+            unchanged.append((link, title, asin, entry.get("last_full_visit", "")))
+        else:
+            to_visit.append((link, title))
+    new_or_changed = len(to_visit)
+
+    # Oldest full visit first; ISO dates sort chronologically
+    unchanged.sort(key=lambda item: item[3])
+    sample_size = math.ceil(len(unchanged) * refresh_fraction)
+    today = date.fromisoformat(run_date)
+
+    reused = []
+    for position, (link, title, asin, last_visit) in enumerate(unchanged):
+        stale = not last_visit or (today - date.fromisoformat(last_visit)).days >= max_staleness_days
+        if position < sample_size or stale:
+            to_visit.append((link, title))
+        else:
+            reused.append(dict(previous_products[asin], url=link))
+
+    stats = {
+        "links": len(links),
+        "new_or_changed": new_or_changed,
+        "refreshed": len(to_visit) - new_or_changed,
+        "reused": len(reused),
+    }
+    return to_visit, reused, stats
@@ -0,0 +1,46 @@
+import json
+import threading
+from pathlib import Path
+
+
+class ProductJournal:
+    """Append-only JSON Lines log of scraped products for one category and run date.
+
+    Every product is written and flushed as soon as it is scraped, so a crash
+    only loses the page that was in flight. `--resume` reads the journal back
+    and skips the ASINs it already holds.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_run(cls, output_dir, category_name, run_date):
+        return cls(Path(output_dir) / f"{category_name}_raw_{run_date}.journal.jsonl")
+
+    def load(self):
+        """Products journaled so far, one per ASIN (the latest entry wins)."""
+        if not self.path.exists():
+            return []
+        products = {}
+        with open(self.path, encoding="utf-8") as f:
+            for line_number, line in enumerate(f, start=1):
+                try:
+                    product = json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash mid-write leaves a truncated last line; everything before it is intact
+                    print(f"{self.path}: skipping unreadable line {line_number}")
+                    continue
+                products[product.get("asin") or product.get("url")] = product
+        return list(products.values())
+
+    def reset(self):
+        with self._lock:
+            self.path.unlink(missing_ok=True)
+
+    def append(self, product):
+        line = json.dumps(product, ensure_ascii=False)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
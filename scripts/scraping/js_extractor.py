@@ -0,0 +1,49 @@
+from scripts.scraping.product_selectors import FIELD_CSS, FIELD_XPATH, PRICE_PARTS_CSS, SHORT_DESCRIPTION_CSS
+
+# Runs in the page and returns every product field at once, instead of one
+# WebDriver round-trip (and one NoSuchElementException) per field.
+EXTRACT_SCRIPT = """
+const [fieldCss, fieldXpath, priceParts, descriptionCss] = arguments;
+const text = (el) => (el ? (el.innerText || el.textContent || "").trim() : "");
+const result = {};
+
+for (const [field, selectors] of Object.entries(fieldCss)) {
+    result[field] = "";
+    for (const selector of selectors) {
+        const el = document.querySelector(selector);
+        if (el) { result[field] = text(el); break; }
+    }
+}
+
+for (const [field, expressions] of Object.entries(fieldXpath)) {
+    result[field] = "";
+    for (const expression of expressions) {
+        const el = document.evaluate(expression, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        if (el) { result[field] = text(el); break; }
+    }
+}
+
+const parts = priceParts.map((selector) => document.querySelector(selector));
+result.price = parts.every((el) => el) ? `${text(parts[0])}${text(parts[1])}.${text(parts[2])}` : "";
+
+result.short_description = Array.from(document.querySelectorAll(descriptionCss)).map(text).join("\\n");
+return result;
+"""
+
+
+def extract_product_js(driver, product_link, asin):
+    """Read all product fields with a single execute_script call; same dict as extract_product."""
+    fields = driver.execute_script(EXTRACT_SCRIPT, FIELD_CSS, FIELD_XPATH, PRICE_PARTS_CSS, SHORT_DESCRIPTION_CSS)
+    return {
+        'asin': asin,
+        'url': product_link,
+        'title': fields["title"],
+        'price': fields["price"],
+        'old_price': fields["old_price"],
+        'discount': fields["discount"],
+        'stock': fields["stock"],
+        'reviews_count': fields["reviews_count"],
+        'age_range': fields["age_range"],
+        'weight': fields["weight"],
+        'short_description': fields["short_description"]
+    }
@@ -0,0 +1,174 @@
+import argparse
+import gzip
+import hashlib
+import json
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+from scripts.etl.storage import partition_path, toy_type_of
+from scripts.scraping.crawl_stats import CrawlTimer
+from scripts.scraping.html_backend import parse_product_html
+from scripts.scraping.incremental import load_previous_products
+from scripts.scraping.journal import ProductJournal
+
+
+class PageCache:
+    """Local cache of product page sources.
+
+    Pages are stored once per content hash as gzip files under `objects/`; a
+    JSON Lines index per run date (`index/<date>.jsonl`) maps category + ASIN
+    to the hash. Identical pages from different days share one object.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = Path(cache_dir)
+        self._lock = threading.Lock()
+
+    def _object_path(self, digest):
+        return self.cache_dir / "objects" / digest[:2] / f"{digest}.html.gz"
+
+    def _index_path(self, run_date):
+        return self.cache_dir / "index" / f"{run_date}.jsonl"
+
+    def store(self, category_name, run_date, asin, product_link, page_source):
+        data = page_source.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        object_path = self._object_path(digest)
+        if not object_path.exists():
+            object_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = object_path.with_suffix(f".{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(gzip.compress(data))
+            tmp_path.replace(object_path)
+
+        entry = {"category": category_name, "asin": asin, "url": product_link, "sha256": digest}
+        index_path = self._index_path(run_date)
+        with self._lock:
+            index_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(index_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+        return digest
+
+    def writer(self, category_name, run_date):
+        """`save(asin, product_link, page_source)` bound to one category and run date."""
+        return lambda asin, product_link, page_source: self.store(category_name, run_date, asin, product_link, page_source)
+
+    def entries(self, run_date, category_name=None):
+        """Index entries of a run date, the latest one per (category, ASIN)."""
+        index_path = self._index_path(run_date)
+        if not index_path.exists():
+            return []
+        latest = {}
+        with open(index_path, encoding="utf-8") as f:
+            for line in f:
+                entry = json.loads(line)
+                if category_name is None or entry["category"] == category_name:
+                    latest[(entry["category"], entry["asin"] or entry["url"])] = entry
+        return list(latest.values())
+
+    def load(self, digest):
+        return gzip.decompress(self._object_path(digest).read_bytes()).decode("utf-8")
+
+
+def crawl_path(crawl_dir, category_name, run_date, storage="csv"):
+    """Where the live crawl saved a category's raw data."""
+    if storage == "parquet":
+        return partition_path(crawl_dir, "raw", toy_type_of(category_name), run_date)
+    return Path(crawl_dir) / f"{category_name}_raw_{run_date}.csv"
+
+
+def crawled_products(crawl_dir, category_name, run_date, storage="csv"):
+    """{asin: row} of the live crawl (its raw file, or its journal if the crawl did not finish)."""
+    path = crawl_path(crawl_dir, category_name, run_date, storage)
+    if path.exists():
+        return load_previous_products(path)
+    journal = ProductJournal.for_run(crawl_dir, category_name, run_date)
+    return {product["asin"]: product for product in journal.load() if product.get("asin")}
+
+
+def crawled_categories(crawl_dir, run_date):
+    """Categories the live crawl journaled or saved as CSV on run_date."""
+    names = set()
+    for pattern in (f"*_raw_{run_date}.journal.jsonl", f"*_raw_{run_date}.csv"):
+        names.update(path.name.split(f"_raw_{run_date}")[0] for path in Path(crawl_dir).glob(pattern))
+    return names
+
+
+def save_replay(products, category_name, run_date, output_dir, storage="csv", overwrite=False):
+    path = crawl_path(output_dir, category_name, run_date, storage)
+    if path.exists() and not overwrite:
+        raise ValueError(f"{path} already exists (pass overwrite=True / --overwrite to replace it)")
+    df = pd.DataFrame(products)
+    if storage == "parquet":
+        from scripts.etl import storage as parquet_storage  # pyarrow only needed here
+
+        return parquet_storage.write_partition(df, output_dir, "raw", toy_type_of(category_name), run_date)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    df.to_csv(path, index=False, encoding="utf-8-sig")
+    return path
+
+
+def replay(cache_dir, run_date, output_dir=None, category_name=None, crawl_dir=".", storage="csv", overwrite=False):
+    """Re-run extraction over cached pages of one run date, without a browser or network.
+
+    Writes the raw data per category like a live crawl (`<category>_raw_<date>.csv`
+    or a raw Parquet partition), by default under `<cache_dir>/replay` so the crawl's
+    own output in `crawl_dir` stays untouched. Products the crawl saved without a
+    page visit (reused by --incremental) have no cached page; their rows are carried
+    over from the crawl's raw file or journal.
+    """
+    if storage not in ("csv", "parquet"):
+        raise ValueError(f"Unknown storage {storage!r} (expected csv or parquet)")
+    output_dir = Path(output_dir) if output_dir else Path(cache_dir) / "replay"
+    cache = PageCache(cache_dir)
+    timer = CrawlTimer()
+    by_category = {}
+    for entry in cache.entries(run_date, category_name):
+        with timer.phase("reading"):
+            page_source = cache.load(entry["sha256"])
+        with timer.phase("extracting"):
+            product = parse_product_html(page_source, entry["url"], entry["asin"])
+        by_category.setdefault(entry["category"], {})[entry["asin"] or entry["url"]] = product
+
+    names = set(by_category) | crawled_categories(crawl_dir, run_date)
+    if category_name is not None:
+        names &= {category_name}
+    filenames = []
+    for name in sorted(names):
+        replayed = by_category.get(name, {})
+        crawled = crawled_products(crawl_dir, name, run_date, storage)
+        # The crawl's order, with re-extracted rows where a page was cached
+        products = [replayed.get(asin, row) for asin, row in crawled.items()]
+        products += [product for key, product in replayed.items() if key not in crawled]
+        if not products:
+            continue
+        filename = save_replay(products, name, run_date, output_dir, storage, overwrite)
+        carried = sum(asin not in replayed for asin in crawled)
+        print(f"[{name}] Replayed {len(replayed)} cached pages, carried over {carried} rows without a page: {filename}")
+        filenames.append(filename)
+    if not filenames:
+        print(f"No cached pages or crawl output for {run_date} in {cache_dir} / {crawl_dir}")
+    timer.report("Replay")
+    return filenames
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-extract products from cached product pages (no browser).")
+    parser.add_argument("--cache-dir", required=True, help="Page cache directory written by the scraper")
+    parser.add_argument("--date", required=True, help="Run date to replay (YYYY-MM-DD)")
+    parser.add_argument("--category", help="Only replay this category")
+    parser.add_argument("--output-dir", help="Directory for the replayed raw data (default: <cache-dir>/replay)")
+    parser.add_argument("--crawl-dir", default=".", help="Output directory of the live crawl, for rows it saved without a page visit")
+    parser.add_argument("--storage", choices=["csv", "parquet"], default="csv", help="Storage of the live crawl and of the replayed raw data")
+    parser.add_argument("--overwrite", action="store_true", help="Replace existing raw data in the output directory")
+    args = parser.parse_args()
+
+    try:
+        replay(args.cache_dir, args.date, args.output_dir, args.category, args.crawl_dir, args.storage, args.overwrite)
+    except ValueError as e:
+        parser.error(str(e))
+
+
+if __name__ == "__main__":
+    main()
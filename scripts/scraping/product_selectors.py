@@ -0,0 +1,37 @@
+# Product page selectors shared by every extraction backend (Selenium and plain HTML)
+
+TITLE_ID = "productTitle"
+
+PRICE_SYMBOL_CSS = "span.a-price-symbol"
+PRICE_WHOLE_CSS = "span.a-price-whole"
+PRICE_FRACTION_CSS = "span.a-price-fraction"
+
+# Tried in order: list price, then the "price to pay" block
+OLD_PRICE_CSS = [
+    "span.a-price.a-text-price",
+    "span.a-price.aok-align-center.reinventPricePriceToPayMargin.priceToPay",
+]
+
+DISCOUNT_CSS = "span.savingsPercentage"
+STOCK_CSS = "div#availability"
+REVIEWS_COUNT_CSS = "span[data-hook='total-review-count']"
+
+AGE_RANGE_XPATH = '//td[contains(@class, "prodDetAttrValue") and (contains(text(), "Monate") or contains(text(), "Jahre") or contains(text(), "months") or contains(text(), "years"))]'
+WEIGHT_XPATH = '//td[contains(@class, "prodDetAttrValue") and (contains(text(), "g") or contains(text(), "kg"))]'
+
+SHORT_DESCRIPTION_CSS = "ul.a-unordered-list.a-vertical.a-spacing-mini li.a-spacing-mini span.a-list-item"
+
+# Per-field CSS fallbacks for the single-round-trip extractor, tried in order.
+# Same selectors as above, grouped by output column.
+FIELD_CSS = {
+    "title": [f"#{TITLE_ID}"],
+    "old_price": OLD_PRICE_CSS,
+    "discount": [DISCOUNT_CSS],
+    "stock": [STOCK_CSS],
+    "reviews_count": [REVIEWS_COUNT_CSS],
+}
+FIELD_XPATH = {
+    "age_range": [AGE_RANGE_XPATH],
+    "weight": [WEIGHT_XPATH],
+}
+PRICE_PARTS_CSS = [PRICE_SYMBOL_CSS, PRICE_WHOLE_CSS, PRICE_FRACTION_CSS]
@@ -0,0 +1,81 @@
+import queue
+import threading
+import time
+
+from scripts.scraping.crawl_stats import CrawlTimer
+
+
+class RateLimiter:
+    """Politeness limit shared by all workers: at most one request start per `min_interval` seconds."""
+
+    def __init__(self, min_interval):
+        self.min_interval = min_interval
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.min_interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+def scrape_parallel(links, start_driver, scrape_page, workers, limiter, timer, close_driver=None, on_product=None):
+    """Scrape (link, title) pairs with `workers` browsers pulling from one work queue.
+
+    `start_driver()` creates a browser (or any other client) for a worker,
+    `scrape_page(driver, link, timer)` returns a product dict and `close_driver(driver)`
+    releases it (default: `driver.quit()`). `on_product(product)` is called as soon as
+    each page is done. Results keep the order of `links`, so the output matches what
+    the sequential crawl writes.
+    """
+    if close_driver is None:
+        close_driver = lambda driver: driver.quit()
+
+    jobs = queue.Queue()
+    for index, (product_link, title) in enumerate(links, start=1):
+        jobs.put((index, product_link, title))
+
+    results = {}
+    results_lock = threading.Lock()
+
+    def worker(worker_id):
+        worker_timer = CrawlTimer()
+        driver = None
+        try:
+            with worker_timer.phase("startup"):
+                driver = start_driver()
+            while True:
+                try:
+                    index, product_link, title = jobs.get_nowait()
+                except queue.Empty:
+                    break
+                try:
+                    with worker_timer.phase("throttled"):
+                        limiter.wait()
+                    print(f"[worker {worker_id}] Processing product {index}: {title[:50]}...")
+                    product = scrape_page(driver, product_link, worker_timer)
+                    with results_lock:
+                        results[index] = product
+                        if on_product is not None:
+                            on_product(product)
+                except Exception as e:
+                    print(f"[worker {worker_id}] Error while processing product {index}: {e}")
+        except Exception as e:
+            print(f"[worker {worker_id}] Could not start browser: {e}")
+        finally:
+            if driver is not None:
+                close_driver(driver)
+            with results_lock:
+                timer.merge(worker_timer)
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(1, min(workers, len(links)) + 1)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return [results[index] for index in sorted(results)]
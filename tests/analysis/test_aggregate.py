@@ -0,0 +1,34 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from scripts.analysis.aggregate import INTEGER_METRICS, TOTAL, UNKNOWN, pivot, summarize
+from scripts.analysis.features import compute_features
+
+MERGED = Path(__file__).resolve().parents[2] / "data" / "merged" / "toys_fisher_price_merged.csv"
+
+
+@pytest.fixture
+def features():
+    """The merged data with two products that have no price (and so no price bucket)."""
+    merged = pd.read_csv(MERGED)
+    merged.loc[[0, 5], "price"] = np.nan
+    return compute_features(merged)
+
+
+@pytest.mark.parametrize("metric", INTEGER_METRICS)
+def test_totals_equal_the_sum_of_cells(features, metric):
+    table = pivot(summarize(features), metric)
+    cells = table.drop(index=TOTAL, columns=TOTAL)
+    assert table.loc[TOTAL, TOTAL] == cells.to_numpy().sum()
+    assert (table.loc[TOTAL].drop(TOTAL) == cells.sum(axis=0)).all()
+    assert (table[TOTAL].drop(TOTAL) == cells.sum(axis=1)).all()
+
+
+def test_products_without_price_are_an_unknown_bucket(features):
+    table = pivot(summarize(features), "products")
+    assert list(table.columns)[-2:] == [UNKNOWN, TOTAL]
+    assert table.loc[TOTAL, UNKNOWN] == 2
+    assert table.loc[TOTAL, TOTAL] == len(features)
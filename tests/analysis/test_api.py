@@ -0,0 +1,47 @@
+import json
+
+import pytest
+
+from scripts.analysis.api import ToysApi
+from scripts.layout import ANALYSIS_CSV, REFERENCE_DATA_DIR
+
+PROCESSED = REFERENCE_DATA_DIR / "processed"
+
+
+@pytest.fixture(scope="module")
+def api():
+    return ToysApi(PROCESSED / ANALYSIS_CSV)
+
+
+def get(api, target):
+    status, body = api.handle_get(target)
+    return status.value, json.loads(body)
+
+
+def test_loading_writes_no_files(tmp_path):
+    analysis = tmp_path / ANALYSIS_CSV
+    analysis.write_bytes((PROCESSED / ANALYSIS_CSV).read_bytes())
+    api = ToysApi(analysis)
+    assert [path.name for path in tmp_path.iterdir()] == [ANALYSIS_CSV]
+    assert get(api, "/summary/products")[0] == 200
+
+
+@pytest.mark.parametrize("query", ["top=5", "top=0", "limit=3&offset=2", "limit=0"])
+def test_valid_paging(api, query):
+    status, payload = get(api, f"/products?{query}")
+    assert status == 200
+    assert len(payload["products"]) <= 5
+
+
+@pytest.mark.parametrize("query", ["top=-1", "limit=-5", "offset=-1", "offset=1.5", "limit=abc", "top=2e3", "limit="])
+def test_invalid_paging_is_a_bad_request(api, query):
+    status, payload = get(api, f"/products?{query}")
+    assert status == 400
+    assert "non-negative integer" in payload["error"]
+
+
+def test_top_returns_the_best_rows(api):
+    status, payload = get(api, "/products?top=3&by=price&columns=asin,price")
+    prices = [row["price"] for row in payload["products"]]
+    assert status == 200 and payload["total"] == 3
+    assert prices == sorted(prices, reverse=True)
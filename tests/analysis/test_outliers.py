@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from scripts.analysis.outliers import StreamingOutliers, TDigest, outlier_flags
+
+QUANTILES = [0, 0.1, 0.25, 0.5, 0.75, 0.9, 1]
+
+
+def products(n, seed):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "toy_type": rng.choice(["wooden", "baby", "sustainable"], n),
+        "price": rng.lognormal(3, 0.6, n).round(2),
+        "€/g": rng.lognormal(-3, 1, n),
+        "reviews_count": rng.integers(0, 5000, n).astype("float64"),
+    })
+
+
+def test_digest_is_exact_before_any_merge():
+    values = np.random.default_rng(0).normal(size=50)
+    digest = TDigest().update(values[:20]).update(values[20:])
+    assert (digest.weights == 1).all()
+    np.testing.assert_allclose(digest.quantile(QUANTILES), pd.Series(values).quantile(QUANTILES).to_numpy())
+
+
+def test_digest_is_close_after_batched_updates():
+    values = np.random.default_rng(1).lognormal(3, 0.6, 20_000)
+    digest = TDigest()
+    for batch in np.array_split(values, 40):
+        digest.update(batch)
+    assert len(digest.weights) < 400
+    exact = pd.Series(values).quantile(QUANTILES).to_numpy()
+    # Within 0.1% of the value range, and the extremes exact
+    np.testing.assert_allclose(digest.quantile(QUANTILES), exact, atol=1e-3 * (values.max() - values.min()))
+    assert digest.quantile([0, 1]).tolist() == [values.min(), values.max()]
+
+
+def test_streaming_state_round_trip(tmp_path):
+    days = [products(40, seed) for seed in range(3)]
+    streaming = StreamingOutliers(tmp_path / "state.json")
+    for day in days:
+        streaming.update(day)
+    streaming.save()
+
+    reloaded = StreamingOutliers(tmp_path / "state.json")
+    assert {flag: sorted(groups) for flag, groups in reloaded.digests.items()} == {flag: sorted(groups) for flag, groups in streaming.digests.items()}
+    for flag, groups in streaming.digests.items():
+        for group, digest in groups.items():
+            assert reloaded.digests[flag][group].to_dict() == digest.to_dict()
+    pd.testing.assert_frame_equal(reloaded.flags(days[-1]), streaming.flags(days[-1]))
+
+
+@pytest.mark.parametrize("multipliers", [None, {"price_outlier_by_type": 1.0}])
+def test_streaming_flags_match_batch_flags_while_exact(multipliers):
+    # Few rows per group: no centroid holds more than one point yet
+    df = products(60, seed=4)
+    streaming = StreamingOutliers().update(df.iloc[:30]).update(df.iloc[30:])
+    assert all((digest.weights == 1).all() for groups in streaming.digests.values() for digest in groups.values())
+    flags = streaming.flags(df, multipliers)
+    pd.testing.assert_frame_equal(flags, outlier_flags(df, multipliers=multipliers)[flags.columns])
@@ -0,0 +1,41 @@
+from pathlib import Path
+
+import pandas as pd
+
+from scripts.analysis.features import compute_features
+from scripts.analysis.query import ToyIndex
+
+MERGED = Path(__file__).resolve().parents[2] / "data" / "merged" / "toys_fisher_price_merged.csv"
+
+
+def cross_listed_index():
+    """The merged data with one baby toy also listed under sustainable (as the store pages do)."""
+    merged = pd.read_csv(MERGED)
+    baby = merged[merged["toy_type"] == "baby"].iloc[[0]]
+    merged = pd.concat([merged, baby.assign(toy_type="sustainable")], ignore_index=True)
+    return ToyIndex(compute_features(merged)), merged, baby["asin"].iloc[0]
+
+
+def test_cross_category_asin_is_in_both_categories():
+    index, merged, asin = cross_listed_index()
+    assert len(index) == len(merged)
+    for toy_type in ("baby", "sustainable"):
+        rows = index.query(toy_type=toy_type)
+        assert len(rows) == (merged["toy_type"] == toy_type).sum()
+        assert asin in set(rows["asin"])
+
+
+def test_get_returns_every_row_of_an_asin():
+    index, _, asin = cross_listed_index()
+    rows = index.get(asin, ["asin", "toy_type", "price"])
+    assert [(row["asin"], row["toy_type"]) for row in rows] == [(asin, "baby"), (asin, "sustainable")]
+    assert rows[0]["price"] == rows[1]["price"]
+    assert index.get("B000000000") == []
+
+
+def test_top_and_ranges_see_cross_listed_rows():
+    index, merged, asin = cross_listed_index()
+    price = merged.loc[merged["asin"] == asin, "price"].iloc[0]
+    rows = index.query(["asin", "toy_type"], price_min=price, price_max=price)
+    assert {("baby", asin), ("sustainable", asin)} <= set(zip(rows["toy_type"], rows["asin"]))
+    assert len(index.top(len(merged), by="price")) == len(merged)
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The scripts are run as `python -m scripts...` from the repository root; make the tests import them the same way
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
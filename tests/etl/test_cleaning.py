@@ -0,0 +1,24 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from scripts.etl.benchmark_cleaning import make_synthetic_raw
+from scripts.etl.ETL_cleaning import clean_dataframe
+from scripts.etl.vectorized_cleaning import clean_dataframe_vectorized
+
+RAW_DIR = Path(__file__).resolve().parents[2] / "data" / "raw"
+
+
+def same_csv(df):
+    return clean_dataframe(df.copy()).to_csv(index=False) == clean_dataframe_vectorized(df.copy()).to_csv(index=False)
+
+
+@pytest.mark.parametrize("path", sorted(RAW_DIR.glob("*_raw_*.csv")), ids=lambda path: path.name)
+def test_vectorized_engine_matches_rowwise_on_raw_files(path):
+    assert same_csv(pd.read_csv(path))
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_vectorized_engine_matches_rowwise_on_synthetic_rows(seed):
+    assert same_csv(make_synthetic_raw(5_000, seed))
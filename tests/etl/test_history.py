@@ -0,0 +1,58 @@
+from pathlib import Path
+
+import pytest
+
+from scripts.etl.history import HistoryStore
+from scripts.merge.merge_toys import load_cleaned, merge_frames
+
+CLEANED = Path(__file__).resolve().parents[2] / "data" / "cleaned" / "wooden_toys_cleaned_2025-09-15.csv"
+
+
+@pytest.fixture
+def crawl():
+    return merge_frames(load_cleaned([CLEANED]))
+
+
+@pytest.fixture
+def store(tmp_path):
+    with HistoryStore(tmp_path / "history.sqlite") as store:
+        yield store
+
+
+def test_unchanged_rows_are_stored_once(store, crawl):
+    assert store.append(crawl, "2025-09-15") == (len(crawl), len(crawl))
+    next_day = crawl.copy()
+    next_day.loc[0, "price"] += 1
+    # Every product is observed again, only the changed one gets a new version
+    assert store.append(next_day, "2025-09-16") == (len(crawl), 1)
+    assert store.counts() == (2 * len(crawl), len(crawl) + 1)
+    assert store.dates() == ["2025-09-15", "2025-09-16"]
+
+
+def test_asin_history_and_snapshot(store, crawl):
+    store.append(crawl, "2025-09-15")
+    next_day = crawl.copy()
+    next_day.loc[0, "price"] += 1
+    store.append(next_day.iloc[:-1], "2025-09-16")
+    asin = crawl.loc[0, "asin"]
+
+    history = store.asin_history(asin, ["price"])
+    assert history["scrape_date"].tolist() == ["2025-09-15", "2025-09-16"]
+    assert history["price"].tolist() == [crawl.loc[0, "price"], crawl.loc[0, "price"] + 1]
+
+    snapshot = store.snapshot("2025-09-16", "wooden")
+    assert len(snapshot) == len(crawl) - 1
+    assert snapshot["asin"].tolist() == sorted(snapshot["asin"])
+    assert snapshot.loc[snapshot["asin"] == asin, "price"].item() == crawl.loc[0, "price"] + 1
+    assert store.snapshot("2025-09-16", "baby").empty
+
+
+def test_adding_a_date_again_replaces_its_rows(store, crawl):
+    store.append(crawl, "2025-09-15")
+    assert store.append(crawl, "2025-09-15") == (0, 0)
+    corrected = crawl.copy()
+    corrected.loc[0, "title"] = "Fixed title"
+    assert store.append(corrected, "2025-09-15") == (1, 1)
+
+    assert store.asin_history(crawl.loc[0, "asin"], ["title"])["title"].tolist() == ["Fixed title"]
+    assert store.counts() == (len(crawl), len(crawl) + 1)
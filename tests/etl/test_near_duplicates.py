@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+
+from scripts.etl.near_duplicates import BANDS, NUM_PERM, connected_groups, product_groups, similar_pairs
+
+ROWS = NUM_PERM // BANDS
+
+
+def outlier_leader_signatures():
+    """Row 0 (the smallest ASIN) shares band 0 with rows 1 and 2 and nothing else; rows 1 and 2 are
+    near-duplicates (15 of 128 positions differ, one per band) whose only common band is band 0."""
+    rng = np.random.default_rng(0)
+    base = rng.integers(0, 1 << 31, NUM_PERM, dtype=np.uint32)
+    outlier = rng.integers(0, 1 << 31, NUM_PERM, dtype=np.uint32)
+    outlier[:ROWS] = base[:ROWS]
+    variant = base.copy()
+    variant[ROWS::ROWS] += 1
+    return np.stack([outlier, base, variant])
+
+
+def test_pairs_behind_a_dissimilar_bucket_leader_are_compared():
+    signatures = outlier_leader_signatures()
+    assert similar_pairs(signatures).tolist() == [[1, 2]]
+    labels = connected_groups(3, *similar_pairs(signatures).T)
+    assert labels.tolist() == [0, 1, 1]
+
+
+def test_groups_do_not_depend_on_row_order():
+    signatures = outlier_leader_signatures()
+    for order in ([0, 1, 2], [2, 0, 1], [1, 2, 0]):
+        pairs = similar_pairs(signatures[order])
+        grouped = {frozenset(np.array(order)[pair]) for pair in pairs.tolist()}
+        assert grouped == {frozenset({1, 2})}
+
+
+def test_product_groups_joins_colour_variants():
+    description = "Wooden stacking tower with ten colourful rings that babies can sort by size and colour, made from FSC certified beech wood"
+    df = pd.DataFrame({
+        "asin": ["B0C", "B0A", "B0B"],
+        "title": ["Rainbow Stacking Tower, Red, HXT82", "Wooden Puzzle Farm Animals", "Rainbow Stacking Tower, Red, HXT85"],
+        "short_description": [description, "A farm puzzle with six animals and a wooden board", description],
+    })
+    assert product_groups(df).tolist() == ["B0B", "B0A", "B0B"]
@@ -0,0 +1,14 @@
+import pytest
+
+from benchmarks import baseline_parsers
+from scripts.etl import parsers
+from scripts.etl.benchmark_cleaning import make_synthetic_raw
+from scripts.etl.benchmark_parsers import CASES, same_results
+
+
+@pytest.mark.parametrize("name", sorted(CASES))
+def test_same_results_as_original_parsers(name):
+    columns, baseline_name = CASES[name]
+    df = make_synthetic_raw(500, seed=1)
+    rows = list(zip(*(df[column].tolist() for column in columns)))
+    assert same_results(getattr(baseline_parsers, baseline_name), getattr(parsers, name), rows)
@@ -0,0 +1,45 @@
+from pathlib import Path
+
+import pandas as pd
+
+from scripts.etl.snapshot_diff import CHANGE_COLUMNS, diff_snapshots, load_snapshot, summarize
+
+RAW = Path(__file__).resolve().parents[2] / "data" / "raw" / "baby_toys_raw_2025-09-15.csv"
+
+
+def test_identical_snapshots_have_no_changes():
+    old, new = load_snapshot(RAW), load_snapshot(RAW)
+    report = diff_snapshots(old, new)
+    assert report.empty
+    assert list(report.columns) == CHANGE_COLUMNS
+    assert summarize(report, old, new) == f"{len(old)} -> {len(new)} products"
+
+
+def test_price_change_new_and_removed_products():
+    old = load_snapshot(RAW)
+    new = old.copy()
+    new.loc[0, "price"] = new.loc[0, "price"] + 1
+    removed, new = new["asin"].iloc[-1], new.iloc[:-1]
+    new = pd.concat([new, new.iloc[[1]].assign(asin="B0NEWASIN1")], ignore_index=True)
+    report = diff_snapshots(old, new)
+
+    assert report.loc[report["change"] == "price", ["asin", "delta"]].values.tolist() == [[old.loc[0, "asin"], 1.0]]
+    assert report.loc[report["change"] == "removed", "asin"].tolist() == [removed]
+    assert report.loc[report["change"] == "new", "asin"].tolist() == ["B0NEWASIN1"]
+
+
+def test_going_out_of_stock_is_a_stock_change(tmp_path):
+    raw = pd.read_csv(RAW)
+    raw.to_csv(tmp_path / "baby_toys_raw_2025-09-15.csv", index=False)
+    raw.loc[0, "stock"] = "Currently unavailable."
+    raw.loc[1, "stock"] = "Temporarily out of stock."
+    raw.loc[2, "stock"] = "Only 2 left in stock."
+    raw.to_csv(tmp_path / "baby_toys_raw_2025-09-16.csv", index=False)
+    report = diff_snapshots(load_snapshot(tmp_path / "baby_toys_raw_2025-09-15.csv"), load_snapshot(tmp_path / "baby_toys_raw_2025-09-16.csv"))
+
+    assert report.loc[report["change"] == "stock", ["asin", "old", "new"]].values.tolist() == [
+        [raw.loc[0, "asin"], "in stock", "unavailable"],
+        [raw.loc[1, "asin"], "in stock", "unavailable"],
+        [raw.loc[2, "asin"], "in stock", "only 2 left"],
+    ]
+    assert set(report["change"]) == {"stock"}
@@ -0,0 +1,60 @@
+from lxml import html
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+
+from scripts.scraping.html_backend import css_xpath
+
+# A stand-in for a Chrome WebDriver over static HTML: enough of find_element(s),
+# get and page_source for extract_product and the page waits. `.text` is the
+# rendered text, i.e. without scripts, styles and Amazon's screen-reader copies
+# (span.a-offscreen is moved off screen by CSS, so the browser does not show it).
+
+HIDDEN = "ancestor-or-self::script or ancestor-or-self::style or ancestor-or-self::*[contains(concat(' ', normalize-space(@class), ' '), ' a-offscreen ')]"
+
+
+class StubElement:
+    def __init__(self, element):
+        self.element = element
+
+    @property
+    def text(self):
+        parts = self.element.xpath(f".//text()[not({HIDDEN})]")
+        return " ".join("".join(parts).split())
+
+
+class StubBrowser:
+    """`pages` maps URLs to HTML; `error` (an exception) is raised by every get()."""
+
+    def __init__(self, pages=None, error=None):
+        self.pages = pages or {}
+        self.error = error
+        self.visited = []
+        self.tree = None
+
+    def load(self, page_source):
+        self.page_source = page_source
+        self.tree = html.fromstring(page_source)
+        return self
+
+    def get(self, url):
+        self.visited.append(url)
+        if self.error is not None:
+            raise self.error
+        self.load(self.pages[url])
+
+    def find_elements(self, by, value):
+        if by == By.ID:
+            found = self.tree.xpath("//*[@id=$id]", id=value)
+        elif by == By.CSS_SELECTOR:
+            found = css_xpath(value)(self.tree)
+        elif by == By.XPATH:
+            found = self.tree.xpath(value)
+        else:
+            raise ValueError(f"Unsupported locator: {by}")
+        return [StubElement(element) for element in found]
+
+    def find_element(self, by, value):
+        found = self.find_elements(by, value)
+        if not found:
+            raise NoSuchElementException(f"{by}={value}")
+        return found[0]
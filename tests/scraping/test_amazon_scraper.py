@@ -0,0 +1,84 @@
+import json
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("selenium")
+
+from selenium.common.exceptions import WebDriverException
+
+from scripts.scraping import amazon_scraper
+from scripts.scraping.amazon_scraper import extract_asin
+from scripts.scraping.crawl_stats import CrawlTimer
+from scripts.scraping.journal import ProductJournal
+
+
+class Driver:
+    def __init__(self, number):
+        self.number = number
+        self.closed = False
+
+    def quit(self):
+        self.closed = True
+
+
+@pytest.fixture
+def config(tmp_path):
+    path = tmp_path / "categories.json"
+    categories = [{"name": name, "url": f"https://www.amazon.co.uk/stores/{name}"} for name in ["wooden", "baby", "sustainable"]]
+    path.write_text(json.dumps({"categories": categories}), encoding="utf-8")
+    return path
+
+
+def test_failing_category_does_not_stop_the_others(config, monkeypatch, capsys):
+    drivers, crawled = [], []
+    monkeypatch.setattr(amazon_scraper, "create_driver", lambda settings: drivers.append(Driver(len(drivers))) or drivers[-1])
+
+    def crawl_category(driver, category, *args):
+        if category["name"] == "wooden":
+            raise WebDriverException("tab crashed")
+        if category["name"] == "baby":
+            raise TimeoutError("store page")
+        crawled.append((category["name"], driver.number))
+
+    monkeypatch.setattr(amazon_scraper, "crawl_category", crawl_category)
+    assert amazon_scraper.scrape_all(config) is False
+
+    # The WebDriver error replaced the browser, the other error kept it
+    assert crawled == [("sustainable", 1)]
+    assert [driver.closed for driver in drivers] == [True, True]
+    out = capsys.readouterr().out
+    assert "[wooden] WebDriver error, category skipped: " in out
+    assert "[baby] Unexpected error, category skipped: store page" in out
+    assert "Failed categories: wooden, baby" in out
+
+
+def test_all_categories_scraped(config, monkeypatch):
+    monkeypatch.setattr(amazon_scraper, "create_driver", lambda settings: Driver(0))
+    monkeypatch.setattr(amazon_scraper, "crawl_category", lambda *args: None)
+    assert amazon_scraper.scrape_all(config) is True
+
+
+def test_resume_scrapes_only_products_not_in_the_journal(tmp_path, monkeypatch):
+    links = [(f"https://www.amazon.co.uk/dp/B0TEST000{n}", f"title {n}") for n in range(1, 5)]
+    journal = ProductJournal.for_run(tmp_path, "wooden_toys", "2025-09-15")
+    for n in (1, 3):
+        journal.append({"asin": f"B0TEST000{n}", "title": f"journaled {n}"})
+    with open(journal.path, "a", encoding="utf-8") as f:
+        f.write('{"asin": "B0TEST0004", "ti')
+
+    scraped = []
+
+    def scrape_links(driver, remaining, *args):
+        scraped.extend(remaining)
+        return [{"asin": extract_asin(link), "title": f"scraped {title}"} for link, title in remaining]
+
+    monkeypatch.setattr(amazon_scraper, "collect_product_links", lambda *args: links)
+    monkeypatch.setattr(amazon_scraper, "scrape_links", scrape_links)
+    settings = dict(amazon_scraper.DEFAULT_SETTINGS)
+    category = {"name": "wooden_toys", "url": "https://www.amazon.co.uk/stores/wooden"}
+    saved = amazon_scraper.crawl_category(None, category, settings, CrawlTimer(), "2025-09-15", tmp_path, resume=True)
+
+    # The truncated entry for B0TEST0004 does not count as done
+    assert scraped == [links[1], links[3]]
+    assert pd.read_csv(saved)["title"].tolist() == ["journaled 1", "journaled 3", "scraped title 2", "scraped title 4"]
@@ -0,0 +1,56 @@
+import pytest
+
+from scripts.scraping.incremental import ListingState, plan_visits
+
+RUN_DATE = "2025-09-30"
+
+
+def link(asin):
+    return f"https://www.amazon.co.uk/dp/{asin}"
+
+
+def plan(tmp_path, entries, previous, signals, asins, refresh_fraction=0.0, max_staleness_days=30):
+    state = ListingState(tmp_path / "listing_state.json")
+    state.entries = entries
+    links = [(link(asin), f"title {asin}") for asin in asins]
+    signals = {link(asin): signal for asin, signal in signals.items()}
+    previous = {asin: {"asin": asin, "url": "old url", "title": f"previous {asin}"} for asin in previous}
+    return plan_visits(links, signals, state, previous, RUN_DATE, refresh_fraction, max_staleness_days)
+
+
+@pytest.mark.parametrize("entry, in_previous, signal, visited", [
+    # New ASIN: nothing known about it
+    (None, False, "s1", True),
+    # Listing changed since the last crawl
+    ({"signal": "s0", "last_full_visit": "2025-09-29"}, True, "s1", True),
+    # Unchanged listing with a previous row: carried over
+    ({"signal": "s1", "last_full_visit": "2025-09-29"}, True, "s1", False),
+    # Unchanged listing, but no previous row to carry over
+    ({"signal": "s1", "last_full_visit": "2025-09-29"}, False, "s1", True),
+    # Unchanged, but not fully visited for max_staleness_days
+    ({"signal": "s1", "last_full_visit": "2025-08-31"}, True, "s1", True),
+    ({"signal": "s1", "last_full_visit": "2025-09-01"}, True, "s1", False),
+    # Unchanged, never fully visited
+    ({"signal": "s1"}, True, "s1", True),
+], ids=["new", "changed", "unchanged", "no-previous-row", "stale", "almost-stale", "never-visited"])
+def test_plan_single_product(tmp_path, entry, in_previous, signal, visited):
+    asin = "B0TEST0001"
+    entries = {asin: entry} if entry else {}
+    to_visit, reused, stats = plan(tmp_path, entries, [asin] if in_previous else [], {asin: signal}, [asin])
+
+    assert to_visit == ([(link(asin), f"title {asin}")] if visited else [])
+    # A carried-over row keeps the previous fields with the current link
+    assert reused == ([] if visited else [{"asin": asin, "url": link(asin), "title": f"previous {asin}"}])
+    assert stats["links"] == 1 and stats["reused"] == (0 if visited else 1)
+
+
+def test_refresh_fraction_visits_the_oldest_unchanged_first(tmp_path):
+    last_visits = {"B0TEST0001": "2025-09-20", "B0TEST0002": "2025-09-10", "B0TEST0003": "2025-09-25", "B0TEST0004": "2025-09-15"}
+    entries = {asin: {"signal": "s", "last_full_visit": day} for asin, day in last_visits.items()}
+    asins = [*last_visits, "B0TEST0005"]
+    to_visit, reused, stats = plan(tmp_path, entries, last_visits, dict.fromkeys(asins, "s"), asins, refresh_fraction=0.5)
+
+    # The new ASIN, then the two least recently visited of the four unchanged ones
+    assert to_visit == [(link(asin), f"title {asin}") for asin in ["B0TEST0005", "B0TEST0002", "B0TEST0004"]]
+    assert [product["asin"] for product in reused] == ["B0TEST0001", "B0TEST0003"]
+    assert stats == {"links": 5, "new_or_changed": 1, "refreshed": 2, "reused": 2}
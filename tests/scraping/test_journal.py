@@ -0,0 +1,20 @@
+import json
+
+from scripts.scraping.journal import ProductJournal
+
+
+def test_load_skips_truncated_last_line_and_keeps_latest_entry(tmp_path, capsys):
+    journal = ProductJournal.for_run(tmp_path, "wooden_toys", "2025-09-15")
+    journal.append({"asin": "B0TEST0001", "title": "first try"})
+    journal.append({"asin": "B0TEST0002", "title": "tea set"})
+    journal.append({"asin": "B0TEST0001", "title": "second try"})
+    # A crash in the middle of writing the next product
+    with open(journal.path, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"asin": "B0TEST0003", "title": "lost"})[:20])
+
+    assert journal.load() == [{"asin": "B0TEST0001", "title": "second try"}, {"asin": "B0TEST0002", "title": "tea set"}]
+    assert "skipping unreadable line 4" in capsys.readouterr().out
+
+
+def test_missing_journal_loads_nothing(tmp_path):
+    assert ProductJournal(tmp_path / "none.journal.jsonl").load() == []
@@ -0,0 +1,87 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from scripts.scraping.journal import ProductJournal
+from scripts.scraping.page_cache import PageCache, crawl_path, replay
+
+FIXTURES = Path(__file__).with_name("fixtures")
+DATE = "2025-09-16"
+CATEGORY = "baby_toys"
+COLUMNS = ["asin", "url", "title", "price", "old_price", "discount", "stock", "reviews_count", "age_range", "weight", "short_description"]
+
+
+def url(asin):
+    return f"https://www.amazon.co.uk/dp/{asin}"
+
+
+def crawl_row(asin, title):
+    return {**dict.fromkeys(COLUMNS, ""), "asin": asin, "url": url(asin), "title": title, "price": "€1.00"}
+
+
+@pytest.fixture
+def crawl(tmp_path):
+    """A crawl of three products; B0REUSED01 was reused by --incremental, so only the other two pages are cached."""
+    cache_dir, crawl_dir = tmp_path / "page_cache", tmp_path / "crawl"
+    crawl_dir.mkdir()
+    cache = PageCache(cache_dir)
+    for asin, page in (("B0VISITED1", "in_stock"), ("B0VISITED2", "list_price")):
+        cache.store(CATEGORY, DATE, asin, url(asin), (FIXTURES / f"{page}.html").read_text(encoding="utf-8"))
+    rows = [crawl_row("B0VISITED1", "old title 1"), crawl_row("B0REUSED01", "Reused toy"), crawl_row("B0VISITED2", "old title 2")]
+    return cache_dir, crawl_dir, rows
+
+
+def read_raw(path):
+    return pd.read_csv(path, dtype=str, keep_default_na=False, encoding="utf-8-sig")
+
+
+def check_replayed(df):
+    assert df["asin"].tolist() == ["B0VISITED1", "B0REUSED01", "B0VISITED2"]
+    assert df["title"].tolist()[1] == "Reused toy"
+    assert df["title"].tolist()[0].startswith("Wooden Tea Set")
+    assert df.loc[df["asin"] == "B0VISITED2", "old_price"].item() == "€15.99"
+
+
+def test_replay_keeps_the_crawl_output_and_carries_reused_rows(crawl):
+    cache_dir, crawl_dir, rows = crawl
+    live = crawl_path(crawl_dir, CATEGORY, DATE)
+    pd.DataFrame(rows).to_csv(live, index=False, encoding="utf-8-sig")
+    before = live.read_bytes()
+
+    [replayed] = replay(cache_dir, DATE, crawl_dir=crawl_dir)
+    assert replayed == cache_dir / "replay" / f"{CATEGORY}_raw_{DATE}.csv"
+    assert live.read_bytes() == before
+    check_replayed(read_raw(replayed))
+
+    with pytest.raises(ValueError, match="already exists"):
+        replay(cache_dir, DATE, crawl_dir=crawl_dir)
+    replay(cache_dir, DATE, crawl_dir=crawl_dir, overwrite=True)
+
+
+def test_replay_from_the_journal_of_an_unfinished_crawl(crawl):
+    cache_dir, crawl_dir, rows = crawl
+    journal = ProductJournal.for_run(crawl_dir, CATEGORY, DATE)
+    for row in rows:
+        journal.append(row)
+
+    [replayed] = replay(cache_dir, DATE, crawl_dir=crawl_dir)
+    check_replayed(read_raw(replayed))
+
+
+def test_replay_with_parquet_storage(crawl):
+    pytest.importorskip("pyarrow")
+    from scripts.etl import storage
+
+    cache_dir, crawl_dir, rows = crawl
+    storage.write_partition(pd.DataFrame(rows), crawl_dir, "raw", "baby", DATE)
+
+    [replayed] = replay(cache_dir, DATE, crawl_dir=crawl_dir, storage="parquet")
+    assert replayed == storage.partition_path(cache_dir / "replay", "raw", "baby", DATE)
+    check_replayed(pd.read_parquet(replayed).astype(str))
+
+
+def test_unknown_storage_is_rejected(crawl):
+    cache_dir, crawl_dir, _ = crawl
+    with pytest.raises(ValueError, match="Unknown storage"):
+        replay(cache_dir, DATE, crawl_dir=crawl_dir, storage="sqlite")
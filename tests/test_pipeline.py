@@ -0,0 +1,43 @@
+import shutil
+
+import pytest
+
+from scripts.pipeline import REFERENCE_DATA_DIR, STATE_FILE, Stage, pipeline_stages, run_stages
+
+
+@pytest.fixture
+def raw_dir(tmp_path):
+    raw = tmp_path / "raw"
+    shutil.copytree(REFERENCE_DATA_DIR / "raw", raw)
+    return raw
+
+
+def test_runs_into_output_dir_and_skips_unchanged(tmp_path, raw_dir):
+    out = tmp_path / "build"
+    stages = pipeline_stages(out, raw_dir=raw_dir, xlsx=False)
+    assert set(run_stages(stages, out / STATE_FILE).values()) == {"done"}
+    assert (out / "processed" / "toys_fisher_price_analysis.csv").exists()
+    assert set(run_stages(pipeline_stages(out, raw_dir=raw_dir, xlsx=False), out / STATE_FILE).values()) == {"unchanged"}
+
+
+def test_refuses_to_overwrite_reference_data():
+    reference = {path: path.stat().st_mtime_ns for path in REFERENCE_DATA_DIR.rglob("*") if path.is_file()}
+    stages = pipeline_stages(REFERENCE_DATA_DIR, raw_dir=REFERENCE_DATA_DIR / "raw", xlsx=False)
+    with pytest.raises(ValueError, match="reference data"):
+        run_stages(stages, REFERENCE_DATA_DIR / STATE_FILE)
+    assert {path: path.stat().st_mtime_ns for path in REFERENCE_DATA_DIR.rglob("*") if path.is_file()} == reference
+
+
+def test_stage_without_its_output_fails_alone(tmp_path):
+    written, lost = tmp_path / "written.csv", tmp_path / "lost.csv"
+    stages = [
+        Stage("scrape:ok", written.touch, outputs=[written]),
+        Stage("clean:ok", lambda: None, inputs=[written], deps=["scrape:ok"]),
+        # Like a scrape that collected no products: succeeds but writes nothing
+        Stage("scrape:empty", lambda: None, outputs=[lost]),
+        Stage("clean:empty", lambda: None, inputs=[lost], deps=["scrape:empty"]),
+        Stage("orphan", lambda: None, inputs=[tmp_path / "missing.csv"]),
+    ]
+    assert run_stages(stages, tmp_path / STATE_FILE) == {
+        "scrape:ok": "done", "clean:ok": "done", "scrape:empty": "failed", "clean:empty": "blocked", "orphan": "failed",
+    }